@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand, CommandError
+from ml_nba.preprocessing.run_pipeline import run_pipeline, STAGE_FUNCTIONS
+
+
+class Command(BaseCommand):
+    help = "Run preprocessing pipeline stages over many games on a process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--games", nargs="+", default=None,
+            help="Game keys to run, ex: 20160122LACNYK. Defaults to every game in ConstantsUtil.games.",
+        )
+        parser.add_argument(
+            "--stages", nargs="+", default=None, choices=list(STAGE_FUNCTIONS),
+            help="Stages to run, always executed in pipeline order. Defaults to all stages.",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=None,
+            help="Size of the process pool. Defaults to the number of CPUs.",
+        )
+        parser.add_argument(
+            "--overwrite", action="store_true",
+            help="Overwrite games already persisted to the database.",
+        )
+        parser.add_argument(
+            "--moments-backend", default=None, choices=["orm", "tensor"],
+            help="Moments backend used when generating feature vectors. Defaults to the moments of the game already in memory.",
+        )
+        parser.add_argument(
+            "--skip-finished", action="store_true",
+            help="Skip games whose requested stages already ran after their raw file last changed.",
+        )
+        parser.add_argument(
+            "--force", action="store_true",
+            help="Re-run every requested stage, even when its inputs did not change since its last run.",
+        )
+        parser.add_argument(
+            "--log-dir", default=None,
+            help="Write each game's stage output to <log-dir>/<game_key>.log instead of stdout.",
+        )
+
+    def handle(self, *args, **options):
+        results = run_pipeline(
+            game_keys=options["games"],
+            stages=options["stages"],
+            workers=options["workers"],
+            stage_kwargs={
+                "persist_processed_game": {"overwrite": options["overwrite"]},
+                "generate_dho_feature_vectors": (
+                    {"moments_backend": options["moments_backend"]} if options["moments_backend"] else {}
+                ),
+            },
+            skip_finished=options["skip_finished"],
+            log_dir=options["log_dir"],
+            incremental=not options["force"],
+        )
+
+        if any(result["failed_stage"] is not None for result in results):
+            raise CommandError("Some games failed, see the summary above.")
@@ -1,8 +1,9 @@
 import pandas as pd
 from ml_nba.preprocessing.utilities.FeatureUtil import FeatureUtil
-from ml_nba.preprocessing.utilities.DataLoader import DataLoader
 from ml_nba.preprocessing.utilities.ConstantsUtil import ConstantsUtil
 from ml_nba.preprocessing.utilities.EventsProcessor import EventsProcessor
+from ml_nba.preprocessing.utilities.GameCatalog import GameCatalog
+from ml_nba.preprocessing.utilities.GameBundle import GameBundle
 
 
 def extract_dho_candidates(
@@ -10,12 +11,16 @@ def extract_dho_candidates(
     moment_range: int = None,
     events: list = "<all>",
     save_results: bool = True,
+    skip_seen_ticks: bool = False,
+    bundle: GameBundle = None,
 ):
     print(f"\n\n-------\n\nStarting {game_key}")
+    bundle = bundle or GameBundle(game_key)
 
-    # Collect processed game and event data
-    game_df = DataLoader.load_processed_game(game_key)
-    raw_df = DataLoader.load_raw_game(game_key)
+    # Collect processed game and event data (straight from process_game when it ran on the same bundle)
+    # NOTE: the moments of every event are flattened once into the bundle's game moments table, each event is a slice of it
+    game_df, timeline = bundle.processed_events, bundle.timeline
+    game_moments = bundle.moments
     print(f"Loaded game {game_key}")
 
     # Not all recordings seem to be at the same frequency, moment_range helps scale this
@@ -26,20 +31,32 @@ def extract_dho_candidates(
         else:
             moment_range = 8
 
-    players_data = DataLoader.get_players_data(raw_df)
-    players_dict = DataLoader.get_players_dict(raw_df)
+    # Only team/player metadata is needed from the raw game, which the bundle takes from the raw header
+    players_data = bundle.players_data
+    players_dict = bundle.players_dict
     print("Extracted team/player data")
 
     if events != "<all>":
         game_df = game_df.loc[events]
 
+    # Overlapping events share most of their ticks, so (when skip_seen_ticks and a timeline is available) start
+    # each event at the first tick an earlier event with the same possession and direction has not already covered,
+    # keeping a small overlap margin
+    # NOTE: opt-in, as it changes which candidates are found: an event's range spans its min..max tick, so the first
+    # unseen tick can fall among ticks of another event, and passes right after it lose their lead-in moments
+    start_ticks = {}
+    if skip_seen_ticks and timeline is not None:
+        start_ticks = timeline.get_unseen_start_ticks(
+            game_df.index, zip(game_df["POSSESSION"], game_df["DIRECTION"])
+        )
+
     all_candidates = []
     pass_detected = 0
     hand_off_detected = 0
 
     print("Starting Candidate Extraction\n")
     for index, event in game_df.iterrows():
-        moments_df = EventsProcessor.get_moments_from_event(event)
+        moments_df = game_moments.get_event(event["EVENT_ID"], start_ticks.get(index))
 
         if not moments_df.empty:
             event_passes = FeatureUtil.get_passes_for_event(
@@ -69,7 +86,15 @@ def extract_dho_candidates(
         else:
             print(f"No moments for event: {index}")
 
-    final_candidates = EventsProcessor.remove_duplicate_candidates(all_candidates)
+    # The same pass is found by every overlapping event covering it, keep one candidate per pass
+    final_candidates, candidate_sources = EventsProcessor.remove_duplicate_candidates(
+        all_candidates, return_sources=True
+    )
+    merged_candidates = {
+        candidate_id: event_ids for candidate_id, event_ids in candidate_sources.items() if len(event_ids) > 1
+    }
+    for candidate_id, event_ids in merged_candidates.items():
+        print(f"Candidate {candidate_id} found by events: {event_ids}")
 
     result = (
         f"\n\n-------\n\nStats for {game_key}\n"
@@ -89,5 +114,6 @@ def extract_dho_candidates(
         candidate_df.to_csv(
             f"{ConstantsUtil.CANDIDATES_PATH}/candidates-{game_key}.csv", index=False
         )
+        GameCatalog.record_stage(game_key, "extract_dho_candidates")
 
     return candidate_df
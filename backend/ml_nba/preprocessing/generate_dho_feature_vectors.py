@@ -2,9 +2,23 @@ import os, sys, traceback
 from django.db import transaction
 from ml_nba.models import Game, Event, Candidate, CandidateFeatureVector
 from ml_nba.preprocessing.utilities.FeatureUtil import FeatureUtil
+from ml_nba.preprocessing.utilities.GameCatalog import GameCatalog
+from ml_nba.preprocessing.utilities.GameBundle import GameBundle
 
 
-def generate_dho_feature_vectors(game_key):
+def generate_dho_feature_vectors(game_key, moments_backend=None, bundle: GameBundle = None):
+    """
+    Generates and stores the feature vector of every persisted dribble handoff candidate of a game.
+
+    Parameters:
+    - game_key (str): The unique identifier for the game.
+    - moments_backend (str): Backend used to fetch each event's moments, 'orm' or 'tensor'. See DatabaseUtil.get_moments_for_event.
+                             Defaults to the bundle's moments when a bundle is given, else 'orm'.
+    - bundle (GameBundle): Shared inputs of the game. Unless moments_backend is given, each event's moments are sliced from
+                           the bundle's game moments table instead of being fetched. Defaults to None.
+                           NOTE: these are in the ConstantsUtil.HEADERS layout (with a period column and a categorical
+                           event_id, without the Moment table's id column), which the features do not depend on.
+    """
     game = Game.objects.get(game_id=game_key)
     events = Event.objects.filter(game=game)
     
@@ -14,10 +28,17 @@ def generate_dho_feature_vectors(game_key):
     with transaction.atomic():
         for event in events:
             candidates = Candidate.objects.filter(event=event).values()
+            moments = (
+                bundle.moments.get_event(event.event_id).reset_index(drop=True)
+                if bundle is not None and moments_backend is None
+                else None
+            )
             for target_candidate in candidates:
                 try:
                     print(f'Generating vector for candidate: {target_candidate["candidate_id"]}')
-                    vector = FeatureUtil.generate_dribble_handoff_feature_vector(target_candidate)
+                    vector = FeatureUtil.generate_dribble_handoff_feature_vector(
+                        target_candidate, moments_backend or "orm", moments
+                    )
                 except Exception as e:
                     print(f"Issue at candidate: {target_candidate['candidate_id']}")
                     exc_type, exc_obj, exc_tb = sys.exc_info()
@@ -30,4 +51,5 @@ def generate_dho_feature_vectors(game_key):
                 CandidateFeatureVector.objects.update_or_create(**vector)
                 num_successful_candidates += 1
 
+    GameCatalog.record_stage(game_key, "generate_dho_feature_vectors")
     print(f"Total successful candidates: {num_successful_candidates}\nTotal failed candidates: {num_failed_candidates}")
\ No newline at end of file
@@ -2,10 +2,14 @@ from django.db import transaction
 from ml_nba.models import Game, Event, Moment, Candidate, Team, Player
 from ml_nba.preprocessing.utilities.DataLoader import DataLoader
 from ml_nba.preprocessing.utilities.DatabaseUtil import DatabaseUtil
-from ml_nba.preprocessing.utilities.EventsProcessor import EventsProcessor
+from ml_nba.preprocessing.utilities.TrackingTensor import TrackingTensor
+from ml_nba.preprocessing.utilities.GameCatalog import GameCatalog
+from ml_nba.preprocessing.utilities.GameBundle import GameBundle
 
 
-def persist_processed_game(game_key: str, overwrite: bool = False):
+def persist_processed_game(
+    game_key: str, overwrite: bool = False, build_tensor: bool = True, bundle: GameBundle = None
+):
     """
     Processes and persists all relevant data for a single NBA game into the database.
 
@@ -18,6 +22,9 @@ def persist_processed_game(game_key: str, overwrite: bool = False):
     - game_key (str): A unique identifier for the game being processed. ex: '20160122LACNYK'
     - overwrite (bool): Indicates whether to overwrite previous game data. Defaults to False.
                         NOTE: An exception is thrown if False and game data found
+    - build_tensor (bool): Also write the persisted moments to a memory-mapped TrackingTensor,
+                           the alternative backend of DatabaseUtil.get_moments_for_event. Defaults to True.
+    - bundle (GameBundle): Shared inputs of the game, ex: already holding the output of process_game. Defaults to a fresh bundle.
 
     Steps involved:
     1. Load data files for the game, its events, combined event data, and candidate data.
@@ -28,6 +35,7 @@ def persist_processed_game(game_key: str, overwrite: bool = False):
     6. Create event records and associated moment records in bulk, again to improve efficiency.
     7. Process and create candidate records for the game.
     8. Utilize Django's transaction.atomic to ensure data integrity and efficient bulk operations.
+    9. Write the persisted moments to the game's memory-mapped tracking tensor.
 
     """
     if DatabaseUtil.check_game_exists(game_key):
@@ -49,15 +57,17 @@ def persist_processed_game(game_key: str, overwrite: bool = False):
     
     
     print("Loading data files")
-    game_df = DataLoader.load_raw_game(game_key)
-    annotation_df = DataLoader.load_game_events(game_key)
-    combined_event_df = DataLoader.load_processed_game(game_key)
-    candidate_df = DataLoader.load_game_candidates(game_key)
+    bundle = bundle or GameBundle(game_key)
+    game_df = bundle.raw_header
+    annotation_df = bundle.annotations
+    combined_event_df = bundle.processed_events
+    game_moments = bundle.moments
+    candidate_df = bundle.candidates
 
     print("Processing Data Files...")
     game_data = DataLoader.get_game_data(game_df, annotation_df)
-    teams_data = DataLoader.get_teams_data(game_df)
-    players_data = DataLoader.get_players_data(game_df)
+    teams_data = bundle.teams_data
+    players_data = bundle.players_data
 
     print("Creating or Updating Game/Team/Player models...")
     with transaction.atomic():
@@ -84,6 +94,7 @@ def persist_processed_game(game_key: str, overwrite: bool = False):
     print("Collecting and Creating Event and Moment Models...")
     event_instances = []
     moment_instances = []
+    tensor_event_ids = []
     for _, event_row in combined_event_df.iterrows():
         event_data = event_row.to_dict()
         if (event_data['EVENT_ID'] in set(candidate_df['event_id'])):
@@ -108,8 +119,10 @@ def persist_processed_game(game_key: str, overwrite: bool = False):
             event = Event(**event_kwargs)
             event_instances.append(event)
 
-            # Prepare Moment instances for bulk creation
-            for _, moment_row in EventsProcessor.get_moments_from_event(event_data).iterrows():
+            # Prepare Moment instances for bulk creation, from the event's slice of the game moments table
+            event_moments_df = game_moments.get_event(event_data['EVENT_ID'])
+            tensor_event_ids.append(event_data['EVENT_ID'])
+            for _, moment_row in event_moments_df.iterrows():
                 moment_data = moment_row.to_dict()
                 # Adjust moment_data to correctly reference related instances
                 adjusted_moment_data = {
@@ -161,4 +174,9 @@ def persist_processed_game(game_key: str, overwrite: bool = False):
         if candidate_instances:
             Candidate.objects.bulk_create(candidate_instances)
 
+    if build_tensor and tensor_event_ids:
+        print("Writing memory-mapped tracking tensor...")
+        TrackingTensor.write(game_key, game_moments.get_events(tensor_event_ids))
+
+    GameCatalog.record_stage(game_key, "persist_processed_game")
     print("Finished processing game")
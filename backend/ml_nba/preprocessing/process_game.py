@@ -1,13 +1,107 @@
 # Import necessary modules from the ml_nba preprocessing utilities package
 from ml_nba.preprocessing.utilities.FeatureUtil import FeatureUtil
-from ml_nba.preprocessing.utilities.DataLoader import DataLoader
+from ml_nba.preprocessing.utilities.ArrowUtil import ArrowUtil
+from ml_nba.preprocessing.utilities.GameCatalog import GameCatalog
+from ml_nba.preprocessing.utilities.GameBundle import GameBundle
+from ml_nba.preprocessing.utilities.GamePipeline import GamePipeline, PipelineStage
 from ml_nba.preprocessing.utilities.ConstantsUtil import ConstantsUtil
 from ml_nba.preprocessing.utilities.AnnotationProcessor import AnnotationProcessor
 from ml_nba.preprocessing.utilities.EventsProcessor import EventsProcessor
 
 
+# The processing steps of a game, from its annotations and raw tracking data to the combined event DataFrame.
+# Values are passed between stages by name, swap a stage with PROCESS_GAME_PIPELINE.replace_stage(...) (which returns
+# a new pipeline) and hand the result to process_game to change a step without editing process_game.
+# NOTE: shared by every game processed in the process, the pipeline holds no per run state (metrics come with each run)
+PROCESS_GAME_PIPELINE = GamePipeline(
+    [
+        # Filter out corrupted events from the annotation data based on manual indicators and retain only relevant possessions
+        PipelineStage(
+            "trim_annotation_rows",
+            AnnotationProcessor.trim_annotation_rows,
+            inputs=["annotation_df", "bad_events"],
+            outputs=["annotation_df"],
+        ),
+        # Assign unique IDs to each event
+        PipelineStage(
+            "generate_event_ids",
+            AnnotationProcessor.generate_event_ids,
+            inputs=["annotation_df"],
+            outputs=["annotation_df"],
+            mutates=["annotation_df"],
+        ),
+        # Fold the raw events (streamed from the raw game file) into a timeline holding every physical tick once,
+        # keeping only the events that survived annotation trimming
+        # NOTE: this single pass over the raw file also picks up the raw game header (game fields plus the first event)
+        PipelineStage(
+            "build_timeline",
+            lambda bundle, annotation_df: bundle.build_timeline(set(annotation_df["EVENTNUM"])),
+            inputs=["bundle", "annotation_df"],
+            outputs=["timeline"],
+        ),
+        # Extract player metadata from the raw game data
+        PipelineStage(
+            "get_players_data",
+            lambda bundle: bundle.players_data,
+            inputs=["bundle"],
+            outputs=["players_data"],
+        ),
+        # Identify the possessing team for each event
+        PipelineStage(
+            "determine_possession",
+            FeatureUtil.determine_possession_from_eventmsg,
+            inputs=["annotation_df", "players_data"],
+            outputs=["annotation_df"],
+            mutates=["annotation_df"],
+        ),
+        # Remove extraneous annotation columns after possession determination, as these columns are used for interim calculations
+        PipelineStage(
+            "trim_annotation_cols",
+            AnnotationProcessor.trim_annotation_cols,
+            inputs=["annotation_df"],
+            outputs=["annotation_df"],
+            mutates=["annotation_df"],
+        ),
+        # Combine the coordinate data (as tick ranges over the timeline) with event data (from annotation_df) into a single DataFrame
+        PipelineStage(
+            "combine_events",
+            AnnotationProcessor.combine_timeline_and_annotation_events,
+            inputs=["timeline", "annotation_df"],
+            outputs=["combined_event_df"],
+        ),
+        # Determine the direction of play for each event and filter out moments occurring outside the relevant half of the court
+        PipelineStage(
+            "determine_directionality",
+            FeatureUtil.determine_directionality,
+            inputs=["combined_event_df", "timeline"],
+            outputs=["combined_event_df"],
+            mutates=["combined_event_df"],
+        ),
+        PipelineStage(
+            "trim_moments_by_directionality",
+            EventsProcessor.trim_moments_by_directionality,
+            inputs=["combined_event_df", "timeline"],
+            outputs=["combined_event_df"],
+            mutates=["combined_event_df"],
+        ),
+        # Organize columns in the combined DataFrame in a logical order for analysis
+        PipelineStage(
+            "organize_columns",
+            AnnotationProcessor.organize_columns,
+            inputs=["combined_event_df"],
+            outputs=["combined_event_df"],
+        ),
+    ]
+)
+
+
 def process_game(
-    game_key: str, save_results=True, save_dir=ConstantsUtil.CLEAN_DATA_PATH
+    game_key: str,
+    save_results=True,
+    save_dir=ConstantsUtil.CLEAN_DATA_PATH,
+    bundle: GameBundle = None,
+    pipeline: GamePipeline = None,
+    trace_memory: bool = False,
 ):
     """
     Processes a single NBA game's raw data to prepare it for machine learning analysis.
@@ -16,51 +110,43 @@ def process_game(
     - game_key (str): The unique identifier for the game to be processed.
     - save_results (bool): Flag indicating whether to save the processed data to a file. Defaults to True.
     - save_dir (str): The directory path where the processed data files will be saved. Defaults to the CLEAN_DATA_PATH defined in ConstantsUtil.
+    - bundle (GameBundle): Shared inputs of the game, receiving the processed events and timeline for later stages. Defaults to a fresh bundle.
+    - pipeline (GamePipeline): The processing stages to run, producing 'combined_event_df' and 'timeline'. Defaults to PROCESS_GAME_PIPELINE.
+    - trace_memory (bool): Also trace the peak allocated memory of each stage (see GamePipeline.run). Defaults to False.
 
     Returns:
     - DataFrame: A pandas DataFrame containing the processed game and event data, ready for ML analysis.
     """
-
-    # Load the raw game data and associated event annotations for the specified game_key
-    game_df = DataLoader.load_raw_game(game_key)
-    annotation_df = DataLoader.load_game_events(game_key)
+    bundle = bundle or GameBundle(game_key)
+    pipeline = pipeline or PROCESS_GAME_PIPELINE
 
     # Retrieve game-specific notes, including manual indicators of bad events and frame rate information
     game_notes = ConstantsUtil.games[game_key]
 
-    # Extract player metadata from the raw game data
-    players_data = DataLoader.get_players_data(game_df)
-
-    # Filter out corrupted events from the annotation data based on manual indicators and retain only relevant possessions
-    annotation_df = AnnotationProcessor.trim_annotation_rows(
-        annotation_df, game_notes["bad_events"]
+    # Run the processing stages over the event annotations of the game
+    # NOTE: only the typed annotation columns/event types used by the pipeline are loaded, and the bundle's
+    # annotations are only copied if a stage would modify them
+    results, metrics = pipeline.run(
+        trace_memory=trace_memory,
+        bundle=bundle,
+        annotation_df=bundle.pipeline_annotations,
+        bad_events=game_notes["bad_events"],
     )
-    # Assign unique IDs to each event and identify the possessing team for each event
-    annotation_df = AnnotationProcessor.generate_event_ids(annotation_df)
-    
-    # Extract possession info
-    annotation_df = FeatureUtil.determine_possession_from_eventmsg(annotation_df, players_data)
+    combined_event_df, timeline = results["combined_event_df"], results["timeline"]
 
-    # Remove extraneous annotation columns after possession determination, as these columns are used for interim calculations
-    annotation_df = AnnotationProcessor.trim_annotation_cols(annotation_df)
+    print(f"Processed {game_key}, per stage:")
+    GamePipeline.print_metrics(metrics)
 
-    # Combine the coordinate data (from game_df) with event data (from annotation_df) into a single DataFrame
-    combined_event_df = AnnotationProcessor.combine_game_and_annotation_events(
-        game_df, annotation_df
-    )
-
-    # Determine the direction of play for each event and filter out moments occurring outside the relevant half of the court
-    combined_event_df = FeatureUtil.determine_directionality(combined_event_df)
-    combined_event_df = EventsProcessor.trim_moments_by_directionality(
-        combined_event_df
-    )
+    # If saving results is enabled, write the processed data as columnar event/ticks tables in the specified directory
+    # NOTE: only the tick ranges are stored per event, the direction trimming is re-applied on load
+    if save_results:
+        ArrowUtil.write_processed_game(combined_event_df, timeline, game_key, save_dir)
 
-    # Organize columns in the combined DataFrame in a logical order for analysis
-    combined_event_df = AnnotationProcessor.organize_columns(combined_event_df)
+        # Record the run (and the game's event/tick counts, learned for free from the timeline) in the game catalog
+        GameCatalog.record_timeline(game_key, timeline)
 
-    # If saving results is enabled, write the processed data to a CSV file in the specified directory
-    if save_results:
-        combined_event_df.to_csv(f"{save_dir}/{game_key}.csv")
+    # Hand the processed game over to later stages sharing the bundle
+    bundle.set_processed(combined_event_df, timeline)
 
     # Return the processed DataFrame
     return combined_event_df
@@ -0,0 +1,256 @@
+import os, sys, json, time, hashlib, traceback
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from django.db import connections
+from ml_nba.preprocessing.process_game import process_game
+from ml_nba.preprocessing.extract_dho_candidates import extract_dho_candidates
+from ml_nba.preprocessing.persist_processed_game import persist_processed_game
+from ml_nba.preprocessing.generate_dho_feature_vectors import generate_dho_feature_vectors
+from ml_nba.preprocessing.utilities.ArrowUtil import ArrowUtil
+from ml_nba.preprocessing.utilities.ConstantsUtil import ConstantsUtil
+from ml_nba.preprocessing.utilities.DatabaseUtil import DatabaseUtil
+from ml_nba.preprocessing.utilities.DataLoader import DataLoader
+from ml_nba.preprocessing.utilities.GameCatalog import GameCatalog
+from ml_nba.preprocessing.utilities.GameBundle import GameBundle
+
+
+# Pipeline stages in execution order, keyed by the names used in the GameCatalog
+STAGE_FUNCTIONS = {
+    "process_game": process_game,
+    "extract_dho_candidates": extract_dho_candidates,
+    "persist_processed_game": persist_processed_game,
+    "generate_dho_feature_vectors": generate_dho_feature_vectors,
+}
+
+# Stages reading their inputs through a GameBundle
+BUNDLE_STAGES = {"process_game", "extract_dho_candidates", "persist_processed_game", "generate_dho_feature_vectors"}
+
+# Bump a stage's version whenever a code change alters its output, invalidating it and every later stage
+STAGE_VERSIONS = {
+    "process_game": 2,
+    "extract_dho_candidates": 3,
+    "persist_processed_game": 1,
+    "generate_dho_feature_vectors": 3,
+}
+
+# Stage options that only control how a stage runs, not what it outputs, left out of its fingerprint
+RUN_ONLY_KWARGS = {"overwrite"}
+
+
+def compute_stage_fingerprint(game_key, stage, input_hashes, upstream_fingerprint, stage_kwargs=None):
+    """
+    Fingerprint everything a stage's output depends on: the raw/annotation content hashes, the game's
+    ConstantsUtil.games entry, the stage code version, the options the stage runs with (except RUN_ONLY_KWARGS)
+    and the fingerprint of the upstream stage's output.
+    """
+    payload = {
+        "stage": stage,
+        "version": STAGE_VERSIONS[stage],
+        "inputs": input_hashes,
+        "game_notes": ConstantsUtil.games.get(game_key),
+        "kwargs": {
+            name: value for name, value in (stage_kwargs or {}).get(stage, {}).items() if name not in RUN_ONLY_KWARGS
+        },
+        "upstream": upstream_fingerprint,
+    }
+
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=repr).encode()).hexdigest()
+
+
+def _stage_output_exists(game_key, stage):
+    # A matching fingerprint only counts while the stage's output is still around
+    if stage == "process_game":
+        events_path, _ = ArrowUtil.get_processed_game_paths(game_key, ConstantsUtil.CLEAN_DATA_PATH)
+        return os.path.exists(events_path)
+    if stage == "extract_dho_candidates":
+        return os.path.exists(f"{ConstantsUtil.CANDIDATES_PATH}/candidates-{game_key}.csv")
+    if stage == "persist_processed_game":
+        return DatabaseUtil.check_game_exists(game_key)
+
+    return True
+
+
+def _run_game_stages(game_key, stages, stage_kwargs, log_dir, incremental):
+    """
+    Run the requested stages for a single game, stopping at (and reporting) the first failing stage.
+    Executed inside the pool workers, so every exception is caught and returned rather than raised.
+
+    Every stage that runs stamps its output with the fingerprint of its inputs and options; when incremental,
+    a stage is skipped if that stamp matches its current inputs and options.
+    """
+    result = {"game_key": game_key, "timings": {}, "skipped": [], "failed_stage": None, "error": None}
+
+    log_file = (
+        open(os.path.join(log_dir, f"{game_key}.log"), "w") if log_dir is not None else None
+    )
+    try:
+        # Stage functions are chatty, so keep their output out of the progress report when logging
+        with redirect_stdout(log_file or sys.stdout):
+            try:
+                input_hashes = GameCatalog.get_input_hashes(game_key)
+            except Exception as e:
+                result["failed_stage"] = "fingerprint"
+                result["error"] = f"{type(e).__name__}: {e}"
+                return result
+            fingerprints = GameCatalog.load().get_fingerprints(game_key)
+            bundle = GameBundle.get(game_key)
+
+            # Walk every stage in order so each fingerprint chains onto the output its upstream stage actually has
+            upstream_fingerprint = None
+            for stage in STAGE_FUNCTIONS:
+                fingerprint = compute_stage_fingerprint(
+                    game_key, stage, input_hashes, upstream_fingerprint, stage_kwargs
+                )
+                if stage not in stages or (
+                    incremental
+                    and fingerprints.get(stage) == fingerprint
+                    and _stage_output_exists(game_key, stage)
+                ):
+                    if stage in stages:
+                        result["skipped"].append(stage)
+                    upstream_fingerprint = fingerprints.get(stage)
+                    continue
+
+                # NOTE: a stale persisted game is only replaced when the caller asked to overwrite it, persist_processed_game
+                # raises otherwise (replacing it drops its candidates, and so unlinks their feature vectors)
+                kwargs = dict(stage_kwargs.get(stage, {}))
+
+                # Stages of one game share a bundle, so each input file is read once
+                if stage in BUNDLE_STAGES:
+                    kwargs["bundle"] = bundle
+
+                start = time.perf_counter()
+                try:
+                    STAGE_FUNCTIONS[stage](game_key, **kwargs)
+                except Exception as e:
+                    result["failed_stage"] = stage
+                    result["error"] = f"{type(e).__name__}: {e}"
+                    traceback.print_exc(file=log_file or sys.stdout)
+                    break
+                finally:
+                    result["timings"][stage] = time.perf_counter() - start
+
+                GameCatalog.record_fingerprint(game_key, stage, fingerprint)
+                upstream_fingerprint = fingerprint
+    finally:
+        GameBundle.release(game_key)
+        if log_file is not None:
+            log_file.close()
+
+    return result
+
+
+def _print_timing_summary(results, stages):
+    print("\n\n-------\n\nPer-stage timing summary")
+    for stage in stages:
+        timings = [result["timings"][stage] for result in results if stage in result["timings"]]
+        if not timings:
+            continue
+        print(
+            f"{stage}: {len(timings)} games, total {sum(timings):.1f}s, "
+            f"mean {sum(timings) / len(timings):.1f}s, max {max(timings):.1f}s"
+        )
+
+
+def run_pipeline(
+    game_keys=None,
+    stages=None,
+    workers: int = None,
+    stage_kwargs: dict = None,
+    skip_finished: bool = False,
+    log_dir: str = None,
+    incremental: bool = True,
+):
+    """
+    Runs pipeline stages over many games on a process pool, one game per task.
+
+    Games are ordered largest first (by raw file size, from the GameCatalog) so the longest tasks
+    start early and the pool stays busy until the end. A failing game is reported and skipped
+    without affecting the others.
+
+    Parameters:
+    - game_keys (list): Games to run. Defaults to every game in ConstantsUtil.games.
+    - stages (list): Subset of STAGE_FUNCTIONS to run, always executed in pipeline order. Defaults to all stages.
+    - workers (int): Size of the process pool. Defaults to the number of CPUs. With 1, games run in this process.
+    - stage_kwargs (dict): Extra keyword arguments per stage, ex: {"persist_processed_game": {"overwrite": True}}.
+    - skip_finished (bool): Skip games whose requested stages all ran after their raw file last changed. Defaults to False.
+    - log_dir (str): When set, each game's stage output goes to {log_dir}/{game_key}.log instead of stdout.
+    - incremental (bool): Skip stages whose output is stamped with the fingerprint of their current inputs
+                          (raw/annotation content, ConstantsUtil.games entry, stage version, stage_kwargs, upstream output).
+                          A game already persisted is still only re-persisted with {"overwrite": True}. Defaults to True.
+
+    Returns:
+    - list: One result dict per game with 'game_key', per-stage 'timings', 'skipped' stages, 'failed_stage' and 'error'.
+    """
+    if game_keys is None:
+        game_keys = list(ConstantsUtil.games)
+    if stages is None:
+        stages = list(STAGE_FUNCTIONS)
+    unknown_stages = set(stages) - STAGE_FUNCTIONS.keys()
+    if unknown_stages:
+        raise ValueError(f"Unknown pipeline stages: {sorted(unknown_stages)}")
+    stages = [stage for stage in STAGE_FUNCTIONS if stage in stages]
+    stage_kwargs = stage_kwargs or {}
+    workers = workers or os.cpu_count()
+    if log_dir is not None:
+        os.makedirs(log_dir, exist_ok=True)
+
+    # Parse the annotation archive once up front, so every worker reads its game's annotations from the cached table
+    if "process_game" in stages:
+        DataLoader.build_annotation_table()
+
+    # Plan from the catalog, largest games first for load balancing
+    catalog = GameCatalog.build()
+    planned = catalog.plan(stages, game_keys, skip_finished=skip_finished)
+    missing = [
+        game_key for game_key in game_keys if not catalog.entries.get(game_key, {}).get("raw_path")
+    ]
+    if missing:
+        print(f"No raw game file found for: {missing}")
+    print(f"Running {stages} over {len(planned)} games with {workers} workers\n")
+
+    results = []
+    pipeline_start = time.perf_counter()
+
+    def report(result):
+        results.append(result)
+        elapsed = sum(result["timings"].values())
+        status = (
+            "done" if result["failed_stage"] is None
+            else f"FAILED at {result['failed_stage']} ({result['error']})"
+        )
+        if result.get("skipped"):
+            status += f" (unchanged: {result['skipped']})"
+        print(f"[{len(results)}/{len(planned)}] {result['game_key']} {status} in {elapsed:.1f}s")
+
+    if workers == 1:
+        for game_key in planned:
+            report(_run_game_stages(game_key, stages, stage_kwargs, log_dir, incremental))
+    else:
+        # Forked workers must not share the parent's database connections, they open their own
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    _run_game_stages, game_key, stages, stage_kwargs, log_dir, incremental
+                ): game_key
+                for game_key in planned
+            }
+            for future in as_completed(futures):
+                try:
+                    report(future.result())
+                except Exception as e:
+                    # A worker dying outright (ex: killed for memory) breaks the pool, report the games rather than raise
+                    report(
+                        {"game_key": futures[future], "timings": {}, "skipped": [], "failed_stage": "worker", "error": repr(e)}
+                    )
+
+    _print_timing_summary(results, stages)
+    failed = [result["game_key"] for result in results if result["failed_stage"] is not None]
+    print(
+        f"\nFinished {len(results) - len(failed)}/{len(results)} games in "
+        f"{time.perf_counter() - pipeline_start:.1f}s"
+        + (f"\nFailed games: {failed}" if failed else "")
+    )
+
+    return results
@@ -1,10 +1,17 @@
+import re
 import pandas as pd
 import numpy as np
+from .ConstantsUtil import ConstantsUtil
+
+
 class AnnotationProcessor:
     """
     A utility class for processing annotation data.
     """
 
+    # Offensive fouls, plus technical, loose ball, and personal take fouls, by their play-by-play description
+    TRIMMED_DESCRIPTIONS = re.compile("Offensive Charge|OFF.FOUL|T.FOUL|L.B.FOUL")
+
     @staticmethod
     def trim_annotation_rows(annotation_df, bad_events=[]):
         """
@@ -18,17 +25,18 @@ class AnnotationProcessor:
             pd.DataFrame: Trimmed DataFrame with specified rows removed.
         """
         # Extract only make, miss, turnover, and (non-technical) foul events
-        annotation_df = annotation_df.loc[annotation_df["EVENTMSGTYPE"].isin([1, 2, 5, 6])]
-
+        keep = annotation_df["EVENTMSGTYPE"].isin(ConstantsUtil.KEPT_EVENTMSGTYPES)
 
         # Trim out specific event types
-        annotation_df = AnnotationProcessor._trim_specific_events(annotation_df)
+        keep &= ~AnnotationProcessor._get_specific_events_mask(annotation_df)
 
         # Remove events with specified event numbers
         if len(bad_events) > 0:
-            annotation_df = annotation_df[~annotation_df["EVENTNUM"].isin(bad_events)]
+            keep &= ~annotation_df["EVENTNUM"].isin(bad_events)
 
-        return annotation_df
+        # Every condition is combined first, so the rows are only filtered (and copied) once
+        # NOTE: take returns a frame of its own, which later steps can add columns to without copying again
+        return annotation_df.take(np.flatnonzero(keep.to_numpy()))
 
     @staticmethod
     def trim_annotation_cols(annotation_df):
@@ -65,7 +73,8 @@ class AnnotationProcessor:
             "PLAYER3_TEAM_NICKNAME",
             "PLAYER3_TEAM_ABBREVIATION",
         ]
-        annotation_df.drop(columns=columns_to_remove, axis=1, inplace=True)
+        # Typed annotations (see DataLoader.load_game_annotations) never parse most of these to begin with
+        annotation_df.drop(columns=columns_to_remove, errors="ignore", inplace=True)
 
         return annotation_df
 
@@ -80,12 +89,10 @@ class AnnotationProcessor:
         Returns:
             pd.DataFrame: DataFrame with an additional 'EVENT_ID' column.
         """
-        event_ids = []
-
-        for index, row in annotation_df.iterrows():
-            event_ids.append(f'{row["GAME_ID"]}-{row["EVENTNUM"]:03}')
-
-        annotation_df["EVENT_ID"] = event_ids
+        # ex: GAME_ID 21500492 and EVENTNUM 7 give '21500492-007'
+        annotation_df["EVENT_ID"] = (
+            annotation_df["GAME_ID"].astype(str) + "-" + annotation_df["EVENTNUM"].astype(str).str.zfill(3)
+        )
 
         return annotation_df
 
@@ -94,22 +101,59 @@ class AnnotationProcessor:
         """
         Combine game and annotation events based on event numbers.
 
+        Raw events are matched against a set of the annotated event numbers as they stream by,
+        so only the moments of surviving events are ever kept.
+
         Args:
-            game_df (pd.DataFrame): Game DataFrame.
+            game_df (pd.DataFrame | Iterable[dict]): Game DataFrame, or an iterable of raw events such as DataLoader.iter_raw_game_events.
             annotation_df (pd.DataFrame): Annotation DataFrame.
 
         Returns:
             pd.DataFrame: Combined DataFrame.
         """
+        raw_events = game_df['events'] if isinstance(game_df, pd.DataFrame) else game_df
+        event_nums = set(annotation_df['EVENTNUM'].tolist())
+
         moments = []
-        for event in game_df['events']:
-            if np.any(annotation_df['EVENTNUM'] == int(event['eventId'])):
-                moments.append({'EVENTNUM': int(event['eventId']), 'MOMENTS': event['moments']})
+        for event in raw_events:
+            event_num = int(event['eventId'])
+            if event_num in event_nums:
+                moments.append({'EVENTNUM': event_num, 'MOMENTS': event['moments']})
 
-        moments_df = pd.DataFrame(moments)
+        moments_df = pd.DataFrame(moments, columns=['EVENTNUM', 'MOMENTS'])
 
         return annotation_df.merge(moments_df, how="inner").set_index('EVENTNUM')
     
+    @staticmethod
+    def combine_timeline_and_annotation_events(timeline, annotation_df):
+        """
+        Combine a game's tick timeline and annotation events based on event numbers.
+
+        Each surviving event gets its [START_TICK, END_TICK) range over the timeline, and a MOMENTS
+        list whose moments are shared with (not copied from) the timeline.
+
+        Args:
+            timeline (TickTimeline): The game's tick timeline.
+            annotation_df (pd.DataFrame): Annotation DataFrame.
+
+        Returns:
+            pd.DataFrame: Combined DataFrame.
+        """
+        ranges_df = pd.DataFrame(
+            [
+                {
+                    'EVENTNUM': event_num,
+                    'START_TICK': start,
+                    'END_TICK': end,
+                    'MOMENTS': timeline.get_event_moments(event_num),
+                }
+                for event_num, (start, end) in timeline.event_ranges.items()
+            ],
+            columns=['EVENTNUM', 'START_TICK', 'END_TICK', 'MOMENTS'],
+        )
+
+        return annotation_df.merge(ranges_df, how="inner").set_index('EVENTNUM')
+
     @staticmethod
     def organize_columns(game_df):
         # Define the new column order with a logical grouping
@@ -120,6 +164,7 @@ class AnnotationProcessor:
             'HOMEDESCRIPTION', 'VISITORDESCRIPTION',  # Event Descriptions
             'POSSESSION', 'DIRECTION', 'SCORE',  # Game State Information
             'PLAYER1_ID', 'PLAYER2_ID', 'PLAYER3_ID',  # Player Information
+            'START_TICK', 'END_TICK',  # Tick range over the game's timeline
             'MOMENTS'  # Raw Data
         ]
         
@@ -139,16 +184,20 @@ class AnnotationProcessor:
         Returns:
             pd.DataFrame: DataFrame with specific events removed.
         """
-        # Trim offensive foul events
-        annotation_df = annotation_df[~annotation_df["HOMEDESCRIPTION"].str.contains("Offensive Charge", na=False)]
-        annotation_df = annotation_df[~annotation_df["VISITORDESCRIPTION"].str.contains("Offensive Charge", na=False)]
-        annotation_df = annotation_df[~annotation_df["HOMEDESCRIPTION"].str.contains("OFF.FOUL", na=False)]
-        annotation_df = annotation_df[~annotation_df["VISITORDESCRIPTION"].str.contains("OFF.FOUL", na=False)]
-
-        # Trim technical, loose ball, and personal take fouls
-        annotation_df = annotation_df[~annotation_df["HOMEDESCRIPTION"].str.contains("T.FOUL", na=False)]
-        annotation_df = annotation_df[~annotation_df["VISITORDESCRIPTION"].str.contains("T.FOUL", na=False)]
-        annotation_df = annotation_df[~annotation_df["HOMEDESCRIPTION"].str.contains("L.B.FOUL", na=False)]
-        annotation_df = annotation_df[~annotation_df["VISITORDESCRIPTION"].str.contains("L.B.FOUL", na=False)]
+        return annotation_df[~AnnotationProcessor._get_specific_events_mask(annotation_df)]
 
-        return annotation_df
+    @staticmethod
+    def _get_specific_events_mask(annotation_df):
+        """
+        Get the mask of the events trimmed by _trim_specific_events.
+
+        Args:
+            annotation_df (pd.DataFrame): DataFrame containing annotation data.
+
+        Returns:
+            pd.Series: True for the events to trim.
+        """
+        # Offensive, technical, loose ball, and personal take fouls, with a single pass over each description column
+        return annotation_df["HOMEDESCRIPTION"].str.contains(
+            AnnotationProcessor.TRIMMED_DESCRIPTIONS, na=False
+        ) | annotation_df["VISITORDESCRIPTION"].str.contains(AnnotationProcessor.TRIMMED_DESCRIPTIONS, na=False)
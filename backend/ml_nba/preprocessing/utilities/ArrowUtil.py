@@ -0,0 +1,232 @@
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pcsv
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from .TickTimeline import TickTimeline
+
+
+class ArrowUtil:
+    """
+    A utility class for storing processed games in a typed, columnar (parquet) format.
+
+    A processed game is split into two tables:
+    - an event table, holding every column of the combined event DataFrame except MOMENTS,
+      including the [START_TICK, END_TICK) range of each event over the game's tick timeline
+    - a flat ticks table, holding one row per tracked entity per tick, where every physical
+      tick of the game is stored exactly once (see TickTimeline)
+
+    Reloading these tables is a straight columnar read with no Python-level parsing, unlike the
+    legacy CSV format where every MOMENTS cell had to be passed through ast.literal_eval.
+    """
+
+    TICKS_SCHEMA = pa.schema(
+        [
+            ("tick", pa.int32()),
+            ("period", pa.int8()),
+            ("timestamp", pa.int64()),
+            ("game_clock", pa.float64()),
+            ("shot_clock", pa.float64()),
+            ("team_id", pa.int32()),
+            ("player_id", pa.int32()),
+            ("x_loc", pa.float64()),
+            ("y_loc", pa.float64()),
+            ("radius", pa.float64()),
+        ]
+    )
+
+    # Typed play-by-play columns used by the pipeline, every other annotation column is never parsed
+    ANNOTATION_SCHEMA = pa.schema(
+        [
+            ("GAME_ID", pa.int64()),
+            ("EVENTNUM", pa.int64()),
+            ("EVENTMSGTYPE", pa.int64()),
+            ("EVENTMSGACTIONTYPE", pa.int64()),
+            ("PERIOD", pa.int64()),
+            ("PCTIMESTRING", pa.string()),
+            ("HOMEDESCRIPTION", pa.string()),
+            ("VISITORDESCRIPTION", pa.string()),
+            ("SCORE", pa.string()),
+            ("PLAYER1_ID", pa.int64()),
+            ("PLAYER1_TEAM_ID", pa.float64()),
+            ("PLAYER2_ID", pa.int64()),
+            ("PLAYER2_TEAM_ID", pa.float64()),
+            ("PLAYER3_ID", pa.int64()),
+        ]
+    )
+
+    @staticmethod
+    def read_annotation_csv(annotation_path, event_types=None):
+        """
+        Read the pipeline columns of an annotation CSV with the typed ANNOTATION_SCHEMA.
+
+        Args:
+            annotation_path (str): Path of the annotation CSV.
+            event_types (list, optional): Only keep rows with these EVENTMSGTYPEs, filtered before
+                                          conversion to pandas. Defaults to keeping every row.
+
+        Returns:
+            pa.Table: The typed annotation table.
+        """
+        table = pcsv.read_csv(
+            annotation_path,
+            convert_options=pcsv.ConvertOptions(
+                include_columns=ArrowUtil.ANNOTATION_SCHEMA.names,
+                column_types=ArrowUtil.ANNOTATION_SCHEMA,
+                strings_can_be_null=True,
+            ),
+        )
+        if event_types is not None:
+            table = table.filter(pc.is_in(table["EVENTMSGTYPE"], pa.array(event_types, pa.int64())))
+
+        return table
+
+    @staticmethod
+    def annotation_table_to_pandas(table):
+        """
+        Convert a typed annotation table to pandas, with missing descriptions as NaN like pd.read_csv.
+        """
+        annotation_df = table.to_pandas()
+        string_cols = [field.name for field in table.schema if pa.types.is_string(field.type)]
+        annotation_df[string_cols] = annotation_df[string_cols].fillna(np.nan)
+
+        return annotation_df
+
+    @staticmethod
+    def write_annotation_table(annotation_paths, table_path, event_types=None):
+        """
+        Parse many annotation CSVs once and cache them as a single typed parquet table.
+
+        Each game is written as its own row group, tagged with a GAME_KEY column, so reads
+        filtered on GAME_KEY skip every other game.
+
+        Args:
+            annotation_paths (dict): game_key -> annotation CSV path.
+            table_path (str): Path of the parquet table to write.
+            event_types (list, optional): Only keep rows with these EVENTMSGTYPEs. Defaults to keeping every row.
+        """
+        schema = ArrowUtil.ANNOTATION_SCHEMA.insert(0, pa.field("GAME_KEY", pa.string()))
+        tmp_path = table_path + ".tmp"
+        with pq.ParquetWriter(tmp_path, schema) as writer:
+            for game_key, annotation_path in sorted(annotation_paths.items()):
+                table = ArrowUtil.read_annotation_csv(annotation_path, event_types)
+                table = table.add_column(0, "GAME_KEY", pa.array([game_key] * len(table), pa.string()))
+                writer.write_table(table)
+        os.replace(tmp_path, table_path)
+
+    @staticmethod
+    def read_annotation_table(table_path, game_keys=None):
+        """
+        Read cached annotations, optionally for a subset of games.
+
+        Args:
+            table_path (str): Path of the parquet table written by write_annotation_table.
+            game_keys (list, optional): Games to read. Defaults to every game.
+
+        Returns:
+            pa.Table: The typed annotation table, with its GAME_KEY column.
+        """
+        filters = [("GAME_KEY", "in", list(game_keys))] if game_keys is not None else None
+
+        return pq.read_table(table_path, filters=filters)
+
+    @staticmethod
+    def get_processed_game_paths(game_key, save_dir):
+        """
+        Get the file paths of the event and ticks tables for a processed game.
+
+        Args:
+            game_key (str): The unique identifier for the game.
+            save_dir (str): Directory holding the processed games.
+
+        Returns:
+            Tuple[str, str]: Paths of the event table and the ticks table.
+        """
+        return (
+            os.path.join(save_dir, f"{game_key}-events.parquet"),
+            os.path.join(save_dir, f"{game_key}-ticks.parquet"),
+        )
+
+    @staticmethod
+    def write_processed_game(combined_event_df, timeline, game_key, save_dir):
+        """
+        Write a combined event DataFrame and its tick timeline as an event table and a flat ticks table.
+
+        Args:
+            combined_event_df (pd.DataFrame): Combined event DataFrame indexed by EVENTNUM, with START_TICK/END_TICK columns.
+            timeline (TickTimeline): The game's tick timeline.
+            game_key (str): The unique identifier for the game.
+            save_dir (str): Directory to write the processed game tables to.
+        """
+        events_path, ticks_path = ArrowUtil.get_processed_game_paths(game_key, save_dir)
+
+        events_table = pa.Table.from_pandas(
+            combined_event_df.drop(columns=["MOMENTS"], errors="ignore").reset_index(),
+            preserve_index=False,
+        )
+        pq.write_table(events_table, events_path)
+        pq.write_table(
+            pa.Table.from_pydict(timeline.to_columns(), schema=ArrowUtil.TICKS_SCHEMA),
+            ticks_path,
+        )
+
+    @staticmethod
+    def read_processed_ticks(game_key, save_dir, columns=None, filters=None):
+        """
+        Read the flat ticks table of a processed game.
+
+        Args:
+            game_key (str): The unique identifier for the game.
+            save_dir (str): Directory holding the processed games.
+            columns (list, optional): Subset of columns to read. Defaults to all.
+            filters (list, optional): Parquet predicate filters, ex: [("tick", ">=", 1000)].
+
+        Returns:
+            pd.DataFrame: Flat ticks table with the typed columns of TICKS_SCHEMA.
+        """
+        _, ticks_path = ArrowUtil.get_processed_game_paths(game_key, save_dir)
+
+        return pq.read_table(ticks_path, columns=columns, filters=filters).to_pandas()
+
+    @staticmethod
+    def read_processed_game(game_key, save_dir, with_moments=True, return_timeline=False):
+        """
+        Read a processed game back into a combined event DataFrame.
+
+        Args:
+            game_key (str): The unique identifier for the game.
+            save_dir (str): Directory holding the processed games.
+            with_moments (bool): Rebuild each event's (direction trimmed) MOMENTS from the timeline. Defaults to True.
+            return_timeline (bool): Also return the game's TickTimeline. Defaults to False.
+
+        Returns:
+            pd.DataFrame | Tuple[pd.DataFrame, TickTimeline]: Combined event DataFrame indexed by EVENTNUM,
+                                                               and the timeline if requested.
+        """
+        events_path, _ = ArrowUtil.get_processed_game_paths(game_key, save_dir)
+        events_df = pq.read_table(events_path).to_pandas().set_index("EVENTNUM")
+
+        if not (with_moments or return_timeline):
+            return events_df
+
+        event_ranges = {
+            event_num: (start, end)
+            for event_num, start, end in zip(
+                events_df.index.tolist(), events_df["START_TICK"].tolist(), events_df["END_TICK"].tolist()
+            )
+        }
+        timeline = TickTimeline.from_columns(
+            ArrowUtil.read_processed_ticks(game_key, save_dir), event_ranges
+        )
+
+        if with_moments:
+            event_ticks = timeline.get_direction_ticks(events_df.index, events_df["DIRECTION"])
+            events_df["MOMENTS"] = pd.Series(
+                [[timeline.moments[tick] for tick in ticks.tolist()] for ticks in event_ticks],
+                index=events_df.index,
+                dtype=object,
+            )
+
+        return (events_df, timeline) if return_timeline else events_df
@@ -4,6 +4,12 @@ class ConstantsUtil:
     CLEAN_DATA_PATH = STATIC_PATH + "/processed_games"
     EVENT_ANNOTATIONS_PATH = STATIC_PATH + "/event_annotations"
     CANDIDATES_PATH = STATIC_PATH + "/candidates"
+    TRACKING_TENSORS_PATH = STATIC_PATH + "/tracking_tensors"
+    GAME_CATALOG_PATH = STATIC_PATH + "/game_catalog.json"
+    ANNOTATIONS_TABLE_PATH = STATIC_PATH + "/event_annotations.parquet"
+
+    # Play-by-play events the pipeline works with: make, miss, turnover, and foul
+    KEPT_EVENTMSGTYPES = [1, 2, 5, 6]
     
     EVENTMSGTYPE_DICT = {
         1: "Field Goal Made",
@@ -1,7 +1,101 @@
-import os, ast, glob, easygui
+import os, ast, bz2, glob, gzip, json, lzma, shutil, easygui
 import pandas as pd
 import numpy as np
 from .ConstantsUtil import ConstantsUtil
+from .ArrowUtil import ArrowUtil
+from .TickTimeline import TickTimeline
+
+
+class _RawGameStream:
+    """
+    Incremental reader over the top-level object of a SportVU game file.
+
+    Values are decoded with json's raw_decode against a rolling text buffer, so only the
+    value currently being decoded (at most one event and its moments) is held in memory.
+    """
+
+    WHITESPACE = " \t\r\n"
+
+    def __init__(self, file_obj, chunk_size):
+        self.file_obj = file_obj
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _read_more(self, size):
+        chunk = self.file_obj.read(size)
+        if not chunk:
+            self.eof = True
+        # Drop everything already consumed so the buffer never outgrows the current value
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+
+    def _peek(self):
+        # Skip whitespace between tokens and return the next significant character
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in self.WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if self.eof:
+                raise ValueError("Unexpected end of SportVU game file.")
+            self._read_more(self.chunk_size)
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError(
+                f"Malformed SportVU game file: expected '{char}' but found '{self.buffer[self.pos]}'."
+            )
+        self.pos += 1
+
+    def _decode_value(self):
+        self._peek()
+        read_size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A value ending exactly at the buffer edge may be a truncated number, so only accept it with lookahead
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Grow the read geometrically so re-decoding a large event stays linear overall
+            self._read_more(read_size)
+            read_size *= 2
+
+    def iter_items(self):
+        """
+        Yield (key, value) pairs of the top-level game object, yielding one pair per event for the 'events' array.
+        """
+        self._expect("{")
+        while True:
+            char = self._peek()
+            if char == "}":
+                return
+            if char == ",":
+                self.pos += 1
+                continue
+
+            key = self._decode_value()
+            self._expect(":")
+            if key != "events":
+                yield key, self._decode_value()
+                continue
+
+            self._expect("[")
+            while True:
+                char = self._peek()
+                if char == "]":
+                    self.pos += 1
+                    break
+                if char == ",":
+                    self.pos += 1
+                    continue
+                yield key, self._decode_value()
 
 
 class DataLoader:
@@ -9,6 +103,20 @@ class DataLoader:
     A utility class for loading and converting data.
     """
 
+    # Number of characters read from a raw game file per buffer refill when streaming events
+    RAW_READ_CHUNK_SIZE = 1 << 20
+
+    # game_key -> raw game file path, seeded by the GameCatalog and filled in as games are located
+    raw_game_paths = {}
+
+    # Raw game file extensions, mapped to the function opening them as (decompressed) text streams
+    RAW_GAME_OPENERS = {
+        ".json": open,
+        ".json.gz": gzip.open,
+        ".json.bz2": bz2.open,
+        ".json.xz": lzma.open,
+    }
+
     @classmethod
     def load_game_and_annotation_df_gui(cls):
         # Note: Game files are located within folders named after the game date and teams, e.g., "01.01.2016.DAL.at.MIA"
@@ -42,7 +150,12 @@ class DataLoader:
         return game_df, annotation_df
 
     @classmethod
-    def load_raw_game(cls, game_key):
+    def get_raw_game_path(cls, game_key):
+        # Games already located (or cataloged) skip the folder glob
+        raw_path = cls.raw_game_paths.get(game_key)
+        if raw_path is not None and os.path.exists(raw_path):
+            return raw_path
+
         # Derive game folder name from game key
         # This might require custom logic to convert game_key to folder name format, e.g., "YYYYMMDDAAAHHH" to "MM.DD.YYYY.AAA.at.HHH"
         game_folder_name = cls.convert_game_key_to_folder_name(
@@ -50,24 +163,278 @@ class DataLoader:
         )  # Placeholder for actual conversion logic
 
         game_folder_path = os.path.join(ConstantsUtil.RAW_DATA_PATH, game_folder_name)
-        game_file_path = glob.glob(os.path.join(game_folder_path, "*.json"))[
+
+        raw_path = sorted(
+            raw_path
+            for extension in cls.RAW_GAME_OPENERS
+            for raw_path in glob.glob(os.path.join(game_folder_path, "*" + extension))
+        )[
             0
-        ]  # Assuming single JSON file per folder
+        ]  # Assuming single JSON file per folder, either plain or compressed
+        cls.raw_game_paths[game_key] = raw_path
 
-        return pd.read_json(game_file_path)
+        return raw_path
 
     @classmethod
-    def load_game_events(cls, game_key):
+    def is_raw_game_file(cls, file_name):
+        return any(file_name.endswith(extension) for extension in cls.RAW_GAME_OPENERS)
+
+    @classmethod
+    def open_raw_game(cls, raw_path):
+        """
+        Open a raw game file as a text stream, decompressing on the fly based on its extension.
+
+        Args:
+            raw_path (str): Path of a .json, .json.gz, .json.bz2 or .json.xz game file.
+
+        Returns:
+            TextIO: The opened (decompressed) text stream.
+        """
+        for extension, opener in cls.RAW_GAME_OPENERS.items():
+            if raw_path.endswith(extension):
+                return opener(raw_path, "rt")
+
+        raise ValueError(f"Unsupported raw game file: {raw_path}")
+
+    @classmethod
+    def compress_raw_games(cls, extension=".json.xz", remove_original=False):
+        """
+        Compress every uncompressed raw game file in RAW_DATA_PATH, streaming so no game is held in memory.
+
+        Args:
+            extension (str): Compressed extension to write, one of RAW_GAME_OPENERS. Defaults to '.json.xz'.
+            remove_original (bool): Delete each uncompressed file once compressed. Defaults to False.
+
+        Returns:
+            list: Paths of the compressed files written.
+        """
+        compressed = []
+        for raw_path in sorted(glob.glob(os.path.join(ConstantsUtil.RAW_DATA_PATH, "*", "*.json"))):
+            compressed_path = raw_path[: -len(".json")] + extension
+            if os.path.exists(compressed_path):
+                continue
+
+            # Compress to a temporary file first so an interrupted run never leaves a truncated game behind,
+            # which the existence check above would then skip for good
+            print(f"Compressing {raw_path}...")
+            tmp_path = compressed_path + ".tmp"
+            try:
+                with open(raw_path, "rb") as src, cls.RAW_GAME_OPENERS[extension](tmp_path, "wb") as dst:
+                    shutil.copyfileobj(src, dst, cls.RAW_READ_CHUNK_SIZE)
+                os.replace(tmp_path, compressed_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            compressed.append(compressed_path)
+
+            if remove_original:
+                os.remove(raw_path)
+
+        # Cached paths may point at removed files or miss the new ones
+        cls.raw_game_paths.clear()
+
+        return compressed
+
+    @classmethod
+    def load_raw_game(cls, game_key):
+        # pandas infers the compression from the file extension
+        return pd.read_json(cls.get_raw_game_path(game_key), compression="infer")
+
+    @classmethod
+    def iter_raw_game_events(cls, game_key):
+        """
+        Stream the events of a raw SportVU game file one at a time.
+
+        Unlike load_raw_game, the whole file is never materialized: each event dict (with its
+        'moments', 'home' and 'visitor' blocks) is parsed only when requested, so peak memory is
+        bounded by the largest event rather than the whole game.
+
+        Args:
+            game_key (str): The unique identifier for the game, ex: '20160122LACNYK'.
+
+        Yields:
+            dict: A single raw event, in file order.
+        """
+        for key, value in cls.iter_raw_game_items(game_key):
+            if key == "events":
+                yield value
+
+    @classmethod
+    def iter_raw_game_items(cls, game_key):
+        """
+        Stream the top-level (key, value) pairs of a raw SportVU game file, yielding one ('events', event) pair per event.
+
+        Args:
+            game_key (str): The unique identifier for the game, ex: '20160122LACNYK'.
+
+        Yields:
+            Tuple[str, object]: A game field ('gameid', 'gamedate') or a single raw event, in file order.
+        """
+        with cls.open_raw_game(cls.get_raw_game_path(game_key)) as file_obj:
+            yield from _RawGameStream(file_obj, cls.RAW_READ_CHUNK_SIZE).iter_items()
+
+    @classmethod
+    def load_raw_game_header(cls, game_key):
+        """
+        Load the game level fields of a raw SportVU game file along with its first event only.
+
+        The result has the same layout as load_raw_game (columns 'gameid', 'gamedate', 'events'),
+        so it can be handed to get_game_data, get_teams_data, get_players_data and get_players_dict
+        without reading the rest of the file.
+
+        Args:
+            game_key (str): The unique identifier for the game, ex: '20160122LACNYK'.
+
+        Returns:
+            pd.DataFrame: A single row DataFrame holding the game fields and the first event.
+        """
+        header = {}
+        with cls.open_raw_game(cls.get_raw_game_path(game_key)) as file_obj:
+            for key, value in _RawGameStream(file_obj, cls.RAW_READ_CHUNK_SIZE).iter_items():
+                if key != "events":
+                    header[key] = value
+                elif "events" not in header:
+                    header["events"] = value
+
+                if {"gameid", "gamedate", "events"} <= header.keys():
+                    break
+
+        return pd.DataFrame([header])
+
+    @classmethod
+    def get_annotation_path(cls, game_key):
         # Construct annotation file path
         annotation_file_name = f"events-{game_key}.csv"  # Assuming the game_key can directly derive the file name
-        annotation_path = os.path.join(
-            ConstantsUtil.EVENT_ANNOTATIONS_PATH, annotation_file_name
+
+        return os.path.join(ConstantsUtil.EVENT_ANNOTATIONS_PATH, annotation_file_name)
+
+    @classmethod
+    def load_game_events(cls, game_key):
+        return pd.read_csv(cls.get_annotation_path(game_key), index_col=0)
+
+    @classmethod
+    def load_game_annotations(cls, game_key):
+        """
+        Load the typed pipeline annotations of a game (see load_annotations).
+
+        Args:
+            game_key (str): The unique identifier for the game, ex: '20160122LACNYK'.
+
+        Returns:
+            pd.DataFrame: The game's make, miss, turnover and foul events, with the ArrowUtil.ANNOTATION_SCHEMA columns.
+        """
+        return cls.load_annotations([game_key]).drop(columns=["GAME_KEY"]).reset_index(drop=True)
+
+    @classmethod
+    def load_annotations(cls, game_keys=None):
+        """
+        Load the typed pipeline annotations of many games in one read.
+
+        Unlike load_game_events, only the ArrowUtil.ANNOTATION_SCHEMA columns are parsed (with explicit
+        dtypes), and only ConstantsUtil.KEPT_EVENTMSGTYPES rows are kept, filtered during the read.
+        Games are served from the cached annotation table (see build_annotation_table), falling back to
+        their CSV when it is missing from the table or was modified since the table was built.
+
+        Args:
+            game_keys (list, optional): Games to load. Defaults to every game in EVENT_ANNOTATIONS_PATH.
+
+        Returns:
+            pd.DataFrame: Annotations of every requested game, tagged with a GAME_KEY column.
+        """
+        if game_keys is None:
+            game_keys = list(cls.get_annotation_paths())
+
+        table_path = ConstantsUtil.ANNOTATIONS_TABLE_PATH
+        table_mtime = os.path.getmtime(table_path) if os.path.exists(table_path) else None
+        cached_keys = [
+            game_key
+            for game_key in game_keys
+            if table_mtime is not None and os.path.getmtime(cls.get_annotation_path(game_key)) <= table_mtime
+        ]
+
+        frames = []
+        found_keys = set()
+        if cached_keys:
+            cached_df = ArrowUtil.annotation_table_to_pandas(
+                ArrowUtil.read_annotation_table(table_path, cached_keys)
+            )
+            frames.append(cached_df)
+            found_keys = set(cached_df["GAME_KEY"])
+
+        for game_key in game_keys:
+            if game_key in found_keys:
+                continue
+            game_df = ArrowUtil.annotation_table_to_pandas(
+                ArrowUtil.read_annotation_csv(cls.get_annotation_path(game_key), ConstantsUtil.KEPT_EVENTMSGTYPES)
+            )
+            game_df.insert(0, "GAME_KEY", game_key)
+            frames.append(game_df)
+
+        annotation_df = pd.concat(frames, ignore_index=True)
+
+        # Keep the requested game order, and each game's rows in file order
+        game_order = {game_key: order for order, game_key in enumerate(game_keys)}
+
+        return annotation_df.sort_values(
+            "GAME_KEY", key=lambda keys: keys.map(game_order), kind="stable", ignore_index=True
         )
 
-        return pd.read_csv(annotation_path, index_col=0)
+    @classmethod
+    def get_annotation_paths(cls):
+        # Every annotation CSV in EVENT_ANNOTATIONS_PATH, keyed by game_key
+        return {
+            os.path.basename(annotation_path)[len("events-") : -len(".csv")]: annotation_path
+            for annotation_path in sorted(
+                glob.glob(os.path.join(ConstantsUtil.EVENT_ANNOTATIONS_PATH, "events-*.csv"))
+            )
+        }
 
     @classmethod
-    def load_processed_game(cls, game_id):
+    def build_annotation_table(cls, overwrite=False):
+        """
+        Parse the whole annotation archive once into the cached typed table at ANNOTATIONS_TABLE_PATH.
+
+        Args:
+            overwrite (bool): Rebuild even if no annotation CSV changed since the last build. Defaults to False.
+
+        Returns:
+            bool: Whether the table was (re)built.
+        """
+        annotation_paths = cls.get_annotation_paths()
+        table_path = ConstantsUtil.ANNOTATIONS_TABLE_PATH
+        if (
+            not overwrite
+            and os.path.exists(table_path)
+            and all(os.path.getmtime(path) <= os.path.getmtime(table_path) for path in annotation_paths.values())
+        ):
+            return False
+
+        print(f"Building annotation table from {len(annotation_paths)} games...")
+        ArrowUtil.write_annotation_table(annotation_paths, table_path, ConstantsUtil.KEPT_EVENTMSGTYPES)
+
+        return True
+
+    @classmethod
+    def load_processed_game(cls, game_id, with_moments=True, return_timeline=False):
+        events_path, _ = ArrowUtil.get_processed_game_paths(game_id, ConstantsUtil.CLEAN_DATA_PATH)
+
+        # Prefer the columnar format, which needs no parsing of the tracking data
+        if os.path.exists(events_path):
+            return ArrowUtil.read_processed_game(
+                game_id,
+                ConstantsUtil.CLEAN_DATA_PATH,
+                with_moments=with_moments,
+                return_timeline=return_timeline,
+            )
+
+        # Legacy CSVs hold per event moments, there is no timeline to return
+        df = cls.load_processed_game_csv(game_id)
+
+        return (df, None) if return_timeline else df
+
+    @classmethod
+    def load_processed_game_csv(cls, game_id):
         # Ingest data
         df = pd.read_csv(f"{ConstantsUtil.CLEAN_DATA_PATH}/{game_id}.csv", index_col=0)
 
@@ -75,7 +442,60 @@ class DataLoader:
         df["MOMENTS"] = df["MOMENTS"].apply(cls._eval_nested_list)
 
         return df
-    
+
+    @classmethod
+    def load_processed_ticks(cls, game_id, columns=None, filters=None):
+        """
+        Load the flat, typed ticks table of a processed game (one row per entity per unique tick).
+
+        Args:
+            game_id (str): The unique identifier for the game.
+            columns (list, optional): Subset of columns to read. Defaults to all.
+            filters (list, optional): Parquet predicate filters, ex: [("tick", ">=", 1000)].
+
+        Returns:
+            pd.DataFrame: The ticks table.
+        """
+        return ArrowUtil.read_processed_ticks(
+            game_id, ConstantsUtil.CLEAN_DATA_PATH, columns=columns, filters=filters
+        )
+
+    @classmethod
+    def convert_processed_game_csvs(cls, save_dir=ConstantsUtil.CLEAN_DATA_PATH, overwrite=False):
+        """
+        One-shot conversion of legacy processed game CSVs into the columnar format.
+
+        Args:
+            save_dir (str): Directory holding the processed game CSVs. Defaults to CLEAN_DATA_PATH.
+            overwrite (bool): Re-convert games that already have columnar tables. Defaults to False.
+
+        Returns:
+            list: Game keys that were converted.
+        """
+        converted = []
+        for csv_path in sorted(glob.glob(os.path.join(save_dir, "*.csv"))):
+            game_key = os.path.splitext(os.path.basename(csv_path))[0]
+            events_path, _ = ArrowUtil.get_processed_game_paths(game_key, save_dir)
+            if os.path.exists(events_path) and not overwrite:
+                continue
+
+            print(f"Converting {game_key}...")
+            df = pd.read_csv(csv_path, index_col=0)
+            df["MOMENTS"] = df["MOMENTS"].apply(cls._eval_nested_list)
+
+            # Fold the per event moments into a single tick timeline
+            timeline = TickTimeline.from_raw_events(
+                {"eventId": event_num, "moments": moments or []}
+                for event_num, moments in zip(df.index, df["MOMENTS"])
+            )
+            df["START_TICK"] = [timeline.event_ranges.get(event_num, (0, 0))[0] for event_num in df.index]
+            df["END_TICK"] = [timeline.event_ranges.get(event_num, (0, 0))[1] for event_num in df.index]
+
+            ArrowUtil.write_processed_game(df, timeline, game_key, save_dir)
+            converted.append(game_key)
+
+        return converted
+
     @classmethod
     def load_game_candidates(cls, game_key):
         # Construct annotation file path
@@ -110,6 +530,17 @@ class DataLoader:
 
         return folder_name
 
+    @staticmethod
+    def convert_folder_name_to_game_key(folder_name):
+        # Inverse of convert_game_key_to_folder_name
+        # Example: "01.01.2016.DAL.at.MIA" -> "20160101DALMIA"
+        parts = folder_name.split(".")
+        if len(parts) != 6 or parts[4] != "at":
+            raise ValueError(f"Not a game folder name: {folder_name}")
+        month, day, year, away_team, _, home_team = parts
+
+        return f"{year}{month}{day}{away_team}{home_team}"
+
     @staticmethod
     def convert_game_clock_to_timestamp(game_clock: float) -> str:
         """
@@ -9,6 +9,7 @@ from ml_nba.models import (
     CandidateFeatureVector,
     CandidateHexmap,
 )
+from .TrackingTensor import TrackingTensor
 
 
 class DatabaseUtil:
@@ -107,9 +108,33 @@ class DatabaseUtil:
             Game.objects.filter(game_id=game_id).delete()
 
     @staticmethod
-    def get_moments_for_event(event_id):
+    def get_moments_for_event(event_id, backend="orm", game_clock=None, window=2.0):
+        """
+        Fetch the moments of an event as a long DataFrame.
+
+        Parameters:
+        - event_id (str): The unique identifier for the event.
+        - backend (str): 'orm' to query the Moment table, or 'tensor' to read the game's memory-mapped TrackingTensor.
+        - game_clock (float, optional): When given, only moments strictly within game_clock ± window are returned.
+        - window (float): Half width of the game clock window in seconds. Defaults to 2.0.
+
+        Returns:
+        - pd.DataFrame: One row per entity per tick.
+        """
+        if backend == "tensor":
+            game_key = Event.objects.values_list("game_id", flat=True).get(event_id=event_id)
+            return TrackingTensor.open(game_key).get_event_moments(event_id, game_clock, window)
+        elif backend != "orm":
+            raise ValueError(f"Unknown moments backend: {backend}")
+
         # Fetch data from the database
-        moments_list = list(Moment.objects.filter(event_id=event_id).values())
+        moments_query = Moment.objects.filter(event_id=event_id)
+        if game_clock is not None:
+            moments_query = moments_query.filter(
+                game_clock__gt=game_clock - window, game_clock__lt=game_clock + window
+            )
+        # The Moment table has no default ordering, order rows by tick (then insertion) as the other backends return them
+        moments_list = list(moments_query.order_by("index", "id").values())
 
         # Create a DataFrame from the list
         moments = pd.DataFrame(moments_list)
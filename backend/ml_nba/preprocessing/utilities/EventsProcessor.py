@@ -1,9 +1,15 @@
 import json
+import numpy as np
 import pandas as pd
+from itertools import chain, compress
 from .ConstantsUtil import ConstantsUtil
 from .DataLoader import DataLoader
+from .TickTimeline import TickTimeline
 
 class EventsProcessor:
+    # Game clock quantum (in seconds) of candidate deduplication, a single SportVU tick at 25Hz
+    CANDIDATE_CLOCK_RESOLUTION = 0.04
+
     @staticmethod
     def convert_labeled_series_to_df(label_name, series_name, series_to_convert):
         """
@@ -45,21 +51,40 @@ class EventsProcessor:
         return pd.concat([dataframe.idxmin(), dataframe.min()], axis=1, keys=[dataframe.index.name, min_value_label])
 
     @staticmethod
-    def trim_moments_by_directionality(combined_event_df):
+    def trim_moments_by_directionality(combined_event_df, timeline=None):
         """
         Trim moments in a combined event DataFrame by directionality.
 
+        The half court filter is a boolean mask over the ball's x_loc of every tick in the game,
+        evaluated once, rather than a rebuilt list per event.
+
         Args:
             combined_event_df (pd.DataFrame): Combined event DataFrame.
+            timeline (TickTimeline, optional): The game's tick timeline, the MOMENTS of each event are then
+                                               rebuilt from its kept ticks. Defaults to masking the MOMENTS column.
 
         Returns:
             pd.DataFrame: Trimmed DataFrame.
         """
-        for index, event in combined_event_df.iterrows():
-            if event['DIRECTION'] == "RIGHT":
-                event['MOMENTS'][:] = [x for x in event['MOMENTS'] if x[5][0][2] > 45.0]
-            else:
-                event['MOMENTS'][:] = [x for x in event['MOMENTS'] if x[5][0][2] < 45.0]
+        if timeline is not None:
+            event_ticks = timeline.get_direction_ticks(combined_event_df.index, combined_event_df['DIRECTION'])
+            combined_event_df['MOMENTS'] = pd.Series(
+                [[timeline.moments[tick] for tick in ticks.tolist()] for ticks in event_ticks],
+                index=combined_event_df.index,
+                dtype=object,
+            )
+
+            return combined_event_df
+
+        # Lay the ball x_loc of every event's moments end to end, and mask them all in one comparison
+        moment_counts = combined_event_df['MOMENTS'].map(len).to_numpy(dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(moment_counts)))
+        ball_x = np.array([x[5][0][2] for moments in combined_event_df['MOMENTS'] for x in moments], dtype=np.float64)
+        is_right = np.repeat(combined_event_df['DIRECTION'].to_numpy() == "RIGHT", moment_counts)
+        keep = np.where(is_right, ball_x > TickTimeline.HALF_COURT_X, ball_x < TickTimeline.HALF_COURT_X)
+
+        for moments, start, end in zip(combined_event_df['MOMENTS'], offsets[:-1], offsets[1:]):
+            moments[:] = list(compress(moments, keep[start:end]))
 
         return combined_event_df
     
@@ -74,26 +99,91 @@ class EventsProcessor:
         Returns:
             pd.DataFrame: Moments DataFrame.
         """
-        player_moments = []
-        last_shot_clock = 24
-        game_clock_at_start = DataLoader.convert_timestamp_to_game_clock(event_df['PCTIMESTRING'])
+        moments_df, _ = EventsProcessor.flatten_moments(
+            [event_df["MOMENTS"]],
+            [DataLoader.convert_timestamp_to_game_clock(event_df['PCTIMESTRING'])],
+            [event_df["PERIOD"]],
+            [event_df["EVENT_ID"]],
+        )
+        moments_df["event_id"] = moments_df["event_id"].astype(object)
+
+        return moments_df
+
+    @staticmethod
+    def flatten_moments(event_moments, clocks_at_start, periods, event_ids):
+        """
+        Flatten the moments of one or more events into a long table in the ConstantsUtil.HEADERS layout.
 
-        for moment in event_df["MOMENTS"]:
-            # Normalize None shot clock to 0.0
-            shot_clock = 0.0 if moment[3] is None else moment[3]
+        The columns are built straight into NumPy arrays, one row per entity of every kept moment,
+        in time linear in the number of moments.
 
-            # Update shot clock only if it's valid and we're not at the end of the play
-            if shot_clock <= last_shot_clock or moment[2] >= game_clock_at_start:
-                last_shot_clock = shot_clock
-                last_game_clock = moment[2]
+        Args:
+            event_moments (list): The raw moments list of each event.
+            clocks_at_start (list): Game clock (in seconds) of each event's PCTIMESTRING.
+            periods (list): Period of each event.
+            event_ids (list): EVENT_ID of each event.
 
-                for player in moment[5]:
-                    player_copy = player.copy()
-                    moment_index = event_df["MOMENTS"].index(moment)
-                    player_copy.extend((moment_index, last_game_clock, last_shot_clock, event_df["PERIOD"], event_df["EVENT_ID"]))
-                    player_moments.append(player_copy)
+        Returns:
+            Tuple[pd.DataFrame, np.ndarray]: The moments table with a categorical event_id column, and the row
+                                             offsets of the events (event i spans rows offsets[i]:offsets[i + 1]).
+        """
+        moment_counts = np.fromiter(map(len, event_moments), dtype=np.int64, count=len(event_moments))
+        moment_offsets = np.concatenate(([0], np.cumsum(moment_counts)))
+        moments = list(chain.from_iterable(event_moments))
+        event_of_moment = np.repeat(np.arange(len(event_moments)), moment_counts)
 
-        return pd.DataFrame(player_moments, columns=ConstantsUtil.HEADERS)
+        # Normalize None shot clock to 0.0
+        game_clock = np.fromiter((moment[2] for moment in moments), dtype=np.float64, count=len(moments))
+        shot_clock = np.fromiter(
+            (0.0 if moment[3] is None else moment[3] for moment in moments), dtype=np.float64, count=len(moments)
+        )
+
+        # Moments up to the end of the play are always kept, later ones only while the shot clock does not go back up
+        # (above the last kept shot clock, starting from 24 for every event). As the last kept shot clock can only drop
+        # between two always kept moments, it is the running minimum of the shot clock since the last of them, computed
+        # on integer ranks so ties compare exactly. Every event's anchor of 24 is inserted ahead of its first moment
+        always_kept = game_clock >= np.repeat(np.asarray(clocks_at_start, dtype=np.float64), moment_counts)
+        clock_values, clock_ranks = np.unique(
+            np.insert(shot_clock, moment_offsets[:-1], 24.0), return_inverse=True
+        )
+        segments = np.cumsum(np.insert(always_kept, moment_offsets[:-1], True))
+        running_min = np.minimum.accumulate(clock_ranks - segments * len(clock_values)) + segments * len(clock_values)
+        # (moment k of event e sits at position k + e + 1 once the anchors are inserted)
+        last_kept_clock = clock_values[running_min[np.arange(len(moments)) + event_of_moment]]
+        kept_moments = np.flatnonzero(always_kept | (shot_clock <= last_kept_clock))
+        kept_events = event_of_moment[kept_moments]
+
+        # Flatten the entities of the kept moments, [team_id, player_id, x_loc, y_loc, radius] each
+        entity_counts = np.fromiter(
+            (len(moments[i][5]) for i in kept_moments.tolist()), dtype=np.int64, count=len(kept_moments)
+        )
+        entities = np.fromiter(
+            chain.from_iterable(chain.from_iterable(moments[i][5] for i in kept_moments.tolist())),
+            dtype=np.float64,
+            count=int(entity_counts.sum()) * 5,
+        ).reshape(-1, 5)
+        row_events = np.repeat(kept_events, entity_counts)
+
+        moments_df = pd.DataFrame(
+            {
+                "team_id": entities[:, 0].astype(np.int64),
+                "player_id": entities[:, 1].astype(np.int64),
+                "x_loc": entities[:, 2],
+                "y_loc": entities[:, 3],
+                "radius": entities[:, 4],
+                "index": np.repeat(kept_moments - moment_offsets[kept_events], entity_counts),
+                "game_clock": np.repeat(game_clock[kept_moments], entity_counts),
+                "shot_clock": np.repeat(shot_clock[kept_moments], entity_counts),
+                "period": np.asarray(periods, dtype=np.int64)[row_events],
+                "event_id": pd.Categorical.from_codes(row_events, categories=pd.Index(event_ids)),
+            },
+            columns=ConstantsUtil.HEADERS,
+        )
+        row_offsets = np.concatenate(
+            ([0], np.cumsum(np.bincount(kept_events, weights=entity_counts, minlength=len(event_moments))))
+        ).astype(np.int64)
+
+        return moments_df, row_offsets
 
     @staticmethod
     def extend_event_moments(game_df):
@@ -114,34 +204,78 @@ class EventsProcessor:
         return game_df
 
     @staticmethod
-    def remove_duplicate_candidates(all_candidates):
+    def remove_duplicate_candidates(all_candidates, clock_resolution=CANDIDATE_CLOCK_RESOLUTION, return_sources=False):
         """
         Remove duplicate candidates from a list of candidates.
 
+        SportVU events overlap, so the same pass is often found by several events, not necessarily adjacent
+        in the list, and its game clock may be read slightly differently by each. Candidates are deduplicated
+        through a hash index keyed on (game, period, shot_clock, passer, receiver) and a game_clock bucket,
+        in a single pass over candidates of one or many games: a candidate is the same pass as an earlier one
+        with the same key whose game_clock is within half of clock_resolution, looked up in its own and both
+        neighbouring buckets so readings either side of a bucket edge still match. Of each set of duplicates
+        the last one is kept, in its place in the list.
+
         Args:
             all_candidates (list): List of candidate dictionaries.
+            clock_resolution (float): Game clock quantum (in seconds), candidates closer than half of it share a time.
+                                      Defaults to CANDIDATE_CLOCK_RESOLUTION, a single tick.
+            return_sources (bool): Also return the events contributing each kept candidate. Defaults to False.
 
         Returns:
             list: List of unique candidates.
+            dict: When return_sources, candidate_id -> event_ids (in order) of every candidate it stands for.
         """
-        final_candidates = []
-        offset_length = 5
-        duplicate = False
-
-        for index in range(0, len(all_candidates)):
-            if index + offset_length >= len(all_candidates):
-                final_candidates.append(all_candidates[index])
-            else:
-                for offset in range(1, offset_length):
-                    if (
-                        all_candidates[index]['period'] == all_candidates[index + offset]['period']
-                        and all_candidates[index]['game_clock'] == all_candidates[index + offset]['game_clock']
-                        and all_candidates[index]['shot_clock'] == all_candidates[index + offset]['shot_clock']
-                    ):
-                        duplicate = True
-                        break
-                if not duplicate:
-                    final_candidates.append(all_candidates[index])
-                duplicate = False
-
-        return final_candidates
+        def get_key(candidate):
+            return (
+                candidate['event_id'].split('-')[0],
+                candidate['period'],
+                candidate['shot_clock'],
+                candidate['player_a'],
+                candidate['player_b'],
+            )
+
+        tolerance = clock_resolution / 2
+
+        # Index every candidate under its key and game clock bucket, grouping it with the first earlier candidate
+        # matching it, and collect the last candidate and the events finding it of every group along the way
+        group_clocks = {}
+        group_of_candidate = []
+        last_of_group = []
+        sources_of_group = []
+        for index, candidate in enumerate(all_candidates):
+            key = get_key(candidate)
+            game_clock = candidate['game_clock']
+            bucket = int(game_clock // clock_resolution)
+            group = next(
+                (
+                    group
+                    for neighbour in (bucket - 1, bucket, bucket + 1)
+                    for group, other_clock in group_clocks.get((key, neighbour), [])
+                    if abs(game_clock - other_clock) < tolerance
+                ),
+                None,
+            )
+            if group is None:
+                group = len(last_of_group)
+                last_of_group.append(index)
+                sources_of_group.append([])
+
+            group_clocks.setdefault((key, bucket), []).append((group, game_clock))
+            group_of_candidate.append(group)
+            last_of_group[group] = index
+            if candidate['event_id'] not in sources_of_group[group]:
+                sources_of_group[group].append(candidate['event_id'])
+
+        final_candidates = [
+            candidate
+            for index, (group, candidate) in enumerate(zip(group_of_candidate, all_candidates))
+            if last_of_group[group] == index
+        ]
+
+        if not return_sources:
+            return final_candidates
+
+        return final_candidates, {
+            all_candidates[index]['candidate_id']: sources for index, sources in zip(last_of_group, sources_of_group)
+        }
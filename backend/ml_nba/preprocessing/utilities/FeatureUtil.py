@@ -1,14 +1,14 @@
 import math
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from ml_nba.models import Event, Player
-from ml_nba.visualization.GraphUtil import GraphUtil
 from scipy.spatial.distance import euclidean
 from scipy.stats import linregress
 from .DataLoader import DataLoader
 from .PlayerMvmtProcessor import PlayerMvmtProcessor
 from .DatabaseUtil import DatabaseUtil
+from .MomentTensor import MomentTensor
+from .HexGrid import HexGrid
 
 
 class FeatureUtil:
@@ -19,129 +19,166 @@ class FeatureUtil:
     calculating travel distances, player speed, and other basketball-related features.
     """
 
+    # Hexbin grid of the location features, the half court with y_loc offset by -50
+    HEXBIN_GRID = HexGrid(gridsize=50, extent=(0, 94, -50, 0))
+
+    # Half width (in seconds of game clock) of the moments around a candidate's pass its features are computed on
+    FEATURE_WINDOW = 2.0
+
     @staticmethod
     def determine_possession_from_eventmsg(annotation_df, players_data):
         """
         Revised method to determine possession for each event in the annotation DataFrame,
         addressing edge cases and refining logic based on basketball rules.
 
+        Every rule is evaluated column-wise over the whole frame, so annotations of many games
+        (ex: DataLoader.load_annotations, tagged by a GAME_KEY column) are labelled in one pass.
+
         Args:
             annotation_df (pd.DataFrame): DataFrame containing event annotations.
-            players_data (list): List of dictionaries with player and team data.
+            players_data (list | dict): List of dictionaries with player and team data, or for a
+                                        multi-game frame, a dict of such lists keyed by GAME_KEY.
 
         Returns:
             pd.DataFrame: Updated DataFrame with a new 'possession' column indicating
                         the team in possession for each event.
         """
-        # Convert the list of player data dictionaries into a player_id to team_id mapping
-        player_to_team_map = {player['player_id']: player['team_id'] for player in players_data}
-        # Extract unique team IDs for handling cases where opposite team's ID is needed
-        unique_team_ids = set(player['team_id'] for player in players_data)
-
-        def determine_event_possession(row):
-            # Default assumption for possession based on PLAYER1_TEAM_ID
-            possession_key = 'PLAYER1_TEAM_ID'
-
-            event_type = row['EVENTMSGTYPE']
-            # Adjust logic based on event type
-            if event_type in [1, 2]:  # Possession typically remains with PLAYER1's team
-                possession_key = 'PLAYER1_TEAM_ID'
-            elif event_type == 5:  # Handling all turnovers
-                # Check if PLAYER1_ID corresponds to a team ID, which indicates a team turnover
-                if row['PLAYER1_ID'] in unique_team_ids:
-                    # This signifies the team that has committed the turnover
-                    return row['PLAYER1_ID']
-                else:
-                    possession_key = 'PLAYER1_TEAM_ID'  # Handle individual turnovers normally
-            elif event_type == 6:
-                # If it's a type of foul, decide based on specific rules or descriptions
-                # For defensive fouls or where PLAYER2_ID is zero, special handling might be needed
-                if row['PLAYER2_ID'] == 0:
-                    # Here, we might need to determine possession based on the context of the foul
-                    # E.g., for a defensive 3 seconds violation, switch possession to the other team
-                    # This might need customization based on your data and rules
-                    if "Def. 3 Sec" in (str(row["VISITORDESCRIPTION"]) + str(row["HOMEDESCRIPTION"])).replace('nan', ''):
-                        # Determine the team that's not committing the foul
-                        non_fouling_team_id = next((id for id in unique_team_ids if id != row['PLAYER1_TEAM_ID']), 'Unknown')
-                        return non_fouling_team_id
-                    # Add additional foul-specific conditions here
-                else:
-                    # For other types of fouls, use PLAYER2_TEAM_ID when available
-                    possession_key = 'PLAYER2_TEAM_ID'
-
-            # Final check for possession, either directly or via player-team mapping
-            if pd.isna(row.get(possession_key)):
-                player_id_key = 'PLAYER1_ID' if possession_key == 'PLAYER1_TEAM_ID' else 'PLAYER2_ID'
-                player_id = row.get(player_id_key)
-                return player_to_team_map.get(player_id, 'Unknown')  # Default to 'Unknown' if mapping fails
-            else:
-                return row.get(possession_key)
-        # Apply the custom logic to each event in the DataFrame
-        annotation_df['POSSESSION'] = annotation_df.apply(determine_event_possession, axis=1).astype(int)
+        # Tag every player with its game, a single game frame being one game with an empty key
+        if isinstance(players_data, dict):
+            game_keys = annotation_df["GAME_KEY"].to_numpy()
+            players_df = pd.DataFrame(
+                [{**player, "GAME_KEY": game_key} for game_key, players in players_data.items() for player in players]
+            )
+        else:
+            game_keys = np.full(len(annotation_df), "", dtype=object)
+            players_df = pd.DataFrame(players_data).assign(GAME_KEY="")
+
+        # Player to team mapping per game (later entries win, as with a dict built from the list)
+        player_to_team = players_df.drop_duplicates(["GAME_KEY", "player_id"], keep="last").set_index(
+            ["GAME_KEY", "player_id"]
+        )["team_id"]
+
+        # The two teams of each game, in the order the original set based lookup visited them
+        team_pairs = {
+            game_key: (list(dict.fromkeys(set(team_ids))) + [np.nan, np.nan])[:2]
+            for game_key, team_ids in players_df.groupby("GAME_KEY", sort=False)["team_id"]
+        }
+        first_team = pd.Series({key: pair[0] for key, pair in team_pairs.items()}, dtype="float64").reindex(game_keys).to_numpy()
+        second_team = pd.Series({key: pair[1] for key, pair in team_pairs.items()}, dtype="float64").reindex(game_keys).to_numpy()
+
+        def lookup_team(player_col):
+            return player_to_team.reindex(
+                pd.MultiIndex.from_arrays([game_keys, annotation_df[player_col].to_numpy()])
+            ).to_numpy(dtype="float64")
+
+        event_type = annotation_df["EVENTMSGTYPE"].to_numpy()
+        player1_id = annotation_df["PLAYER1_ID"].to_numpy()
+        player2_id = annotation_df["PLAYER2_ID"].to_numpy()
+        player1_team = annotation_df["PLAYER1_TEAM_ID"].to_numpy(dtype="float64")
+        player2_team = annotation_df["PLAYER2_TEAM_ID"].to_numpy(dtype="float64")
+
+        # Team ids come straight from the annotation when present, else via the player-team mapping
+        player1_possession = np.where(np.isnan(player1_team), lookup_team("PLAYER1_ID"), player1_team)
+        player2_possession = np.where(np.isnan(player2_team), lookup_team("PLAYER2_ID"), player2_team)
+
+        # A defensive 3 seconds violation hands possession to the team not committing the foul
+        defensive_three_seconds = (
+            annotation_df["VISITORDESCRIPTION"].str.contains("Def. 3 Sec", regex=False, na=False)
+            | annotation_df["HOMEDESCRIPTION"].str.contains("Def. 3 Sec", regex=False, na=False)
+        ).to_numpy()
+        non_fouling_team = np.where(player1_team == first_team, second_team, first_team)
+
+        conditions = [
+            # Team turnovers list the team committing the turnover as PLAYER1_ID
+            (event_type == 5) & ((player1_id == first_team) | (player1_id == second_team)),
+            # Fouls without a PLAYER2 (ex: defensive 3 seconds) are decided from their description
+            (event_type == 6) & (player2_id == 0) & defensive_three_seconds,
+            # For other types of fouls, use PLAYER2's team
+            (event_type == 6) & (player2_id != 0),
+        ]
+        choices = [player1_id, non_fouling_team, player2_possession]
+
+        # Makes, misses and individual turnovers (and remaining fouls) stay with PLAYER1's team,
+        # raising when a player cannot be mapped to a team
+        annotation_df['POSSESSION'] = pd.Series(
+            np.select(conditions, choices, default=player1_possession), index=annotation_df.index
+        ).astype(int)
 
         return annotation_df
 
 
     @staticmethod
-    def determine_directionality(combined_event_df):
+    def determine_directionality(combined_event_df, timeline=None):
         """
         Determine directionality for events in the combined event DataFrame.
 
+        Every made field goal is aligned to the first of its ticks within a second of its PCTIMESTRING,
+        and the ball's x_loc there tells which basket was scored on. The two teams always attack opposite
+        baskets, so the direction of each half is the majority vote over the makes of both teams (the
+        opponent's votes mirrored), and a single glitchy ball position cannot flip a game. Halves without
+        a decisive vote fall back to the vote pooled over both halves.
+
         Args:
             combined_event_df (pd.DataFrame): DataFrame containing combined event data.
+            timeline (TickTimeline, optional): The game's tick timeline, with START_TICK/END_TICK ranges in
+                                               combined_event_df. Defaults to reading the MOMENTS column.
 
         Returns:
             pd.DataFrame: DataFrame with a new 'direction' column indicating directionality for each event.
         """
-        reached_end_of_play = False
-        last_moment = []
-        last_event = []
-        team_basket = {"team": -1, "direction": ""}
-
-        # Loop through the events, looking for a made field goal in the first half
-        for index, row in combined_event_df.iterrows():
-            if row["EVENTMSGTYPE"] == 1 and row["PERIOD"] < 3:
-                event_time = DataLoader.convert_timestamp_to_game_clock(
-                    row["PCTIMESTRING"]
-                )
-                # we want to find the end of the play, so we can determine which basket was scored on
-                for moment in row["MOMENTS"]:
-                    if (moment[2] <= event_time + 1) and (moment[2] >= event_time - 1):
-                        last_event = row
-                        last_moment = moment
-                        reached_end_of_play = True
-                        break
-                if reached_end_of_play:
-                    break
-
-        # Once we have found it, check the x_loc of the ball to determine basket
-        team_basket["team"] = last_event["POSSESSION"]
-        if last_moment[5][0][2] >= 47.0:
-            team_basket["DIRECTION"] = "RIGHT"
+        makes = combined_event_df[combined_event_df["EVENTMSGTYPE"] == 1]
+        make_times = np.array(
+            [DataLoader.convert_timestamp_to_game_clock(time) for time in makes["PCTIMESTRING"]], dtype=np.float64
+        )
+
+        # Lay the ticks of every make end to end, as (game clock, ball x_loc) columns with an offset per make
+        if timeline is not None:
+            tick_starts = makes["START_TICK"].to_numpy(dtype=np.int64)
+            tick_counts = makes["END_TICK"].to_numpy(dtype=np.int64) - tick_starts
+            offsets = np.concatenate(([0], np.cumsum(tick_counts)))
+            ticks = np.repeat(tick_starts - offsets[:-1], tick_counts) + np.arange(offsets[-1])
+            game_clock, ball_x = timeline.game_clock[ticks], timeline.ball_x[ticks]
         else:
-            team_basket["DIRECTION"] = "LEFT"
-        other_direction = "RIGHT" if team_basket["DIRECTION"] == "LEFT" else "LEFT"
+            tick_counts = makes["MOMENTS"].map(len).to_numpy(dtype=np.int64)
+            offsets = np.concatenate(([0], np.cumsum(tick_counts)))
+            game_clock = np.array([moment[2] for moments in makes["MOMENTS"] for moment in moments], dtype=np.float64)
+            ball_x = np.array([moment[5][0][2] for moments in makes["MOMENTS"] for moment in moments], dtype=np.float64)
+
+        # The end of each play is its first tick within a second of the make, found for every make at once
+        in_window = np.abs(game_clock - np.repeat(make_times, tick_counts)) <= 1
+        # (the past-the-end sentinel marks makes without such a tick)
+        window_ticks = np.append(np.flatnonzero(in_window), offsets[-1])
+        first_ticks = window_ticks[np.searchsorted(window_ticks, offsets[:-1])]
+        aligned = first_ticks < offsets[1:]
+        if not aligned.any():
+            raise ValueError("No made field goal could be aligned to its tracking data to determine directionality")
+
+        # Votes are +1 for scoring on the right basket, -1 for the left
+        make_votes = pd.DataFrame(
+            {
+                "POSSESSION": makes["POSSESSION"].to_numpy()[aligned],
+                "SECOND_HALF": makes["PERIOD"].to_numpy()[aligned] >= 3,
+                "VOTE": np.where(ball_x[first_ticks[aligned]] >= 47.0, 1, -1),
+            }
+        )
 
-        # Next, set up the conditions and values for directionality, direction flips after the second period
-        conditions = [
-            (combined_event_df["POSSESSION"] == team_basket["team"])
-            & (combined_event_df["PERIOD"] < 3),
-            (combined_event_df["POSSESSION"] != team_basket["team"])
-            & (combined_event_df["PERIOD"] < 3),
-            (combined_event_df["POSSESSION"] == team_basket["team"])
-            & (combined_event_df["PERIOD"] >= 3),
-            (combined_event_df["POSSESSION"] != team_basket["team"])
-            & (combined_event_df["PERIOD"] >= 3),
-        ]
-        values = [
-            team_basket["DIRECTION"],
-            other_direction,
-            other_direction,
-            team_basket["DIRECTION"],
-        ]
+        # Mirror the opponent's votes into the frame of one reference team, then pool both halves into the
+        # first half's frame, direction flips after the second period
+        reference_team = make_votes["POSSESSION"].iloc[0]
+        team_votes = make_votes["VOTE"] * np.where(make_votes["POSSESSION"] != reference_team, -1, 1)
+        pooled_vote = 1 if (team_votes * np.where(make_votes["SECOND_HALF"], -1, 1)).sum() >= 0 else -1
+
+        # Majority vote of the reference team per half, falling back to the pooled vote where it is missing or tied
+        half_votes = team_votes.groupby(make_votes["SECOND_HALF"]).sum()
+        event_second_half = combined_event_df["PERIOD"].to_numpy() >= 3
+        event_votes = half_votes.reindex(event_second_half).fillna(0).to_numpy()
+        event_votes = np.where(event_votes != 0, np.sign(event_votes), pooled_vote * np.where(event_second_half, -1, 1))
+
+        # The opponent always attacks the other basket
+        event_votes = event_votes * np.where(combined_event_df["POSSESSION"].to_numpy() != reference_team, -1, 1)
 
         # Finally, map the direction onto each event and return the combined event dataframe
-        combined_event_df["DIRECTION"] = np.select(conditions, values)
+        combined_event_df["DIRECTION"] = np.where(event_votes > 0, "RIGHT", "LEFT")
 
         return combined_event_df
 
@@ -173,11 +210,11 @@ class FeatureUtil:
         Returns:
             pd.Series: Series containing total distance traveled by each player.
         """
-        player_travel_dist = event_df.groupby("player_id")[["x_loc", "y_loc"]].apply(
-            lambda x: np.sqrt(((np.diff(x, axis=0) ** 2).sum(axis=1)).sum())
+        trajectory_stats = FeatureUtil.get_trajectory_stats(
+            event_df["player_id"], event_df["x_loc"], event_df["y_loc"], event_df["game_clock"]
         )
 
-        return player_travel_dist
+        return trajectory_stats["step_norm"].droplevel("window").rename(None)
 
     @staticmethod
     def average_speed(event_df, player_id=None):
@@ -241,15 +278,116 @@ class FeatureUtil:
         Returns:
             pd.Series: Series containing average speed in miles per hour for each player.
         """
-        seconds = event_df.game_clock.max() - event_df.game_clock.min()
-        player_speeds = (
-            event_df.groupby("player_id")[["x_loc", "y_loc"]].apply(
-                lambda x: np.sqrt(((np.diff(x, axis=0) ** 2).sum(axis=1)).sum())
+        trajectory_stats = FeatureUtil.get_trajectory_stats(
+            event_df["player_id"], event_df["x_loc"], event_df["y_loc"], event_df["game_clock"]
+        )
+
+        return trajectory_stats["avg_speed"].droplevel("window").rename(None)
+
+    @staticmethod
+    def get_trajectory_stats(entity_ids, x, y, game_clock, window_ids=None):
+        """
+        Calculate the travel distance, average speed and least-squares line of the trajectory of every entity
+        in every window (e.g. approach and execution), all at once.
+
+        Rows are grouped by (window, entity) with a stable sort, so every trajectory keeps its tick order and
+        occupies a contiguous segment. Each statistic is then a segment reduction (np.add.reduceat) over
+        the rows, rather than a filtered frame and a separate pass per trajectory.
+
+        Args:
+            entity_ids (array-like): player_id of every row (-1 for the ball).
+            x (array-like): x_loc of every row.
+            y (array-like): y_loc of every row.
+            game_clock (array-like): game_clock of every row.
+            window_ids (array-like, optional): Window of every row, rows of a negative window are left out.
+                                               Defaults to a single window 0.
+
+        Returns:
+            pd.DataFrame: Indexed by (window, player_id), with columns:
+                - num_ticks: number of rows of the trajectory
+                - travel_dist: total distance traveled (as travel_dist)
+                - step_norm: root of the summed squared steps (as travel_dist_all)
+                - avg_speed: step_norm over the game clock span of the whole window, in miles per hour (as average_speed)
+                - slope, intercept, rvalue: least-squares fit of y_loc on x_loc (as scipy.stats.linregress), NaN
+                  when x_loc is constant (single tick trajectories included), where linregress raises
+        """
+        entity_ids = np.asarray(entity_ids, dtype=np.int64)
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        game_clock = np.asarray(game_clock, dtype=np.float64)
+        if window_ids is None:
+            window_ids = np.zeros(len(entity_ids), dtype=np.int64)
+        else:
+            window_ids = np.asarray(window_ids, dtype=np.int64)
+
+        columns = ["num_ticks", "travel_dist", "step_norm", "avg_speed", "slope", "intercept", "rvalue"]
+        kept = np.flatnonzero(window_ids >= 0)
+        if len(kept) == 0:
+            return pd.DataFrame(
+                columns=columns, index=pd.MultiIndex.from_arrays([[], []], names=["window", "player_id"])
             )
-            / seconds
-        ) * 0.681818
 
-        return player_speeds
+        # Group the rows by window then entity, the sort is stable so each trajectory stays in tick order
+        order = kept[np.lexsort((entity_ids[kept], window_ids[kept]))]
+        windows, entities = window_ids[order], entity_ids[order]
+        x, y, game_clock = x[order], y[order], game_clock[order]
+
+        new_window = np.ones(len(order), dtype=bool)
+        new_window[1:] = windows[1:] != windows[:-1]
+        new_segment = new_window.copy()
+        new_segment[1:] |= entities[1:] != entities[:-1]
+        window_starts = np.flatnonzero(new_window)
+        segment_starts = np.flatnonzero(new_segment)
+        segment_of_row = np.cumsum(new_segment) - 1
+        window_of_segment = np.cumsum(new_window)[segment_starts] - 1
+        num_ticks = np.diff(np.append(segment_starts, len(order)))
+
+        # Squared length of the step into every row, steps across two trajectories are zeroed
+        step_sq = np.zeros(len(order))
+        step_sq[1:] = np.diff(x) ** 2 + np.diff(y) ** 2
+        step_sq[segment_starts] = 0.0
+        travel_dist = np.add.reduceat(np.sqrt(step_sq), segment_starts)
+        step_norm = np.sqrt(np.add.reduceat(step_sq, segment_starts))
+
+        # Speeds are taken over the game clock span of the whole window, as average_speed does
+        seconds = np.maximum.reduceat(game_clock, window_starts) - np.minimum.reduceat(game_clock, window_starts)
+
+        # Least squares on the centered coordinates of each trajectory, as linregress
+        x_mean = np.add.reduceat(x, segment_starts) / num_ticks
+        y_mean = np.add.reduceat(y, segment_starts) / num_ticks
+        x_centered = x - x_mean[segment_of_row]
+        y_centered = y - y_mean[segment_of_row]
+        ssxm = np.add.reduceat(x_centered * x_centered, segment_starts) / num_ticks
+        ssym = np.add.reduceat(y_centered * y_centered, segment_starts) / num_ticks
+        ssxym = np.add.reduceat(x_centered * y_centered, segment_starts) / num_ticks
+        # Checked on the raw values, as the centered ones of a constant x_loc need not be exactly 0
+        x_is_constant = np.maximum.reduceat(x, segment_starts) == np.minimum.reduceat(x, segment_starts)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            avg_speed = 0.681818 * step_norm / seconds[window_of_segment]
+            slope = np.where(x_is_constant, np.nan, ssxym / ssxm)
+            is_flat = (ssxm == 0.0) | (ssym == 0.0)
+            rvalue = np.where(
+                x_is_constant,
+                np.nan,
+                np.where(is_flat, np.where(ssxym == 0.0, np.nan, 0.0), np.clip(ssxym / np.sqrt(ssxm * ssym), -1.0, 1.0)),
+            )
+        intercept = y_mean - slope * x_mean
+
+        return pd.DataFrame(
+            {
+                "num_ticks": num_ticks,
+                "travel_dist": travel_dist,
+                "step_norm": step_norm,
+                "avg_speed": avg_speed,
+                "slope": slope,
+                "intercept": intercept,
+                "rvalue": rvalue,
+            },
+            index=pd.MultiIndex.from_arrays(
+                [windows[segment_starts], entities[segment_starts]], names=["window", "player_id"]
+            ),
+        )
 
     @staticmethod
     def distance_between_players_at_moment(player_a, player_b):
@@ -266,45 +404,75 @@ class FeatureUtil:
         return euclidean(player_a, player_b)
 
     @staticmethod
-    def distance_between_players(player_a, player_b):
+    def align_player_locations(player_a, player_b):
+        """
+        Align the locations of two players on the moments both are on the court.
+
+        Args:
+            player_a (pd.DataFrame): Player A's x_loc/y_loc, with an 'index' (moment number) column.
+            player_b (pd.DataFrame): Player B's x_loc/y_loc, with an 'index' (moment number) column.
+                                     Without 'index' columns, rows are aligned by position over the shorter length.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Player A and B's [moment, (x_loc, y_loc)] locations and the
+                                                       moment numbers they were aligned on.
+        """
+        locations_a = player_a[["x_loc", "y_loc"]].to_numpy(dtype=np.float64)
+        locations_b = player_b[["x_loc", "y_loc"]].to_numpy(dtype=np.float64)
+
+        if "index" not in player_a or "index" not in player_b:
+            player_range = min(len(player_a), len(player_b))
+            return locations_a[:player_range], locations_b[:player_range], np.arange(player_range)
+
+        moments, rows_a, rows_b = np.intersect1d(
+            player_a["index"].to_numpy(), player_b["index"].to_numpy(), assume_unique=True, return_indices=True
+        )
+
+        return locations_a[rows_a], locations_b[rows_b], moments
+
+    @staticmethod
+    def distance_between_players(player_a, player_b, as_frame=False):
         """
         Calculate the Euclidean distance between two players at each moment.
 
         Args:
             player_a (pd.DataFrame): DataFrame containing player A's location coordinates.
             player_b (pd.DataFrame): DataFrame containing player B's location coordinates.
+            as_frame (bool): Return a DataFrame with 'index' and 'distance' columns. Defaults to False.
 
         Returns:
-            list: List of distances between player A and player B at each moment.
+            np.ndarray: Distances between player A and player B at each moment both are tracked
+                        (joined on the 'index' column, see align_player_locations).
         """
-        player_range = min(len(player_a), len(player_b))
+        locations_a, locations_b, moments = FeatureUtil.align_player_locations(player_a, player_b)
+        distances = np.linalg.norm(locations_a - locations_b, axis=1)
 
-        return [
-            euclidean(
-                player_a.iloc[i][["x_loc", "y_loc"]],
-                player_b.iloc[i][["x_loc", "y_loc"]],
-            )
-            for i in range(player_range)
-        ]
+        if as_frame:
+            return pd.DataFrame({"index": moments, "distance": distances})
+
+        return distances
 
     @staticmethod
-    def distance_between_players_with_moment(player_a, player_b):
+    def distance_between_players_with_moment(player_a, player_b, as_frame=False):
         """
         Calculate the Euclidean distance between two players at each moment, including moment numbers.
 
         Args:
             player_a (pd.DataFrame): DataFrame containing player A's location coordinates and moment numbers.
             player_b (pd.DataFrame): DataFrame containing player B's location coordinates and moment numbers.
+            as_frame (bool): Return a DataFrame with 'index' and 'distance' columns. Defaults to False.
 
         Returns:
-            list: List of tuples (distance, moment#) between player A and player B at each moment.
+            Tuple[np.ndarray, np.ndarray]: Distances between player A and player B at each moment both are tracked,
+                                           and the moment numbers.
         """
-        player_range = min(len(player_a), len(player_b))
+        locations_a, locations_b, moments = FeatureUtil.align_player_locations(player_a, player_b)
+        distances = np.linalg.norm(locations_a - locations_b, axis=1)
 
-        return [
-            (euclidean(player_a.iloc[i][:1], player_b.iloc[i][:1]), player_a.iloc[i][2])
-            for i in range(player_range)
-        ]
+        if as_frame:
+            return pd.DataFrame({"index": moments, "distance": distances})
+
+        return distances, moments
 
     @staticmethod
     def distance_between_ball_and_players(moments_df, player_ids):
@@ -354,37 +522,60 @@ class FeatureUtil:
         return result_df
 
     @staticmethod
-    def distance_between_player_and_other_players(player_id, player_loc, event_df):
+    def get_distances_from_player(tensor, player_id, other_player_ids):
+        """
+        Look up the distance between a player and other players (or the ball, -1) at every tick in the
+        tensor's distance cube.
+
+        Args:
+            tensor (MomentTensor): The moments to look distances up in.
+            player_id (int): Player ID for the reference player.
+            other_player_ids (Iterable[int]): Player IDs to get the distance to.
+
+        Returns:
+            pd.Series: Indexed by player_id, (distance, moment index) tuples over the ticks both players are on the court.
+        """
+        distances = tensor.get_distances_from(player_id)
+        tick_index = tensor.ticks["index"].to_numpy()
+
+        player_distances = {}
+        for other_id in sorted(other_player_ids):
+            other_distances = distances[:, tensor.get_slot(other_id)]
+            present = np.flatnonzero(~np.isnan(other_distances))
+            player_distances[other_id] = list(
+                zip(other_distances[present].astype(np.float64).tolist(), tick_index[present].tolist())
+            )
+
+        return pd.Series(player_distances, dtype=object).rename_axis("player_id")
+
+    @staticmethod
+    def distance_between_player_and_other_players(player_id, player_loc, event_df, tensor=None):
         """
-        Calculate the distance between a player and all other players at each moment.
+        Calculate the distance between a player and all other players (and the ball) at each moment.
 
         Args:
             player_id (int): Player ID for the reference player.
-            player_loc (pd.Series): DataFrame row representing the reference player's location.
+            player_loc (pd.DataFrame): The reference player's locations (see PlayerMvmtProcessor.get_player_position_data).
+                                       Kept for compatibility, distances are taken between both players' locations at the same tick of event_df.
             event_df (pd.DataFrame): Event DataFrame containing player location coordinates.
+            tensor (MomentTensor, optional): event_df as a MomentTensor, reusing its cached distance cube. Defaults to building one.
 
         Returns:
             pd.Series: Series containing distances between the reference player and other players at each moment.
         """
-        group = event_df[event_df.player_id != player_id].groupby("player_id")[
-            ["x_loc", "y_loc", "index"]
+        if tensor is None:
+            tensor = MomentTensor.from_moments_df(event_df)
+        other_ids = [
+            other_id
+            for other_id in tensor.slot_players.tolist()
+            if other_id not in (player_id, MomentTensor.EMPTY_SLOT_ID)
         ]
 
-        return group.apply(
-            lambda x: [
-                (
-                    euclidean(
-                        player_loc[["x_loc", "y_loc"]].values[0], x.iloc[i][["x_loc", "y_loc"]]
-                    ),
-                    x.iloc[i]["index"],
-                )
-                for i in range(len(x))
-            ]
-        )
+        return FeatureUtil.get_distances_from_player(tensor, player_id, other_ids)
 
     @staticmethod
     def distance_between_player_and_defensive_players(
-        player_id, defending_ids, moments_df
+        player_id, defending_ids, moments_df, tensor=None
     ):
         """
         Calculate the distance between a player and defensive players at each moment.
@@ -393,25 +584,16 @@ class FeatureUtil:
             player_id (int): Player ID for the reference player.
             defending_ids (list): List of defensive player IDs.
             moments_df (pd.DataFrame): DataFrame containing moment data.
+            tensor (MomentTensor, optional): moments_df as a MomentTensor, reusing its cached distance cube. Defaults to building one.
 
         Returns:
             pd.Series: Series containing distances between the reference player and defensive players at each moment.
         """
-        group = moments_df[moments_df.player_id.isin(defending_ids)].groupby(
-            "player_id"
-        )[["x_loc", "y_loc"]]
+        if tensor is None:
+            tensor = MomentTensor.from_moments_df(moments_df)
+        defender_ids = set(defending_ids) & set(tensor.slot_players.tolist())
 
-        return group.apply(
-            lambda x: [
-                (
-                    euclidean(
-                        player_id[["x_loc", "y_loc"]], x.iloc[i][["x_loc", "y_loc"]]
-                    ),
-                    x.iloc[i][2],
-                )
-                for i in range(len(x))
-            ]
-        )
+        return FeatureUtil.get_distances_from_player(tensor, player_id, defender_ids)
 
     @staticmethod
     def num_players_past_halfcourt(moment_df):
@@ -648,7 +830,7 @@ class FeatureUtil:
         return closest_players.drop(columns=["radius"]).reset_index(drop=True)
 
     @staticmethod
-    def get_defender_for_player(moment_df, player_id, defensive_team_ids):
+    def get_defender_for_player(moment_df, player_id, defensive_team_ids, tensor=None):
         """
         Determine the closest defender to a player.
 
@@ -656,18 +838,16 @@ class FeatureUtil:
             moment_df (pd.DataFrame): DataFrame representing player locations and ball position at moments.
             player_id (int): ID of the player for whom to find the closest defender.
             defensive_team_ids (list): List of defensive team IDs.
+            tensor (MomentTensor, optional): moment_df as a MomentTensor, reusing its cached distance cube. Defaults to building one.
 
         Returns:
-            pd.DataFrame: DataFrame containing the closest defender moments and their distances.
+            pd.Series: Distances between the player and every defender, as (distance, moment index) tuples at each moment.
         """
-        group = moment_df[moment_df.player_id != player_id].groupby("player_id")[
-            ["x_loc", "y_loc", "index"]
-        ]
+        if tensor is None:
+            tensor = MomentTensor.from_moments_df(moment_df)
+        defender_ids = tensor.slot_players[np.isin(tensor.slot_teams, defensive_team_ids)].tolist()
 
-        return group.apply(
-            FeatureUtil.distance_between_players_with_moment,
-            player_b=(moment_df[moment_df.player_id == player_id][["x_loc", "y_loc"]]),
-        )
+        return FeatureUtil.get_distances_from_player(tensor, player_id, set(defender_ids) - {player_id})
 
     @staticmethod
     def get_passes_for_event(moments_df, possession, players_data):
@@ -753,7 +933,9 @@ class FeatureUtil:
     @staticmethod
     def convert_coordinate_to_hexbin_vertex(x_loc, y_loc, vertices):
         """
-        Convert coordinates to the nearest hexbin vertex.
+        Convert coordinates to the nearest hexbin vertex, scanning every vertex.
+
+        NOTE: HexGrid.locate finds the enclosing cell of many points at once in closed form, prefer it.
 
         Args:
             x_loc (float): X-coordinate.
@@ -872,7 +1054,7 @@ class FeatureUtil:
         return np.NaN, np.NaN
 
     @staticmethod
-    def generate_dribble_handoff_feature_vector(target_candidate):
+    def generate_dribble_handoff_feature_vector(target_candidate, moments_backend="orm", moments=None):
         """
         Generates a feature vector for a dribble handoff (DHO) event involving a specific candidate.
 
@@ -883,6 +1065,10 @@ class FeatureUtil:
         Parameters:
         - target_candidate (dict): A dictionary containing information about the candidate,
                                     including event_id, player_a_id (screener), and player_b_id (cutter).
+        - moments_backend (str): Backend used to fetch the event's moments, 'orm' or 'tensor'.
+                                 See DatabaseUtil.get_moments_for_event. Defaults to 'orm'.
+        - moments (pd.DataFrame, optional): The event's moments when already in memory (ex: a slice of the game's
+                                            GameMoments table), skipping the fetch from moments_backend.
 
         Returns:
         - dict: A dictionary representing the feature vector for the DHO event, containing
@@ -894,8 +1080,16 @@ class FeatureUtil:
         - Exception: If any errors occur during the generation of the feature vector,
                         including issues with data retrieval or processing.
         """
-        # Collects moments for single candidate
-        moments = DatabaseUtil.get_moments_for_event(target_candidate["event_id"])
+        # Collects moments for single candidate, the whole event is needed as passes (and so pass duration and inbound pass)
+        # are detected over every moment of it
+        if moments is None:
+            moments = DatabaseUtil.get_moments_for_event(target_candidate["event_id"], backend=moments_backend)
+
+        # Trim the moments data around the pass
+        trimmed_moments = moments[
+            (moments.game_clock > target_candidate['game_clock'] - FeatureUtil.FEATURE_WINDOW)
+            & (moments.game_clock < target_candidate['game_clock'] + FeatureUtil.FEATURE_WINDOW)
+        ]
 
         # Collects players for single candidate
         screener = Player.objects.values().get(player_id=target_candidate['player_a_id'])
@@ -904,9 +1098,6 @@ class FeatureUtil:
         # Collects passes for event
         event_passes = FeatureUtil.get_passes_for_event(moments, Event.objects.values().get(event_id=target_candidate['event_id'])['possession_team_id'], list(Player.objects.values()))
 
-        # Trim the moments data around the pass
-        trimmed_moments = moments[(moments.game_clock > target_candidate['game_clock'] - 2) & (moments.game_clock < target_candidate['game_clock'] + 2)]
-
         # If the data occurs past half-court (x > 47), rotate the points about the center of the court so features appear consistent 
         if(trimmed_moments.iloc[math.ceil(len(trimmed_moments)/2)]['x_loc'] > 47.0):
             trimmed_moments = FeatureUtil.rotate_coordinates_around_center_court(trimmed_moments)
@@ -919,46 +1110,62 @@ class FeatureUtil:
         end_moment = execution_moments.iloc[len(execution_moments) - 12:len(execution_moments) - 1]
 
         # Gets screen moment
-        screener_pos_data = PlayerMvmtProcessor.get_player_position_data(trimmed_moments, screener['player_id'])
-        filtered_moments = trimmed_moments.loc[(trimmed_moments.player_id.isin([screener['player_id'], cutter['player_id']]))]
-        distance_from_screener = FeatureUtil.distance_between_player_and_other_players(screener['player_id'], screener_pos_data, filtered_moments)
+        # NOTE: distances are looked up in the distance cube of the trimmed moments, rotation leaves them unchanged
+        trimmed_tensor = MomentTensor.from_moments_df(trimmed_moments)
+        distance_from_screener = FeatureUtil.get_distances_from_player(trimmed_tensor, screener['player_id'], [cutter['player_id']])
         min_dist_from_screen = min(distance_from_screener[cutter['player_id']])
         screen_moment = trimmed_moments.loc[trimmed_moments['index'] == int(min_dist_from_screen[1])]
         
-        # Segment cutter, screener, and ball actions into approach/execution stages
-        cutter_df_approach = approach_moments[approach_moments['player_id'] == cutter['player_id']][['x_loc', 'y_loc']]
-        screener_df_approach = approach_moments[approach_moments['player_id'] == screener['player_id']][['x_loc', 'y_loc']]
-        ball_df_approach = approach_moments[approach_moments['player_id'] == -1][['x_loc', 'y_loc']]
-        cutter_df_execution = execution_moments[execution_moments['player_id'] == cutter['player_id']][['x_loc', 'y_loc']]
-        screener_df_execution = execution_moments[execution_moments['player_id'] == screener['player_id']][['x_loc', 'y_loc']]
-        ball_df_execution = execution_moments[execution_moments['player_id'] == -1][['x_loc', 'y_loc']]
-
-        # Collect linregress stats for cutter, screener, ball for approach/execution stages
-        cutter_linregress_stats_approach = FeatureUtil.get_lingress_results_for_player_trajectory(cutter_df_approach)
-        screener_linregress_stats_approach = FeatureUtil.get_lingress_results_for_player_trajectory(screener_df_approach)
-        ball_linregress_stats_approach = FeatureUtil.get_lingress_results_for_player_trajectory(ball_df_approach)
-        cutter_linregress_stats_execution = FeatureUtil.get_lingress_results_for_player_trajectory(cutter_df_execution)
-        screener_linregress_stats_execution = FeatureUtil.get_lingress_results_for_player_trajectory(screener_df_execution)
-        ball_linregress_stats_execution = FeatureUtil.get_lingress_results_for_player_trajectory(ball_df_execution)
-
-        # Isolate cutter, screener and ball from trimmed_moments for hexbinning
-        cutter_df = trimmed_moments[trimmed_moments['player_id'] == cutter['player_id']][['x_loc', 'y_loc']]
-        screener_df = trimmed_moments[trimmed_moments['player_id'] == screener['player_id']][['x_loc', 'y_loc']]
-        ball_df = trimmed_moments[trimmed_moments['player_id'] == -1][['x_loc', 'y_loc']]
-
-        # Offset y_loc data to work with hexbin
-        screener_hex_df = screener_df.copy(deep=True)
-        cutter_hex_df = cutter_df.copy(deep=True)
-        ball_hex_df = ball_df.copy(deep=True)
-        screener_hex_df['y_loc'] = screener_hex_df['y_loc'] - 50.0
-        cutter_hex_df['y_loc'] = cutter_hex_df['y_loc'] - 50.0
-        ball_hex_df['y_loc'] = ball_hex_df['y_loc'] - 50.0
-        
-        # Draw the hexbins on the court
-        ax = GraphUtil.draw_court()	
-        screener_hexbin = ax.hexbin(x=screener_hex_df['x_loc'], y=screener_hex_df['y_loc'], cmap=plt.cm.Greens, mincnt=1, gridsize=50, extent=(0,94,-50,0))
-        cutter_hexbin = ax.hexbin(x=cutter_hex_df['x_loc'], y=cutter_hex_df['y_loc'], cmap=plt.cm.Blues, mincnt=1, gridsize=50, extent=(0,94,-50,0))
-        ball_hexbin = ax.hexbin(x=ball_hex_df['x_loc'], y=ball_hex_df['y_loc'], cmap=plt.cm.Reds, mincnt=1, gridsize=50, extent=(0,94,-50,0))
+        # Travel distance, speed and trajectory line of cutter, screener and ball over the approach (window 0) and
+        # execution (window 1) stages, all in one pass over the trimmed moments
+        trajectory_stats = FeatureUtil.get_trajectory_stats(
+            trimmed_moments['player_id'],
+            trimmed_moments['x_loc'],
+            trimmed_moments['y_loc'],
+            trimmed_moments['game_clock'],
+            np.select(
+                [trimmed_moments['game_clock'] < target_candidate['game_clock'], trimmed_moments['game_clock'] > target_candidate['game_clock']],
+                [0, 1],
+                default=-1,
+            ),
+        )
+        cutter_stats_approach = trajectory_stats.loc[(0, cutter['player_id'])]
+        screener_stats_approach = trajectory_stats.loc[(0, screener['player_id'])]
+        ball_stats_approach = trajectory_stats.loc[(0, -1)]
+        cutter_stats_execution = trajectory_stats.loc[(1, cutter['player_id'])]
+        screener_stats_execution = trajectory_stats.loc[(1, screener['player_id'])]
+        ball_stats_execution = trajectory_stats.loc[(1, -1)]
+        # linregress cannot fit a trajectory with a constant x_loc (ex: a single tick), such candidates keep failing
+        trajectory_slopes = [
+            stats['slope']
+            for stats in (cutter_stats_approach, screener_stats_approach, ball_stats_approach,
+                          cutter_stats_execution, screener_stats_execution, ball_stats_execution)
+        ]
+        if np.isnan(trajectory_slopes).any():
+            raise ValueError(f"Cannot fit the trajectories of candidate {target_candidate['candidate_id']}")
+
+        # Locate cutter, screener and ball on the hexbin grid at the pass, start of approach, end of execution and screen,
+        # all in one lookup (y_loc is offset by -50, as the grid covers the half court drawn below the x axis)
+        # NOTE: locations off the court (ex: an inbounder) are snapped to the nearest cell, as the location fields cannot be null
+        location_moments = {
+            'pass': pass_moment,
+            'start_approach': start_moment,
+            'end_execution': end_moment,
+            'screen': screen_moment,
+        }
+        location_entities = {'cutter': cutter['player_id'], 'screener': screener['player_id'], 'ball': -1}
+        locations = np.array([
+            moment.loc[moment['player_id'] == entity_id, ['x_loc', 'y_loc']].to_numpy()[0]
+            for moment in location_moments.values()
+            for entity_id in location_entities.values()
+        ])
+        location_cells, location_labels = FeatureUtil.HEXBIN_GRID.locate(locations[:, 0], locations[:, 1] - 50.0, snap=True)
+        if (location_cells < 0).any():
+            raise ValueError(f"Missing location for candidate {target_candidate['candidate_id']}")
+        location_features = dict(zip(
+            [f'{entity}_loc_on_{moment}' for moment in location_moments for entity in location_entities],
+            location_labels,
+        ))
 
         # Create the feature vector
         feature_vector = {
@@ -971,66 +1178,30 @@ class FeatureUtil:
             'screener_archetype': screener['position'],
 
             # Location Data
-            'cutter_loc_on_pass': FeatureUtil.convert_coordinate_to_hexbin_vertex(
-                pass_moment.loc[pass_moment['player_id'] == cutter['player_id']]['x_loc'].values[0],
-                pass_moment.loc[pass_moment['player_id'] == cutter['player_id']]['y_loc'].values[0],
-                cutter_hexbin._offsets),
-            'screener_loc_on_pass': FeatureUtil.convert_coordinate_to_hexbin_vertex(
-                pass_moment.loc[pass_moment['player_id'] == screener['player_id']]['x_loc'].values[0],
-                pass_moment.loc[pass_moment['player_id'] == screener['player_id']]['y_loc'].values[0],
-                screener_hexbin._offsets),
-            'ball_loc_on_pass': FeatureUtil.convert_coordinate_to_hexbin_vertex(
-                pass_moment.loc[pass_moment['player_id'] == -1]['x_loc'].item(),
-                pass_moment.loc[pass_moment['player_id'] == -1]['y_loc'].item(),
-                ball_hexbin._offsets),
+            'cutter_loc_on_pass': location_features['cutter_loc_on_pass'],
+            'screener_loc_on_pass': location_features['screener_loc_on_pass'],
+            'ball_loc_on_pass': location_features['ball_loc_on_pass'],
             'ball_radius_on_pass': pass_moment.loc[pass_moment['player_id'] == -1]['radius'].item(),
-            'cutter_loc_on_start_approach': FeatureUtil.convert_coordinate_to_hexbin_vertex(
-                start_moment.loc[start_moment['player_id'] == cutter['player_id']]['x_loc'].values[0],
-                start_moment.loc[start_moment['player_id'] == cutter['player_id']]['y_loc'].values[0],
-                cutter_hexbin._offsets),
-            'screener_loc_on_start_approach': FeatureUtil.convert_coordinate_to_hexbin_vertex(
-                start_moment.loc[start_moment['player_id'] == screener['player_id']]['x_loc'].values[0],
-                start_moment.loc[start_moment['player_id'] == screener['player_id']]['y_loc'].values[0],
-                screener_hexbin._offsets),
-            'ball_loc_on_start_approach': FeatureUtil.convert_coordinate_to_hexbin_vertex(
-                start_moment.loc[start_moment['player_id'] == -1]['x_loc'].item(),
-                start_moment.loc[start_moment['player_id'] == -1]['y_loc'].item(),
-                ball_hexbin._offsets),
+            'cutter_loc_on_start_approach': location_features['cutter_loc_on_start_approach'],
+            'screener_loc_on_start_approach': location_features['screener_loc_on_start_approach'],
+            'ball_loc_on_start_approach': location_features['ball_loc_on_start_approach'],
             'ball_radius_loc_on_start_approach': start_moment[start_moment['player_id'] == -1]['radius'].item(),
-            'cutter_loc_on_end_execution': FeatureUtil.convert_coordinate_to_hexbin_vertex(
-                end_moment.loc[end_moment['player_id'] == cutter['player_id']]['x_loc'].values[0],
-                end_moment.loc[end_moment['player_id'] == cutter['player_id']]['y_loc'].values[0],
-                cutter_hexbin._offsets),
-            'screener_loc_on_end_execution': FeatureUtil.convert_coordinate_to_hexbin_vertex(
-                end_moment.loc[end_moment['player_id'] == screener['player_id']]['x_loc'].values[0],
-                end_moment.loc[end_moment['player_id'] == screener['player_id']]['y_loc'].values[0],
-                screener_hexbin._offsets),
-            'ball_loc_on_end_execution': FeatureUtil.convert_coordinate_to_hexbin_vertex(
-                end_moment.loc[end_moment['player_id'] == -1]['x_loc'].item(),
-                end_moment.loc[end_moment['player_id'] == -1]['y_loc'].item(),
-                ball_hexbin._offsets),
+            'cutter_loc_on_end_execution': location_features['cutter_loc_on_end_execution'],
+            'screener_loc_on_end_execution': location_features['screener_loc_on_end_execution'],
+            'ball_loc_on_end_execution': location_features['ball_loc_on_end_execution'],
             'ball_radius_loc_on_end_execution': end_moment[end_moment['player_id'] == -1]['radius'].item(),
-            'cutter_loc_on_screen': FeatureUtil.convert_coordinate_to_hexbin_vertex(
-                screen_moment.loc[screen_moment['player_id'] == cutter['player_id']]['x_loc'].values[0],
-                screen_moment.loc[screen_moment['player_id'] == cutter['player_id']]['y_loc'].values[0],
-                cutter_hexbin._offsets),
-            'screener_loc_on_screen': FeatureUtil.convert_coordinate_to_hexbin_vertex(
-                screen_moment.loc[screen_moment['player_id'] == screener['player_id']]['x_loc'].values[0],
-                screen_moment.loc[screen_moment['player_id'] == screener['player_id']]['y_loc'].values[0],
-                screener_hexbin._offsets),
-            'ball_loc_on_screen': FeatureUtil.convert_coordinate_to_hexbin_vertex(
-                screen_moment.loc[screen_moment['player_id'] == -1]['x_loc'].item(),
-                screen_moment.loc[screen_moment['player_id'] == -1]['y_loc'].item(),
-                ball_hexbin._offsets),
+            'cutter_loc_on_screen': location_features['cutter_loc_on_screen'],
+            'screener_loc_on_screen': location_features['screener_loc_on_screen'],
+            'ball_loc_on_screen': location_features['ball_loc_on_screen'],
             'ball_radius_on_screen': screen_moment.loc[screen_moment['player_id'] == -1]['radius'].item(),
 
             # Travel Distance Data
-            'cutter_dist_traveled_approach': FeatureUtil.travel_dist(approach_moments[approach_moments['player_id'] == cutter['player_id']]),
-            'cutter_dist_traveled_execution': FeatureUtil.travel_dist(execution_moments[execution_moments['player_id'] == cutter['player_id']]),
-            'screener_dist_traveled_approach': FeatureUtil.travel_dist(approach_moments[approach_moments['player_id'] == screener['player_id']]),
-            'screener_dist_traveled_execution': FeatureUtil.travel_dist(execution_moments[execution_moments['player_id'] == screener['player_id']]),
-            'ball_dist_traveled_approach': FeatureUtil.travel_dist(approach_moments[approach_moments['player_id'] == -1]),
-            'ball_dist_traveled_execution': FeatureUtil.travel_dist(execution_moments[execution_moments['player_id'] == -1]),
+            'cutter_dist_traveled_approach': cutter_stats_approach['travel_dist'],
+            'cutter_dist_traveled_execution': cutter_stats_execution['travel_dist'],
+            'screener_dist_traveled_approach': screener_stats_approach['travel_dist'],
+            'screener_dist_traveled_execution': screener_stats_execution['travel_dist'],
+            'ball_dist_traveled_approach': ball_stats_approach['travel_dist'],
+            'ball_dist_traveled_execution': ball_stats_execution['travel_dist'],
 
             # Relative Distance Data
             'players_dist_on_pass': FeatureUtil.distance_between_players_at_moment(
@@ -1074,26 +1245,28 @@ class FeatureUtil:
                 [end_moment.loc[end_moment['player_id'] == -1]['x_loc'].values[0], end_moment.loc[end_moment['player_id'] == -1]['y_loc'].values[0]]),
 
             # Speed/Acceleration Data
-            'cutter_avg_speed_approach': FeatureUtil.average_speed(approach_moments, cutter['player_id']),
-            'cutter_avg_speed_execution': FeatureUtil.average_speed(execution_moments, cutter['player_id']),
-            'screener_avg_speed_approach': FeatureUtil.average_speed(approach_moments, screener['player_id']),
-            'screener_avg_speed_execution': FeatureUtil.average_speed(execution_moments, screener['player_id']),
+            'cutter_avg_speed_approach': cutter_stats_approach['avg_speed'],
+            'cutter_avg_speed_execution': cutter_stats_execution['avg_speed'],
+            'screener_avg_speed_approach': screener_stats_approach['avg_speed'],
+            'screener_avg_speed_execution': screener_stats_execution['avg_speed'],
+            # NOTE: average_speed with no player_id averages the rows missing a player_id, not the ball's, kept as is
+            # so these features stay comparable with the stored feature vectors
             'ball_avg_speed_approach': FeatureUtil.average_speed(approach_moments, None),
             'ball_avg_speed_execution': FeatureUtil.average_speed(execution_moments, None),
 
             # Linear Regression Data
-            'slope_of_cutter_trajectory_approach': cutter_linregress_stats_approach[0],
-            'intercept_of_cutter_trajectory_approach': cutter_linregress_stats_approach[1],
-            'slope_of_cutter_trajectory_execution': cutter_linregress_stats_execution[0],
-            'intercept_of_cutter_trajectory_execution': cutter_linregress_stats_execution[1],
-            'slope_of_screener_trajectory_approach': screener_linregress_stats_approach[0],
-            'intercept_of_screener_trajectory_approach': screener_linregress_stats_approach[1],
-            'slope_of_screener_trajectory_execution': screener_linregress_stats_execution[0],
-            'intercept_of_screener_trajectory_execution': screener_linregress_stats_execution[1],
-            'slope_of_ball_trajectory_approach': ball_linregress_stats_approach[0],
-            'intercept_of_ball_trajectory_approach': ball_linregress_stats_approach[1],
-            'slope_of_ball_trajectory_execution': ball_linregress_stats_execution[0],
-            'intercept_of_ball_trajectory_execution': ball_linregress_stats_execution[1],
+            'slope_of_cutter_trajectory_approach': cutter_stats_approach['slope'],
+            'intercept_of_cutter_trajectory_approach': cutter_stats_approach['intercept'],
+            'slope_of_cutter_trajectory_execution': cutter_stats_execution['slope'],
+            'intercept_of_cutter_trajectory_execution': cutter_stats_execution['intercept'],
+            'slope_of_screener_trajectory_approach': screener_stats_approach['slope'],
+            'intercept_of_screener_trajectory_approach': screener_stats_approach['intercept'],
+            'slope_of_screener_trajectory_execution': screener_stats_execution['slope'],
+            'intercept_of_screener_trajectory_execution': screener_stats_execution['intercept'],
+            'slope_of_ball_trajectory_approach': ball_stats_approach['slope'],
+            'intercept_of_ball_trajectory_approach': ball_stats_approach['intercept'],
+            'slope_of_ball_trajectory_execution': ball_stats_execution['slope'],
+            'intercept_of_ball_trajectory_execution': ball_stats_execution['intercept'],
 
             # Play Data
             'offset_into_play': math.floor(pass_moment.iloc[0]['shot_clock'] / 6),
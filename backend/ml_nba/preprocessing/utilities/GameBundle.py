@@ -0,0 +1,138 @@
+import pandas as pd
+from functools import cached_property
+from .ArrowUtil import ArrowUtil
+from .ConstantsUtil import ConstantsUtil
+from .DataLoader import DataLoader
+from .GameMoments import GameMoments
+from .TickTimeline import TickTimeline
+
+
+class GameBundle:
+    """
+    Every input of a single game, loaded lazily on first access and then kept for the later pipeline stages.
+
+    A bundle holds:
+    - raw_header: the raw game fields and first event (as DataLoader.load_raw_game_header)
+    - annotations / pipeline_annotations: the full play-by-play, and its typed pipeline subset
+    - players_data, players_dict, teams_data: player/team maps derived from the raw header
+    - timeline, processed_events: the game's TickTimeline and combined event DataFrame
+    - moments: the GameMoments table of every processed event, flattened once
+    - candidates: the extracted dribble handoff candidates
+
+    Bundles from GameBundle.get are memoized per game_key, so running several stages on one game
+    (see run_pipeline) reads each input file once. process_game hands its processed events and
+    timeline over with set_processed, so later stages never read them back from disk.
+    """
+
+    _bundles = {}
+
+    def __init__(self, game_key):
+        self.game_key = game_key
+
+    @classmethod
+    def get(cls, game_key):
+        """
+        Get the memoized bundle of a game, creating it on first use.
+        """
+        if game_key not in cls._bundles:
+            cls._bundles[game_key] = cls(game_key)
+
+        return cls._bundles[game_key]
+
+    @classmethod
+    def release(cls, game_key=None):
+        """
+        Drop the memoized bundle of a game (or of every game), freeing whatever it loaded.
+        """
+        if game_key is None:
+            cls._bundles.clear()
+        else:
+            cls._bundles.pop(game_key, None)
+
+    @cached_property
+    def raw_header(self):
+        return DataLoader.load_raw_game_header(self.game_key)
+
+    @cached_property
+    def annotations(self):
+        return DataLoader.load_game_events(self.game_key)
+
+    @cached_property
+    def pipeline_annotations(self):
+        # Derive the typed subset from the full play-by-play when it is already in memory, rather than reading again
+        if "annotations" not in self.__dict__:
+            return DataLoader.load_game_annotations(self.game_key)
+
+        annotation_df = self.annotations[ArrowUtil.ANNOTATION_SCHEMA.names]
+        annotation_df = annotation_df[annotation_df["EVENTMSGTYPE"].isin(ConstantsUtil.KEPT_EVENTMSGTYPES)]
+
+        return annotation_df.reset_index(drop=True)
+
+    @cached_property
+    def players_data(self):
+        return DataLoader.get_players_data(self.raw_header)
+
+    @cached_property
+    def players_dict(self):
+        return DataLoader.get_players_dict(self.raw_header)
+
+    @cached_property
+    def teams_data(self):
+        return DataLoader.get_teams_data(self.raw_header)
+
+    @cached_property
+    def processed_events(self):
+        self._load_processed_game()
+
+        return self.__dict__["processed_events"]
+
+    @cached_property
+    def timeline(self):
+        self._load_processed_game()
+
+        return self.__dict__["timeline"]
+
+    @cached_property
+    def moments(self):
+        return GameMoments.from_events(self.processed_events, self.timeline)
+
+    @cached_property
+    def candidates(self):
+        return DataLoader.load_game_candidates(self.game_key)
+
+    def _load_processed_game(self):
+        # Events and timeline come from the same read, so fill in both cached properties at once
+        processed_events, timeline = DataLoader.load_processed_game(self.game_key, return_timeline=True)
+        self.__dict__.setdefault("processed_events", processed_events)
+        self.__dict__.setdefault("timeline", timeline)
+
+    def build_timeline(self, event_nums=None):
+        """
+        Stream the raw game file once into a TickTimeline, picking up the raw header along the way.
+
+        Args:
+            event_nums (set, optional): Only keep events with these event numbers. Defaults to keeping all.
+
+        Returns:
+            TickTimeline: The game's timeline.
+        """
+        header = {}
+
+        def raw_events():
+            for key, value in DataLoader.iter_raw_game_items(self.game_key):
+                if key != "events":
+                    header[key] = value
+                    continue
+                header.setdefault("events", value)
+                yield value
+
+        timeline = TickTimeline.from_raw_events(raw_events(), event_nums)
+        if "raw_header" not in self.__dict__ and "events" in header:
+            self.raw_header = pd.DataFrame([header])
+
+        return timeline
+
+    def set_processed(self, processed_events, timeline):
+        self.processed_events = processed_events
+        self.timeline = timeline
+        self.__dict__.pop("moments", None)
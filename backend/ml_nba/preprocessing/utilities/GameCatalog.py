@@ -0,0 +1,364 @@
+import os, json, time, fcntl, hashlib
+from contextlib import contextmanager
+from .ConstantsUtil import ConstantsUtil
+from .DataLoader import DataLoader
+from .ArrowUtil import ArrowUtil
+from .TrackingTensor import TrackingTensor
+
+
+class GameCatalog:
+    """
+    A persisted catalog of every game in the raw archive and the pipeline artifacts derived from it.
+
+    Each game_key maps to an entry holding:
+    - raw_path, raw_size, raw_mtime: the raw SportVU game file
+    - event_count, tick_count: size of the game, filled in once the game is processed (or counted)
+    - annotation_path, processed_path, candidates_path, tracking_tensor_path: artifact paths (None when missing)
+    - stages: pipeline stage name -> unix timestamp of its last completed run
+
+    The catalog is built by a single scan of the data directories and refreshed incrementally:
+    raw files whose size and modification time are unchanged are never re-read. Batch drivers can
+    then plan work from the catalog alone, without touching the raw files.
+    """
+
+    STAGES = [
+        "process_game",
+        "extract_dho_candidates",
+        "persist_processed_game",
+        "generate_dho_feature_vectors",
+    ]
+
+    def __init__(self, entries, path=ConstantsUtil.GAME_CATALOG_PATH):
+        self.entries = entries
+        self.path = path
+
+    @staticmethod
+    @contextmanager
+    def _locked(path):
+        # Serialize read-modify-write cycles across processes (ex: pipeline workers recording stages)
+        with open(path + ".lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _read_entries(path):
+        if not os.path.exists(path):
+            return {}
+        with open(path) as catalog_file:
+            return json.load(catalog_file)
+
+    @staticmethod
+    def _write_entries(entries, path):
+        # Write to a temporary file first so a crash never leaves a truncated catalog behind
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as catalog_file:
+            json.dump(entries, catalog_file, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=ConstantsUtil.GAME_CATALOG_PATH):
+        """
+        Load the persisted catalog (empty if it was never built).
+
+        Args:
+            path (str): Path of the catalog file. Defaults to GAME_CATALOG_PATH.
+
+        Returns:
+            GameCatalog: The loaded catalog.
+        """
+        catalog = cls(cls._read_entries(path), path)
+        DataLoader.raw_game_paths.update(catalog.get_raw_paths())
+
+        return catalog
+
+    @classmethod
+    def build(cls, path=ConstantsUtil.GAME_CATALOG_PATH, count_raw=False):
+        """
+        Scan the data directories once and update the persisted catalog.
+
+        Existing entries are kept; a raw file is only counted again when its size or modification time changed.
+
+        Args:
+            path (str): Path of the catalog file. Defaults to GAME_CATALOG_PATH.
+            count_raw (bool): Stream uncounted raw files to fill in event/tick counts. Defaults to False,
+                              in which case counts are filled in as games get processed.
+
+        Returns:
+            GameCatalog: The refreshed catalog.
+        """
+        # Building is explicit, so create the catalog's directory (the record_* methods skip a missing one instead)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        with cls._locked(path):
+            entries = cls._read_entries(path)
+            scanned = cls._scan_raw_games()
+
+            for game_key, (raw_path, raw_size, raw_mtime) in scanned.items():
+                entry = entries.setdefault(game_key, {"game_key": game_key, "stages": {}})
+                if (entry.get("raw_size"), entry.get("raw_mtime")) != (raw_size, raw_mtime):
+                    entry.update(event_count=None, tick_count=None)
+                entry.update(raw_path=raw_path, raw_size=raw_size, raw_mtime=raw_mtime)
+
+            # Games whose raw file went missing keep their entry, but can no longer be planned
+            for game_key in entries.keys() - scanned.keys():
+                entries[game_key].update(raw_path=None, raw_size=0, raw_mtime=None)
+
+            cls._scan_artifacts(entries)
+
+            if count_raw:
+                for game_key, entry in entries.items():
+                    if entry["raw_path"] is not None and entry["tick_count"] is None:
+                        print(f"Counting {game_key}...")
+                        entry.update(cls.count_raw_game(game_key))
+
+            cls._write_entries(entries, path)
+
+        DataLoader.raw_game_paths.update(
+            {game_key: entry["raw_path"] for game_key, entry in entries.items() if entry["raw_path"]}
+        )
+
+        return cls(entries, path)
+
+    @staticmethod
+    def _scan_raw_games():
+        # One pass over RAW_DATA_PATH, where each game folder is named like "01.01.2016.DAL.at.MIA"
+        scanned = {}
+        if not os.path.isdir(ConstantsUtil.RAW_DATA_PATH):
+            return scanned
+
+        for folder in os.scandir(ConstantsUtil.RAW_DATA_PATH):
+            if not folder.is_dir():
+                continue
+            try:
+                game_key = DataLoader.convert_folder_name_to_game_key(folder.name)
+            except ValueError:
+                continue
+
+            # Assuming single JSON file per folder, either plain or compressed
+            raw_files = sorted(
+                (raw_file for raw_file in os.scandir(folder.path) if DataLoader.is_raw_game_file(raw_file.name)),
+                key=lambda raw_file: raw_file.name,
+            )
+            if raw_files:
+                stat = raw_files[0].stat()
+                scanned[game_key] = (raw_files[0].path, stat.st_size, stat.st_mtime)
+
+        return scanned
+
+    @staticmethod
+    def _scan_artifacts(entries):
+        # One listing per artifact directory, rather than a stat per game and artifact
+        def list_dir(path):
+            return set(os.listdir(path)) if os.path.isdir(path) else set()
+
+        annotation_files = list_dir(ConstantsUtil.EVENT_ANNOTATIONS_PATH)
+        processed_files = list_dir(ConstantsUtil.CLEAN_DATA_PATH)
+        candidate_files = list_dir(ConstantsUtil.CANDIDATES_PATH)
+        tensor_files = list_dir(ConstantsUtil.TRACKING_TENSORS_PATH)
+
+        for game_key, entry in entries.items():
+            events_path, _ = ArrowUtil.get_processed_game_paths(game_key, ConstantsUtil.CLEAN_DATA_PATH)
+            tensor_path = TrackingTensor.get_paths(game_key, ConstantsUtil.TRACKING_TENSORS_PATH)["index"]
+            artifacts = {
+                "annotation_path": (DataLoader.get_annotation_path(game_key), annotation_files, None),
+                "processed_path": (events_path, processed_files, "process_game"),
+                "candidates_path": (
+                    os.path.join(ConstantsUtil.CANDIDATES_PATH, f"candidates-{game_key}.csv"),
+                    candidate_files,
+                    "extract_dho_candidates",
+                ),
+                "tracking_tensor_path": (tensor_path, tensor_files, None),
+            }
+
+            for field, (artifact_path, listing, stage) in artifacts.items():
+                if os.path.basename(artifact_path) not in listing:
+                    entry[field] = None
+                    continue
+                entry[field] = artifact_path
+
+                # File backed stages that ran outside of the catalog are dated by their artifact
+                if stage is not None and stage not in entry["stages"]:
+                    entry["stages"][stage] = os.path.getmtime(artifact_path)
+
+    @staticmethod
+    def count_raw_game(game_key):
+        """
+        Count the events and unique ticks of a raw game, streaming the file.
+
+        Args:
+            game_key (str): The unique identifier for the game.
+
+        Returns:
+            dict: 'event_count' and 'tick_count'.
+        """
+        event_nums = set()
+        ticks = set()
+        for event in DataLoader.iter_raw_game_events(game_key):
+            event_nums.add(event["eventId"])
+            ticks.update((moment[0], moment[1]) for moment in event["moments"])
+
+        return {"event_count": len(event_nums), "tick_count": len(ticks)}
+
+    @classmethod
+    def record_stage(cls, game_key, stage, path=ConstantsUtil.GAME_CATALOG_PATH, **fields):
+        """
+        Record a completed pipeline stage for a game, along with any entry fields it learned.
+
+        Args:
+            game_key (str): The unique identifier for the game.
+            stage (str): The completed stage, one of STAGES.
+            path (str): Path of the catalog file. Defaults to GAME_CATALOG_PATH.
+            **fields: Entry fields to fill in when not already known, ex: event_count=..., tick_count=...
+        """
+        if not os.path.isdir(os.path.dirname(path)):
+            return
+
+        with cls._locked(path):
+            entries = cls._read_entries(path)
+            entry = entries.setdefault(game_key, {"game_key": game_key, "stages": {}})
+            for field, value in fields.items():
+                if entry.get(field) is None:
+                    entry[field] = value
+            entry["stages"][stage] = time.time()
+            cls._write_entries(entries, path)
+
+    @classmethod
+    def record_timeline(cls, game_key, timeline, path=ConstantsUtil.GAME_CATALOG_PATH):
+        """
+        Record a processed game, taking its event/tick counts from its TickTimeline when the raw file was never counted.
+        NOTE: the timeline only holds the events kept after annotation trimming, so these counts are a lower bound.
+        """
+        cls.record_stage(
+            game_key,
+            "process_game",
+            path,
+            event_count=len(timeline.event_ranges),
+            tick_count=len(timeline),
+        )
+
+    @staticmethod
+    def hash_file(file_path, opener=open, chunk_size=1 << 20):
+        """
+        Get the sha256 hex digest of a file's content, reading it in chunks.
+        """
+        digest = hashlib.sha256()
+        with opener(file_path, "rb") as file_obj:
+            for chunk in iter(lambda: file_obj.read(chunk_size), b""):
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+    @classmethod
+    def get_input_hashes(cls, game_key, path=ConstantsUtil.GAME_CATALOG_PATH):
+        """
+        Get the content hashes of a game's raw file and annotation file.
+
+        Hashes are cached in the catalog against each file's path, size and modification time, so
+        unchanged files are never re-read. Raw files are hashed decompressed, so compressing the
+        archive does not change them.
+
+        Args:
+            game_key (str): The unique identifier for the game.
+            path (str): Path of the catalog file. Defaults to GAME_CATALOG_PATH.
+
+        Returns:
+            dict: 'raw' and 'annotation' sha256 hex digests.
+        """
+        cached = cls._read_entries(path).get(game_key, {}).get("input_hashes", {})
+        input_paths = {
+            "raw": DataLoader.get_raw_game_path(game_key),
+            "annotation": DataLoader.get_annotation_path(game_key),
+        }
+
+        hashes = {}
+        for name, file_path in input_paths.items():
+            stat = os.stat(file_path)
+            stamp = [file_path, stat.st_size, stat.st_mtime]
+            if cached.get(name, {}).get("stamp") != stamp:
+                opener = next(
+                    (
+                        opener
+                        for extension, opener in DataLoader.RAW_GAME_OPENERS.items()
+                        if name == "raw" and file_path.endswith(extension)
+                    ),
+                    open,
+                )
+                cached[name] = {"stamp": stamp, "sha256": cls.hash_file(file_path, opener)}
+            hashes[name] = cached[name]["sha256"]
+
+        if os.path.isdir(os.path.dirname(path)):
+            with cls._locked(path):
+                entries = cls._read_entries(path)
+                entries.setdefault(game_key, {"game_key": game_key, "stages": {}})["input_hashes"] = cached
+                cls._write_entries(entries, path)
+
+        return hashes
+
+    @classmethod
+    def record_fingerprint(cls, game_key, stage, fingerprint, path=ConstantsUtil.GAME_CATALOG_PATH):
+        """
+        Stamp a stage's output with the fingerprint of the inputs it was produced from.
+        """
+        if not os.path.isdir(os.path.dirname(path)):
+            return
+
+        with cls._locked(path):
+            entries = cls._read_entries(path)
+            entry = entries.setdefault(game_key, {"game_key": game_key, "stages": {}})
+            entry.setdefault("fingerprints", {})[stage] = fingerprint
+            cls._write_entries(entries, path)
+
+    def get_fingerprints(self, game_key):
+        return dict(self.entries.get(game_key, {}).get("fingerprints", {}))
+
+    def get_raw_paths(self):
+        return {
+            game_key: entry["raw_path"]
+            for game_key, entry in self.entries.items()
+            if entry.get("raw_path")
+        }
+
+    def is_finished(self, game_key, stage):
+        """
+        Check whether a stage last ran after the game's raw file was last modified.
+        """
+        entry = self.entries.get(game_key)
+        if entry is None or stage not in entry["stages"]:
+            return False
+
+        return entry.get("raw_mtime") is None or entry["stages"][stage] >= entry["raw_mtime"]
+
+    def plan(self, stages=STAGES, game_keys=None, largest_first=True, skip_finished=True):
+        """
+        Plan a batch run from the catalog alone.
+
+        Args:
+            stages (list): Stages to run. Defaults to every stage.
+            game_keys (Iterable[str], optional): Restrict the plan to these games. Defaults to every cataloged game.
+            largest_first (bool): Order games by raw file size, largest first, for better load balancing. Defaults to True.
+            skip_finished (bool): Drop games for which every requested stage is already finished. Defaults to True.
+
+        Returns:
+            list: Game keys in planned order.
+        """
+        if game_keys is None:
+            game_keys = self.entries.keys()
+
+        planned = [
+            game_key
+            for game_key in game_keys
+            if game_key in self.entries and self.entries[game_key].get("raw_path")
+        ]
+        if skip_finished:
+            planned = [
+                game_key
+                for game_key in planned
+                if not all(self.is_finished(game_key, stage) for stage in stages)
+            ]
+        if largest_first:
+            planned.sort(key=lambda game_key: self.entries[game_key]["raw_size"], reverse=True)
+
+        return planned
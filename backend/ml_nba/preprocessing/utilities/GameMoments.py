@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+from .DataLoader import DataLoader
+from .EventsProcessor import EventsProcessor
+from .MomentTensor import MomentTensor
+
+
+class GameMoments:
+    """
+    The long moments table of a whole game, flattened once and shared by every stage reading moments.
+
+    Every event's moments (as EventsProcessor.get_moments_from_event would return them) are stored back
+    to back in a single DataFrame in the ConstantsUtil.HEADERS layout, with event_id as a categorical
+    column. An offset index maps each EVENT_ID to its contiguous rows, so fetching an event is a slice
+    rather than another pass over its raw moments.
+
+    When built from a TickTimeline, the timeline tick of every raw moment of an event is kept as well,
+    so an event can be sliced from a given tick (see TickTimeline.get_unseen_start_ticks).
+    """
+
+    def __init__(self, moments_df, event_offsets, moment_ticks=None):
+        """
+        Args:
+            moments_df (pd.DataFrame): The flattened moments of every event, contiguous per event.
+            event_offsets (pd.DataFrame): Indexed by EVENT_ID, with the START_ROW/END_ROW of each event in
+                                          moments_df and its START_MOMENT/END_MOMENT in moment_ticks.
+            moment_ticks (np.ndarray, optional): Timeline tick of every raw moment of every event, end to end.
+        """
+        self.moments_df = moments_df
+        self.event_offsets = event_offsets
+        self.moment_ticks = moment_ticks
+
+    def __len__(self):
+        return len(self.moments_df)
+
+    def __contains__(self, event_id):
+        return event_id in self.event_offsets.index
+
+    @classmethod
+    def from_events(cls, events_df, timeline=None):
+        """
+        Flatten the moments of every processed event of a game.
+
+        Args:
+            events_df (pd.DataFrame): Processed events (as process_game returns them), indexed by EVENTNUM.
+            timeline (TickTimeline, optional): The game's timeline, each event's moments are then taken from its
+                                               direction trimmed ticks. Defaults to the MOMENTS column.
+
+        Returns:
+            GameMoments: The game's moments table.
+        """
+        moment_ticks = None
+        if timeline is not None:
+            event_ticks = timeline.get_direction_ticks(events_df.index, events_df["DIRECTION"])
+            event_moments = [[timeline.moments[tick] for tick in ticks.tolist()] for ticks in event_ticks]
+            moment_ticks = np.concatenate(event_ticks) if event_ticks else np.empty(0, dtype=np.int64)
+        else:
+            event_moments = events_df["MOMENTS"].tolist()
+
+        moments_df, row_offsets = EventsProcessor.flatten_moments(
+            event_moments,
+            [DataLoader.convert_timestamp_to_game_clock(timestamp) for timestamp in events_df["PCTIMESTRING"]],
+            events_df["PERIOD"].tolist(),
+            events_df["EVENT_ID"].tolist(),
+        )
+        moment_offsets = np.concatenate(([0], np.cumsum([len(moments) for moments in event_moments]))).astype(np.int64)
+
+        event_offsets = pd.DataFrame(
+            {
+                "START_ROW": row_offsets[:-1],
+                "END_ROW": row_offsets[1:],
+                "START_MOMENT": moment_offsets[:-1],
+                "END_MOMENT": moment_offsets[1:],
+            },
+            index=pd.Index(events_df["EVENT_ID"].tolist(), name="EVENT_ID"),
+        )
+
+        return cls(moments_df, event_offsets, moment_ticks)
+
+    def get_event(self, event_id, start_tick=None):
+        """
+        Get the moments of an event, as a slice of the game's table.
+
+        Args:
+            event_id (str): The event's EVENT_ID.
+            start_tick (int, optional): Skip the event's moments before this timeline tick, renumbering the
+                                        remaining ones from 0. Defaults to the event's first moment.
+
+        Returns:
+            pd.DataFrame: The event's moments in the ConstantsUtil.HEADERS layout (empty for unknown events).
+        """
+        if event_id not in self.event_offsets.index:
+            return self.moments_df.iloc[0:0]
+
+        start_row, end_row, start_moment, end_moment = self.event_offsets.loc[event_id].tolist()
+        if start_tick is None:
+            return self.moments_df.iloc[start_row:end_row]
+
+        if self.moment_ticks is None:
+            raise ValueError("Moments can only be sliced by tick when built from a TickTimeline")
+
+        # Locate the first moment at or after start_tick, then the first row of the event at or after that moment
+        first_moment = int(np.searchsorted(self.moment_ticks[start_moment:end_moment], start_tick))
+        index_col = self.moments_df["index"].to_numpy()[start_row:end_row]
+        first_row = start_row + int(np.searchsorted(index_col, first_moment))
+
+        event_moments_df = self.moments_df.iloc[first_row:end_row].copy()
+        event_moments_df["index"] -= first_moment
+
+        return event_moments_df
+
+    def get_event_tensor(self, event_id):
+        """
+        Get the moments of an event as a dense MomentTensor.
+
+        Args:
+            event_id (str): The event's EVENT_ID.
+
+        Returns:
+            MomentTensor: The event's tensor.
+        """
+        return MomentTensor.from_moments_df(self.get_event(event_id))
+
+    def get_events(self, event_ids):
+        """
+        Get the moments of several events, each kept contiguous and in the order given.
+
+        Args:
+            event_ids (Iterable[str]): The events' EVENT_IDs.
+
+        Returns:
+            pd.DataFrame: The events' moments in the ConstantsUtil.HEADERS layout.
+        """
+        event_offsets = self.event_offsets.loc[[event_id for event_id in event_ids if event_id in self]]
+        rows = np.concatenate(
+            [np.arange(start, end) for start, end in zip(event_offsets["START_ROW"], event_offsets["END_ROW"])]
+            or [np.empty(0, dtype=np.int64)]
+        )
+
+        return self.moments_df.take(rows)
@@ -0,0 +1,180 @@
+import time
+import resource
+import tracemalloc
+
+
+class PipelineStage:
+    """
+    A single named step of a GamePipeline.
+
+    A stage declares the named values it reads (inputs) and writes (outputs). Its function is called
+    with the inputs positionally and returns its single output, or a tuple with one value per output.
+    Inputs the function modifies in place are listed in mutates, so the pipeline can tell when that is safe.
+    """
+
+    def __init__(self, name, func, inputs, outputs, mutates=()):
+        """
+        Args:
+            name (str): Unique name of the stage within its pipeline.
+            func (Callable): The stage's function.
+            inputs (list): Names of the values passed to func, in order.
+            outputs (list): Names of the values func returns, in order.
+            mutates (list, optional): Names of the inputs func modifies in place. Defaults to none.
+        """
+        unknown = set(mutates) - set(inputs)
+        if unknown:
+            raise ValueError(f"Stage '{name}' mutates values it does not take as inputs: {sorted(unknown)}")
+
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.mutates = list(mutates)
+
+    def __repr__(self):
+        return f"PipelineStage({self.name}: {self.inputs} -> {self.outputs})"
+
+
+class GamePipeline:
+    """
+    An ordered chain of PipelineStages passing named values (DataFrames, timelines, ...) from stage to stage.
+
+    Values are handed over by reference, never copied between stages. Objects given to run are borrowed
+    from the caller: the first stage mutating one gets a single copy, after which the pipeline owns it and
+    later stages mutate it freely. New objects produced by stages are owned from the start.
+
+    Every run records, per stage, its wall time, the process' peak resident memory once it finished, the row
+    count (len) of each of its outputs and, when tracing memory, the peak memory allocated while it ran.
+    Metrics are returned with the run's values (see run and print_metrics) rather than kept on the pipeline,
+    so a pipeline shared by many games (or workers) holds no per run state.
+
+    Stages can be swapped by name (replace_stage), so alternative implementations are plugged in without
+    editing the code driving the pipeline.
+    """
+
+    def __init__(self, stages):
+        """
+        Args:
+            stages (list): The PipelineStages, in execution order.
+        """
+        self.stages = list(stages)
+
+        names = [stage.name for stage in self.stages]
+        duplicates = {name for name in names if names.count(name) > 1}
+        if duplicates:
+            raise ValueError(f"Duplicate pipeline stage names: {sorted(duplicates)}")
+
+    def get_stage(self, name):
+        for stage in self.stages:
+            if stage.name == name:
+                return stage
+
+        raise KeyError(f"No pipeline stage named '{name}'")
+
+    def replace_stage(self, name, stage):
+        """
+        Get a copy of the pipeline with one stage swapped out, leaving this pipeline untouched.
+
+        Args:
+            name (str): Name of the stage to replace.
+            stage (PipelineStage): The replacement stage.
+
+        Returns:
+            GamePipeline: The new pipeline.
+        """
+        self.get_stage(name)
+
+        return GamePipeline([stage if existing.name == name else existing for existing in self.stages])
+
+    def get_required_inputs(self):
+        """
+        Get the names of the values run must be given, those read by a stage before any stage produces them.
+        """
+        produced = set()
+        required = []
+        for stage in self.stages:
+            required.extend(name for name in stage.inputs if name not in produced and name not in required)
+            produced.update(stage.outputs)
+
+        return required
+
+    def run(self, trace_memory=False, **inputs):
+        """
+        Run every stage in order.
+
+        Args:
+            trace_memory (bool): Also record each stage's peak allocated memory with tracemalloc, which slows
+                                 Python-heavy stages several times over. Defaults to False.
+            **inputs: The values required by the stages (see get_required_inputs), ex: bundle=..., annotation_df=...
+
+        Returns:
+            Tuple[dict, list]: Every named value, as left by the last stage writing it, and the metrics of every stage.
+        """
+        missing = [name for name in self.get_required_inputs() if name not in inputs]
+        if missing:
+            raise ValueError(f"Missing pipeline inputs: {missing}")
+
+        values = dict(inputs)
+        # Borrowed objects are tracked by identity, as a stage may pass one through under another name
+        borrowed = {id(value) for value in inputs.values()}
+        metrics = []
+
+        started_tracing = trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        try:
+            for stage in self.stages:
+                # Copy borrowed values once before they are modified, the caller's objects are never touched
+                for name in stage.mutates:
+                    if id(values[name]) in borrowed:
+                        values[name] = values[name].copy()
+
+                if trace_memory:
+                    tracemalloc.reset_peak()
+                    memory_at_start = tracemalloc.get_traced_memory()[0]
+                start = time.perf_counter()
+
+                result = stage.func(*[values[name] for name in stage.inputs])
+
+                seconds = time.perf_counter() - start
+                peak_mb = (
+                    (tracemalloc.get_traced_memory()[1] - memory_at_start) / 2**20 if trace_memory else None
+                )
+
+                results = result if len(stage.outputs) > 1 else (result,)
+                values.update(zip(stage.outputs, results))
+
+                metrics.append(
+                    {
+                        "stage": stage.name,
+                        "seconds": seconds,
+                        "peak_mb": peak_mb,
+                        # ru_maxrss is reported in kilobytes on Linux
+                        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10,
+                        "rows": {
+                            name: len(value) if hasattr(value, "__len__") else None
+                            for name, value in zip(stage.outputs, results)
+                        },
+                    }
+                )
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+        return values, metrics
+
+    @staticmethod
+    def print_metrics(metrics):
+        """
+        Print the metrics of a run, one line per stage.
+
+        Args:
+            metrics (list): The metrics returned by run.
+        """
+        for metric in metrics:
+            peak = f", {metric['peak_mb']:.1f}MB peak" if metric["peak_mb"] is not None else ""
+            rows = ", ".join(f"{name}: {count}" for name, count in metric["rows"].items() if count is not None)
+            print(
+                f"{metric['stage']}: {metric['seconds']:.3f}s{peak}, {metric['max_rss_mb']:.0f}MB max rss"
+                + (f", rows ({rows})" if rows else "")
+            )
@@ -0,0 +1,184 @@
+import math
+import numpy as np
+
+
+class HexGrid:
+    """
+    The hexagonal grid matplotlib's Axes.hexbin lays over an extent, computed in closed form.
+
+    hexbin covers the extent with two interleaved rectangular lattices of hexagon centers: lattice 1 on the
+    integer points of hexagon index coordinates, (nx + 1) x (ny + 1) of them, and lattice 2 on the half
+    integer points, nx x ny of them. A point falls in the hexagon of whichever nearest lattice point is
+    closer (in a metric scaling y by sqrt(3)), so locating it takes a rounding and a floor rather than a
+    scan over every cell.
+
+    Cells are numbered as hexbin orders its offsets: lattice 1 column by column, then lattice 2. Cell
+    centers (see offsets) are computed with the same float operations as hexbin, so they compare (and
+    format, see get_cell_labels) identically to the offsets of a hexbin collection.
+
+    Counting points per cell (see count and count_batch) gives the offsets and counts of a hexbin
+    collection without matplotlib: no figure is built, and pyplot is never imported.
+    """
+
+    def __init__(self, gridsize=50, extent=(0, 94, -50, 0)):
+        """
+        Args:
+            gridsize (int or Tuple[int, int]): Number of hexagons in the x-direction, or in both directions (as hexbin).
+                                               Defaults to 50.
+            extent (Tuple[float, float, float, float]): xmin, xmax, ymin, ymax of the grid. Defaults to the half court,
+                                                        with y_loc offset by -50.
+        """
+        if np.iterable(gridsize):
+            self.nx, self.ny = gridsize
+        else:
+            self.nx = gridsize
+            self.ny = int(gridsize / math.sqrt(3))
+
+        xmin, xmax, ymin, ymax = extent
+        if xmin > xmax or ymin > ymax:
+            raise ValueError(f"Invalid hexbin extent: {extent}")
+
+        # The hexagons exactly cover xmin to xmax, hexbin pads the range to avoid roundoff errors
+        padding = 1.e-9 * (xmax - xmin)
+        self.xmin = xmin - padding
+        self.ymin = ymin
+        self.sx = (xmax + padding - self.xmin) / self.nx
+        self.sy = (ymax - ymin) / self.ny
+
+        self.gridsize = gridsize
+        self.extent = tuple(extent)
+        self.lattice_size = (self.nx + 1) * (self.ny + 1)
+        self.num_cells = self.lattice_size + self.nx * self.ny
+
+        # Cell centers, in the order (and with the arithmetic) of hexbin's offsets
+        offsets = np.zeros((self.num_cells, 2), float)
+        offsets[:self.lattice_size, 0] = np.repeat(np.arange(self.nx + 1), self.ny + 1)
+        offsets[:self.lattice_size, 1] = np.tile(np.arange(self.ny + 1), self.nx + 1)
+        offsets[self.lattice_size:, 0] = np.repeat(np.arange(self.nx) + 0.5, self.ny)
+        offsets[self.lattice_size:, 1] = np.tile(np.arange(self.ny), self.nx) + 0.5
+        offsets[:, 0] *= self.sx
+        offsets[:, 1] *= self.sy
+        offsets[:, 0] += self.xmin
+        offsets[:, 1] += self.ymin
+        self.offsets = offsets
+
+    def get_cell_ids(self, x, y, snap=False):
+        """
+        Get the cell enclosing each point.
+
+        Args:
+            x (float or array-like): X-coordinates.
+            y (float or array-like): Y-coordinates.
+            snap (bool): Assign points off the grid (ex: a player out of bounds) to the nearest cell rather than -1.
+                         Defaults to False, as hexbin drops them.
+
+        Returns:
+            np.ndarray: Integer cell ids (indices into offsets), -1 for points off the grid or not finite (which hexbin drops).
+        """
+        # Positions in hexagon index coordinates, hexbin drops non finite points
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        is_finite = np.isfinite(x) & np.isfinite(y)
+        ix = (np.where(is_finite, x, self.xmin) - self.xmin) / self.sx
+        iy = (np.where(is_finite, y, self.ymin) - self.ymin) / self.sy
+
+        # Nearest point of each lattice, the hexagon is the closer of the two
+        ix1 = np.round(ix).astype(int)
+        iy1 = np.round(iy).astype(int)
+        ix2 = np.floor(ix).astype(int)
+        iy2 = np.floor(iy).astype(int)
+        if snap:
+            # The metric is separable, so the nearest point of a lattice is its nearest row and column clipped to the grid
+            ix1 = np.clip(ix1, 0, self.nx)
+            iy1 = np.clip(iy1, 0, self.ny)
+            ix2 = np.clip(ix2, 0, self.nx - 1)
+            iy2 = np.clip(iy2, 0, self.ny - 1)
+        d1 = (ix - ix1) ** 2 + 3.0 * (iy - iy1) ** 2
+        d2 = (ix - ix2 - 0.5) ** 2 + 3.0 * (iy - iy2 - 0.5) ** 2
+        on_lattice_1 = d1 < d2
+
+        cell_1 = np.where(
+            (0 <= ix1) & (ix1 <= self.nx) & (0 <= iy1) & (iy1 <= self.ny), ix1 * (self.ny + 1) + iy1, -1
+        )
+        cell_2 = np.where(
+            (0 <= ix2) & (ix2 < self.nx) & (0 <= iy2) & (iy2 < self.ny),
+            self.lattice_size + ix2 * self.ny + iy2,
+            -1,
+        )
+
+        return np.where(is_finite, np.where(on_lattice_1, cell_1, cell_2), -1)
+
+    def get_cell_labels(self, cell_ids):
+        """
+        Format cells as the "(x,y)" strings of their centers, as stored in the location features.
+
+        Args:
+            cell_ids (array-like): Cell ids, as returned by get_cell_ids.
+
+        Returns:
+            list: One "(x,y)" string per cell, None for points off the grid.
+        """
+        return [
+            None if cell_id < 0 else f"({self.offsets[cell_id, 0].item()},{self.offsets[cell_id, 1].item()})"
+            for cell_id in np.atleast_1d(cell_ids).tolist()
+        ]
+
+    def locate(self, x, y, snap=False):
+        """
+        Get the cell enclosing each point, as ids and as "(x,y)" labels.
+
+        Args:
+            x (array-like): X-coordinates.
+            y (array-like): Y-coordinates.
+            snap (bool): Assign points off the grid to the nearest cell (see get_cell_ids). Defaults to False.
+
+        Returns:
+            Tuple[np.ndarray, list]: The cell ids and labels.
+        """
+        cell_ids = np.atleast_1d(self.get_cell_ids(x, y, snap))
+
+        return cell_ids, self.get_cell_labels(cell_ids)
+
+    def count(self, x, y, mincnt=None):
+        """
+        Count the points falling in each cell, as ax.hexbin(x, y, gridsize=..., extent=..., mincnt=...) would.
+
+        Args:
+            x (array-like): X-coordinates.
+            y (array-like): Y-coordinates.
+            mincnt (int, optional): Only keep cells with at least this many points. Defaults to keeping every cell.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The centers and (float) counts of the kept cells, equal to the hexbin
+                                           collection's get_offsets() and get_array().
+        """
+        counts = self.count_batch([(x, y)])[0].astype(float)
+        kept = np.ones(self.num_cells, dtype=bool) if mincnt is None else counts >= mincnt
+
+        return self.offsets[kept], counts[kept]
+
+    def count_batch(self, trajectories):
+        """
+        Count the points of many trajectories per cell, locating every point in a single pass.
+
+        Args:
+            trajectories (Iterable): (x, y) array-like pairs, one per trajectory.
+
+        Returns:
+            np.ndarray: int64 [trajectory, cell] counts, cells in offsets order.
+        """
+        trajectories = [(np.asarray(x, dtype=float), np.asarray(y, dtype=float)) for x, y in trajectories]
+        lengths = [len(x) for x, _ in trajectories]
+        if not trajectories:
+            return np.zeros((0, self.num_cells), dtype=np.int64)
+
+        cell_ids = self.get_cell_ids(
+            np.concatenate([x for x, _ in trajectories]), np.concatenate([y for _, y in trajectories])
+        )
+        trajectory_of_point = np.repeat(np.arange(len(trajectories)), lengths)
+        on_grid = cell_ids >= 0
+
+        return np.bincount(
+            trajectory_of_point[on_grid] * self.num_cells + cell_ids[on_grid],
+            minlength=len(trajectories) * self.num_cells,
+        ).reshape(len(trajectories), self.num_cells)
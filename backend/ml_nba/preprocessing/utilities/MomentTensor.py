@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+from .ConstantsUtil import ConstantsUtil
+
+
+class MomentTensor:
+    """
+    A dense, in-memory [tick, slot, (x_loc, y_loc, radius)] view of an event's moments.
+
+    The long moments DataFrame (ConstantsUtil.HEADERS layout) holds one row per entity per tick, so every
+    per-player computation starts by filtering it on player_id and index. Here each entity gets a fixed
+    slot instead: the ball is always slot 0 and players follow in order of first appearance (home team
+    first, as in the raw data), so the track of any player is a view, positions[:, slot], read without filtering.
+    NOTE: tracks are strided views (consecutive ticks are a whole [slot, coord] block apart), pass them through
+    np.ascontiguousarray before handing them to code needing contiguous memory.
+
+    A tensor holds:
+    - positions: float32 [tick, slot, (x_loc, y_loc, radius)], NaN where an entity is missing at a tick
+    - slot_players / slot_teams: int64 [slot], the player_id and team_id of every slot (-1 for the ball, 0 if unused)
+    - ticks: DataFrame, one row per tick with its moment index, game_clock, shot_clock and period (when known)
+
+    The all-pairs distance cube of the event (see get_distances) is computed on first use and kept on the tensor.
+
+    Events hold 11 slots (ball and 10 players), plus one per extra player when lineups change mid event.
+    """
+
+    BALL_SLOT = 0
+    BALL_ID = -1
+    NUM_SLOTS = 11
+    EMPTY_SLOT_ID = 0  # team/player id of unused slots, for events missing a player
+    TICK_COLUMNS = {"game_clock": np.float64, "shot_clock": np.float64, "period": np.int64}
+
+    def __init__(self, positions, slot_players, slot_teams, ticks, event_id=None):
+        """
+        Args:
+            positions (np.ndarray): float32 [tick, slot, 3] entity positions.
+            slot_players (np.ndarray): player_id of every slot.
+            slot_teams (np.ndarray): team_id of every slot.
+            ticks (pd.DataFrame): index, game_clock, shot_clock and period of every tick.
+            event_id (str, optional): Event the moments belong to. Defaults to None.
+        """
+        self.positions = positions
+        self.slot_players = slot_players
+        self.slot_teams = slot_teams
+        self.ticks = ticks
+        self.event_id = event_id
+        self._distances = None
+        self._slot_of_player = {
+            player_id: slot for slot, player_id in enumerate(slot_players.tolist()) if player_id != self.EMPTY_SLOT_ID
+        }
+
+    def __len__(self):
+        return len(self.positions)
+
+    @classmethod
+    def from_moments_df(cls, moments_df):
+        """
+        Build the tensor of an event from its long moments DataFrame.
+
+        Args:
+            moments_df (pd.DataFrame): The moments of a single event in the ConstantsUtil.HEADERS layout, in any row
+                                       order (ex: unordered rows of the Moment table).
+
+        Returns:
+            MomentTensor: The event's tensor.
+        """
+        # Bring the rows of every tick together, the sort is stable so rows keep their order within a tick
+        order = np.argsort(moments_df["index"].to_numpy(dtype=np.int64), kind="stable")
+        player_col = moments_df["player_id"].to_numpy(dtype=np.int64)[order]
+        team_col = moments_df["team_id"].to_numpy(dtype=np.int64)[order]
+        index_col = moments_df["index"].to_numpy(dtype=np.int64)[order]
+
+        # Every change of moment index starts a new tick
+        new_tick = np.ones(len(moments_df), dtype=bool)
+        new_tick[1:] = index_col[1:] != index_col[:-1]
+        tick_starts = np.flatnonzero(new_tick)
+        tick_of_row = np.cumsum(new_tick) - 1
+
+        # The ball takes slot 0, players the next slots in order of first appearance
+        is_player = player_col != cls.BALL_ID
+        player_ids, first_rows, player_of_row = np.unique(
+            player_col[is_player], return_index=True, return_inverse=True
+        )
+        appearance_order = np.argsort(first_rows, kind="stable")
+        slot_of_player = np.empty(len(player_ids), dtype=np.int64)
+        slot_of_player[appearance_order] = np.arange(1, len(player_ids) + 1)
+        slot_of_row = np.full(len(moments_df), cls.BALL_SLOT, dtype=np.int64)
+        slot_of_row[is_player] = slot_of_player[player_of_row]
+
+        num_slots = max(cls.NUM_SLOTS, len(player_ids) + 1)
+        slot_players = np.full(num_slots, cls.EMPTY_SLOT_ID, dtype=np.int64)
+        slot_teams = np.full(num_slots, cls.EMPTY_SLOT_ID, dtype=np.int64)
+        slot_players[cls.BALL_SLOT] = cls.BALL_ID
+        slot_teams[cls.BALL_SLOT] = cls.BALL_ID
+        slot_players[slot_of_row] = player_col
+        slot_teams[slot_of_row] = team_col
+
+        positions = np.full((len(tick_starts), num_slots, 3), np.nan, dtype=np.float32)
+        positions[tick_of_row, slot_of_row] = moments_df[["x_loc", "y_loc", "radius"]].to_numpy(dtype=np.float32)[order]
+
+        # Moments read from the database carry no period column, the tick table keeps whichever clock columns exist
+        ticks = pd.DataFrame({"index": index_col[tick_starts]})
+        for name, dtype in cls.TICK_COLUMNS.items():
+            if name in moments_df:
+                ticks[name] = moments_df[name].to_numpy(dtype=dtype)[order[tick_starts]]
+        event_id = moments_df["event_id"].iloc[0] if len(moments_df) and "event_id" in moments_df else None
+
+        return cls(positions, slot_players, slot_teams, ticks, event_id)
+
+    def to_moments_df(self):
+        """
+        Convert the tensor back into a long moments DataFrame in the ConstantsUtil.HEADERS layout.
+
+        Returns:
+            pd.DataFrame: One row per entity present at each tick, ordered by tick then slot.
+        """
+        present = ~np.isnan(self.positions[:, :, 0])
+        tick_of_row, slot_of_row = np.nonzero(present)
+        positions = self.positions[present]
+
+        return pd.DataFrame(
+            {
+                "team_id": self.slot_teams[slot_of_row],
+                "player_id": self.slot_players[slot_of_row],
+                "x_loc": positions[:, 0].astype(np.float64),
+                "y_loc": positions[:, 1].astype(np.float64),
+                "radius": positions[:, 2].astype(np.float64),
+                "index": self.ticks["index"].to_numpy()[tick_of_row],
+                **{name: self.ticks[name].to_numpy()[tick_of_row] for name in self.TICK_COLUMNS if name in self.ticks},
+                "event_id": self.event_id,
+            },
+            columns=[name for name in ConstantsUtil.HEADERS if name in self.ticks or name not in self.TICK_COLUMNS],
+        )
+
+    def get_slot(self, player_id):
+        """
+        Get the slot of a player (or of the ball, with player_id -1).
+
+        Raises:
+            KeyError: If the player does not appear in the event.
+        """
+        return self._slot_of_player[player_id]
+
+    def get_player_positions(self, player_id):
+        """
+        Get the (x_loc, y_loc) track of a player over every tick, as a strided (not contiguous) view into the tensor.
+
+        Args:
+            player_id (int): The player, or -1 for the ball.
+
+        Returns:
+            np.ndarray: float32 [tick, 2], NaN at ticks the player is missing from.
+        """
+        return self.positions[:, self.get_slot(player_id), :2]
+
+    def get_ball_positions(self):
+        """
+        Get the (x_loc, y_loc, radius) track of the ball over every tick, as a strided (not contiguous) view into the tensor.
+        """
+        return self.positions[:, self.BALL_SLOT]
+
+    def get_team_slots(self, team_id):
+        """
+        Get the slots of the players of a team.
+        """
+        return np.flatnonzero(self.slot_teams == team_id)
+
+    def get_distances(self):
+        """
+        Get the distance between every pair of entities (ball and players) at every tick, computed once.
+
+        Returns:
+            np.ndarray: float32 [tick, slot, slot] distances in feet, NaN where either entity is missing.
+        """
+        if self._distances is None:
+            locations = self.positions[:, :, :2]
+            offsets = locations[:, :, np.newaxis, :] - locations[:, np.newaxis, :, :]
+            self._distances = np.sqrt(np.einsum("tijc,tijc->tij", offsets, offsets))
+
+        return self._distances
+
+    def get_distances_from(self, player_id):
+        """
+        Get the distance between a player (or the ball, with -1) and every slot at every tick.
+
+        Returns:
+            np.ndarray: float32 [tick, slot], a strided (not contiguous) view into the distance cube.
+        """
+        return self.get_distances()[:, self.get_slot(player_id)]
@@ -0,0 +1,279 @@
+import numpy as np
+
+
+class TickTimeline:
+    """
+    A per-game timeline holding every physical SportVU tick exactly once.
+
+    Consecutive SportVU events share most of their moments, so storing moments per event stores
+    (and later processes) each tick several times. The timeline keeps one copy of every tick, in
+    chronological order, and turns each event into a [start_tick, end_tick) range over it.
+
+    Ticks are deduplicated on (period, timestamp) rather than (period, game_clock) alone, since the
+    game clock stands still during dead balls while tracking keeps recording. Lookups by
+    (period, game_clock) are supported through get_tick_range.
+    """
+
+    # Ticks of overlap kept ahead of an event's first unseen tick, so actions straddling the boundary stay intact
+    OVERLAP_MARGIN = 50
+
+    # Ball x_loc splitting the court, ticks of an event are kept while the ball is past it in the event's direction
+    HALF_COURT_X = 45.0
+
+    def __init__(self, moments, event_ranges):
+        """
+        Args:
+            moments (list): Unique raw SportVU moments, in chronological order.
+            event_ranges (dict): EVENTNUM -> (start_tick, end_tick).
+        """
+        self.moments = moments
+        self.event_ranges = event_ranges
+        self.period = np.array([moment[0] for moment in moments], dtype=np.int8)
+        self.timestamp = np.array([moment[1] for moment in moments], dtype=np.int64)
+        self.game_clock = np.array([moment[2] for moment in moments], dtype=np.float64)
+        self.ball_x = np.array([moment[5][0][2] for moment in moments], dtype=np.float64)
+        self._half_court_masks = {}
+
+    def __len__(self):
+        return len(self.moments)
+
+    @classmethod
+    def from_raw_events(cls, raw_events, event_nums=None):
+        """
+        Build a timeline from raw SportVU events.
+
+        Args:
+            raw_events (Iterable[dict]): Raw events holding 'eventId' and 'moments', ex: DataLoader.iter_raw_game_events.
+            event_nums (set, optional): Only keep events with these event numbers. Defaults to keeping all.
+
+        Returns:
+            TickTimeline: The deduplicated timeline.
+        """
+        unique_moments = {}
+        event_spans = {}
+
+        for event in raw_events:
+            event_num = int(event["eventId"])
+            if (event_nums is not None and event_num not in event_nums) or not event["moments"]:
+                continue
+
+            keys = [(moment[0], moment[1]) for moment in event["moments"]]
+            for key, moment in zip(keys, event["moments"]):
+                unique_moments.setdefault(key, moment)
+
+            first_key, last_key = min(keys), max(keys)
+            if event_num in event_spans:
+                first_key = min(first_key, event_spans[event_num][0])
+                last_key = max(last_key, event_spans[event_num][1])
+            event_spans[event_num] = (first_key, last_key)
+
+        ordered_keys = sorted(unique_moments)
+        tick_of_key = {key: tick for tick, key in enumerate(ordered_keys)}
+        event_ranges = {
+            event_num: (tick_of_key[first_key], tick_of_key[last_key] + 1)
+            for event_num, (first_key, last_key) in event_spans.items()
+        }
+
+        return cls([unique_moments[key] for key in ordered_keys], event_ranges)
+
+    @classmethod
+    def from_columns(cls, ticks_df, event_ranges):
+        """
+        Rebuild a timeline from its flat ticks table (see to_columns).
+
+        Args:
+            ticks_df (pd.DataFrame): Flat ticks table, sorted by tick.
+            event_ranges (dict): EVENTNUM -> (start_tick, end_tick).
+
+        Returns:
+            TickTimeline: The rebuilt timeline.
+        """
+        if ticks_df.empty:
+            return cls([], event_ranges)
+
+        # Entity rows become [team_id, player_id, x_loc, y_loc, radius] lists, as in the raw json
+        entities = list(
+            map(
+                list,
+                zip(
+                    ticks_df["team_id"].tolist(),
+                    ticks_df["player_id"].tolist(),
+                    ticks_df["x_loc"].tolist(),
+                    ticks_df["y_loc"].tolist(),
+                    ticks_df["radius"].tolist(),
+                ),
+            )
+        )
+
+        # Locate the first row of every tick
+        tick_col = ticks_df["tick"].to_numpy()
+        tick_starts = np.flatnonzero(np.r_[True, tick_col[1:] != tick_col[:-1]])
+        tick_ends = np.append(tick_starts[1:], len(ticks_df))
+
+        moments = [
+            [period, timestamp, game_clock, None if np.isnan(shot_clock) else shot_clock, None, entities[start:end]]
+            for period, timestamp, game_clock, shot_clock, start, end in zip(
+                ticks_df["period"].to_numpy()[tick_starts].tolist(),
+                ticks_df["timestamp"].to_numpy()[tick_starts].tolist(),
+                ticks_df["game_clock"].to_numpy()[tick_starts].tolist(),
+                ticks_df["shot_clock"].to_numpy()[tick_starts].tolist(),
+                tick_starts.tolist(),
+                tick_ends.tolist(),
+            )
+        ]
+
+        return cls(moments, event_ranges)
+
+    def to_columns(self):
+        """
+        Flatten the timeline into typed columns, one row per entity per tick.
+
+        Returns:
+            dict: Column name -> np.ndarray.
+        """
+        entity_counts = np.array([len(moment[5]) for moment in self.moments], dtype=np.int64)
+        entities = np.array(
+            [entity for moment in self.moments for entity in moment[5]], dtype=np.float64
+        ).reshape(-1, 5)
+        shot_clocks = np.array(
+            [np.nan if moment[3] is None else moment[3] for moment in self.moments], dtype=np.float64
+        )
+
+        return {
+            "tick": np.repeat(np.arange(len(self.moments), dtype=np.int32), entity_counts),
+            "period": np.repeat(self.period, entity_counts),
+            "timestamp": np.repeat(self.timestamp, entity_counts),
+            "game_clock": np.repeat(self.game_clock, entity_counts),
+            "shot_clock": np.repeat(shot_clocks, entity_counts),
+            "team_id": entities[:, 0].astype(np.int32),
+            "player_id": entities[:, 1].astype(np.int32),
+            "x_loc": entities[:, 2],
+            "y_loc": entities[:, 3],
+            "radius": entities[:, 4],
+        }
+
+    def get_event_moments(self, event_num, direction=None, start_tick=None):
+        """
+        Get the raw moments of an event, as views onto the shared timeline ticks.
+
+        Args:
+            event_num (int): The event number.
+            direction (str, optional): 'RIGHT' or 'LEFT' to keep only ticks with the ball in that half
+                                       (see EventsProcessor.trim_moments_by_directionality). Defaults to None.
+            start_tick (int, optional): Skip ticks before this one. Defaults to the event's first tick.
+
+        Returns:
+            list: The event's moments (the moment lists themselves are shared, not copied).
+        """
+        if event_num not in self.event_ranges:
+            return []
+
+        start, end = self.event_ranges[event_num]
+        if start_tick is not None:
+            start = min(max(start, start_tick), end)
+
+        if direction is None:
+            return self.moments[start:end]
+
+        keep = self.get_half_court_mask(direction)[start:end]
+
+        return [self.moments[tick] for tick in (start + np.flatnonzero(keep)).tolist()]
+
+    def get_half_court_mask(self, direction):
+        """
+        Get the mask of ticks with the ball in the half of the court a direction attacks, computed once per game.
+
+        Args:
+            direction (str): 'RIGHT', or any other value for the left half.
+
+        Returns:
+            np.ndarray: Boolean mask over the timeline's ticks.
+        """
+        is_right = direction == "RIGHT"
+        if is_right not in self._half_court_masks:
+            self._half_court_masks[is_right] = (
+                self.ball_x > self.HALF_COURT_X if is_right else self.ball_x < self.HALF_COURT_X
+            )
+
+        return self._half_court_masks[is_right]
+
+    def get_direction_ticks(self, event_nums, directions):
+        """
+        Get, for many events at once, the ticks with the ball in the half of their direction.
+
+        The tick ranges of all events are laid end to end and filtered with the game's half court
+        masks in a single pass, so trimming a game is a handful of array operations.
+
+        Args:
+            event_nums (Iterable[int]): Event numbers.
+            directions (Iterable[str]): The direction of each event, 'RIGHT' or 'LEFT'.
+
+        Returns:
+            list: One np.ndarray of kept ticks per event, each a view into one shared array.
+        """
+        event_ranges = np.array(
+            [self.event_ranges.get(event_num, (0, 0)) for event_num in event_nums], dtype=np.int64
+        ).reshape(-1, 2)
+        tick_counts = event_ranges[:, 1] - event_ranges[:, 0]
+        offsets = np.concatenate(([0], np.cumsum(tick_counts)))
+        ticks = np.repeat(event_ranges[:, 0] - offsets[:-1], tick_counts) + np.arange(offsets[-1])
+
+        is_right = np.repeat(np.asarray(list(directions)) == "RIGHT", tick_counts)
+        keep = np.where(is_right, self.get_half_court_mask("RIGHT")[ticks], self.get_half_court_mask("LEFT")[ticks])
+        kept_offsets = np.concatenate(([0], np.cumsum(keep)))[offsets]
+
+        return np.split(ticks[keep], kept_offsets[1:-1]) if len(event_ranges) else []
+
+    def get_tick_range(self, period, game_clock):
+        """
+        Get the tick range [start, end) recorded at (period, game_clock).
+
+        Several ticks share a game clock reading whenever the clock is stopped, hence a range.
+
+        Args:
+            period (int): The game period.
+            game_clock (float): Game clock in seconds.
+
+        Returns:
+            Tuple[int, int]: The tick range (empty when the time was not tracked).
+        """
+        period_start = np.searchsorted(self.period, period, side="left")
+        period_end = np.searchsorted(self.period, period, side="right")
+
+        # The game clock runs down within a period, so search the negated clock which is ascending
+        period_clock = -self.game_clock[period_start:period_end]
+        start = period_start + np.searchsorted(period_clock, -game_clock, side="left")
+        end = period_start + np.searchsorted(period_clock, -game_clock, side="right")
+
+        return int(start), int(end)
+
+    def get_unseen_start_ticks(self, event_nums, group_keys=None, margin=OVERLAP_MARGIN):
+        """
+        Get, for each event, the first tick not already covered by an earlier event (less a margin).
+
+        Processing each event from its unseen start tick only touches every tick about once,
+        so compute grows with game length rather than with the sum of event lengths. Coverage is
+        tracked per group key, so a tick is only skipped when an earlier event of the same group
+        (ex: same possession and direction) already processed it.
+
+        Args:
+            event_nums (Iterable[int]): Event numbers, in processing order.
+            group_keys (Iterable, optional): A hashable group key per event. Defaults to a single group.
+            margin (int): Ticks of overlap to keep ahead of the first unseen tick. Defaults to OVERLAP_MARGIN.
+
+        Returns:
+            dict: EVENTNUM -> first tick to process.
+        """
+        event_nums = list(event_nums)
+        group_keys = [None] * len(event_nums) if group_keys is None else list(group_keys)
+        start_ticks = {}
+        covered_until = {}
+
+        for event_num, group_key in zip(event_nums, group_keys):
+            if event_num not in self.event_ranges:
+                continue
+            start, end = self.event_ranges[event_num]
+            start_ticks[event_num] = max(start, covered_until.get(group_key, 0) - margin)
+            covered_until[group_key] = max(covered_until.get(group_key, 0), end)
+
+        return start_ticks
@@ -0,0 +1,263 @@
+import os, json
+import numpy as np
+import pandas as pd
+from .ConstantsUtil import ConstantsUtil
+
+
+class TrackingTensor:
+    """
+    A memory-mapped, per-game store of tracking data laid out for cheap windowed reads.
+
+    Each game is written as three .npy arrays plus a json sidecar index:
+    - positions: float32 [tick, 11 entities, (x_loc, y_loc, radius)]
+    - entities: int32 [tick, 11 entities, (team_id, player_id)]
+    - ticks: float64 [tick, (period, index, game_clock, shot_clock)]
+    - index: event_id -> tick range [start, end), period and game clock span of the event
+
+    The arrays are opened with np.memmap (via np.load's mmap_mode), so reading a few seconds
+    of tracking around a candidate only pages in the handful of ticks that are touched.
+    """
+
+    NUM_ENTITIES = 11
+    EMPTY_SLOT_ID = 0  # team/player id of padded slots, for ticks that are missing a player
+    _open_tensors = {}
+
+    def __init__(self, game_key, positions, entities, ticks, event_index):
+        self.game_key = game_key
+        self.positions = positions
+        self.entities = entities
+        self.ticks = ticks
+        self.event_index = event_index
+
+    @staticmethod
+    def get_paths(game_key, save_dir=ConstantsUtil.TRACKING_TENSORS_PATH):
+        """
+        Get the file paths making up the tracking tensor of a game.
+
+        Args:
+            game_key (str): The unique identifier for the game.
+            save_dir (str): Directory holding the tracking tensors. Defaults to TRACKING_TENSORS_PATH.
+
+        Returns:
+            dict: Paths keyed by 'positions', 'entities', 'ticks' and 'index'.
+        """
+        return {
+            "positions": os.path.join(save_dir, f"{game_key}-positions.npy"),
+            "entities": os.path.join(save_dir, f"{game_key}-entities.npy"),
+            "ticks": os.path.join(save_dir, f"{game_key}-ticks.npy"),
+            "index": os.path.join(save_dir, f"{game_key}-index.json"),
+        }
+
+    @classmethod
+    def exists(cls, game_key, save_dir=ConstantsUtil.TRACKING_TENSORS_PATH):
+        return os.path.exists(cls.get_paths(game_key, save_dir)["index"])
+
+    @classmethod
+    def write(cls, game_key, moments_df, save_dir=ConstantsUtil.TRACKING_TENSORS_PATH):
+        """
+        Write the tracking tensor of a game from a long moments DataFrame.
+
+        Args:
+            game_key (str): The unique identifier for the game.
+            moments_df (pd.DataFrame): Moments in the ConstantsUtil.HEADERS layout (as returned by
+                                       EventsProcessor.get_moments_from_event), covering one or more
+                                       events with the rows of each event kept contiguous.
+            save_dir (str): Directory to write the tensor to. Defaults to TRACKING_TENSORS_PATH.
+
+        Returns:
+            TrackingTensor: The freshly written tensor, opened read-only.
+        """
+        paths = cls.get_paths(game_key, save_dir)
+        os.makedirs(save_dir, exist_ok=True)
+        cls._open_tensors.pop((game_key, save_dir), None)
+
+        # Every (event_id, index) pair is one tick, every row within it one entity slot
+        event_col = moments_df["event_id"].to_numpy()
+        index_col = moments_df["index"].to_numpy()
+        new_tick = np.ones(len(moments_df), dtype=bool)
+        new_tick[1:] = (event_col[1:] != event_col[:-1]) | (index_col[1:] != index_col[:-1])
+        tick_starts = np.flatnonzero(new_tick)
+        tick_of_row = np.cumsum(new_tick) - 1
+        slot_of_row = np.arange(len(moments_df)) - tick_starts[tick_of_row]
+        keep = slot_of_row < cls.NUM_ENTITIES
+        num_ticks = len(tick_starts)
+
+        positions = np.lib.format.open_memmap(
+            paths["positions"], mode="w+", dtype=np.float32, shape=(num_ticks, cls.NUM_ENTITIES, 3)
+        )
+        positions[:] = np.nan
+        positions[tick_of_row[keep], slot_of_row[keep]] = moments_df[
+            ["x_loc", "y_loc", "radius"]
+        ].to_numpy(dtype=np.float32)[keep]
+        positions.flush()
+
+        entities = np.lib.format.open_memmap(
+            paths["entities"], mode="w+", dtype=np.int32, shape=(num_ticks, cls.NUM_ENTITIES, 2)
+        )
+        entities[:] = cls.EMPTY_SLOT_ID
+        entities[tick_of_row[keep], slot_of_row[keep]] = moments_df[
+            ["team_id", "player_id"]
+        ].to_numpy(dtype=np.int32)[keep]
+        entities.flush()
+
+        ticks = np.lib.format.open_memmap(
+            paths["ticks"], mode="w+", dtype=np.float64, shape=(num_ticks, 4)
+        )
+        ticks[:] = moments_df[["period", "index", "game_clock", "shot_clock"]].to_numpy(
+            dtype=np.float64
+        )[tick_starts]
+        ticks.flush()
+
+        # Sidecar index, mapping every event to its contiguous tick range and clock span
+        tick_events = event_col[tick_starts]
+        event_starts = np.flatnonzero(np.r_[True, tick_events[1:] != tick_events[:-1]])
+        event_ends = np.append(event_starts[1:], num_ticks)
+        event_index = {
+            str(tick_events[start]): {
+                "start": int(start),
+                "end": int(end),
+                "period": int(ticks[start, 0]),
+                "game_clock_start": float(ticks[start, 2]),
+                "game_clock_end": float(ticks[end - 1, 2]),
+            }
+            for start, end in zip(event_starts, event_ends)
+        }
+        with open(paths["index"], "w") as index_file:
+            json.dump({"num_ticks": num_ticks, "events": event_index}, index_file)
+
+        del positions, entities, ticks
+
+        return cls.open(game_key, save_dir)
+
+    @classmethod
+    def open(cls, game_key, save_dir=ConstantsUtil.TRACKING_TENSORS_PATH):
+        """
+        Open the tracking tensor of a game as read-only memory maps. Opened tensors are cached per game.
+
+        Args:
+            game_key (str): The unique identifier for the game.
+            save_dir (str): Directory holding the tracking tensors. Defaults to TRACKING_TENSORS_PATH.
+
+        Returns:
+            TrackingTensor: The opened tensor.
+        """
+        if (game_key, save_dir) not in cls._open_tensors:
+            paths = cls.get_paths(game_key, save_dir)
+            with open(paths["index"]) as index_file:
+                event_index = json.load(index_file)["events"]
+
+            cls._open_tensors[(game_key, save_dir)] = cls(
+                game_key,
+                np.load(paths["positions"], mmap_mode="r"),
+                np.load(paths["entities"], mmap_mode="r"),
+                np.load(paths["ticks"], mmap_mode="r"),
+                event_index,
+            )
+
+        return cls._open_tensors[(game_key, save_dir)]
+
+    def get_event_range(self, event_id):
+        """
+        Get the tick range [start, end) of an event.
+        """
+        entry = self.event_index[event_id]
+
+        return entry["start"], entry["end"]
+
+    def get_window_range(self, event_id, game_clock, window=2.0):
+        """
+        Get the tick range [start, end) of an event whose game clock lies strictly within game_clock ± window.
+
+        Args:
+            event_id (str): The event to search within.
+            game_clock (float): Center of the window, in game clock seconds.
+            window (float): Half width of the window in seconds. Defaults to 2.0.
+
+        Returns:
+            Tuple[int, int]: The tick range of the window.
+        """
+        start, end = self.get_event_range(event_id)
+
+        # The game clock runs down within an event, so search the negated clock which is ascending
+        event_clock = -np.asarray(self.ticks[start:end, 2])
+        window_start = start + np.searchsorted(event_clock, -(game_clock + window), side="right")
+        window_end = start + np.searchsorted(event_clock, -(game_clock - window), side="left")
+
+        return int(window_start), int(max(window_start, window_end))
+
+    def find_tick_ranges(self, period, game_clock, window=0.0):
+        """
+        Find every tick range, across events, recorded at (period, game_clock) ± window.
+
+        Args:
+            period (int): The game period.
+            game_clock (float): Game clock in seconds.
+            window (float): Half width of the window in seconds. Defaults to 0.0.
+
+        Returns:
+            list: (event_id, start, end) tuples, one per event covering the requested time.
+        """
+        tick_ranges = []
+        for event_id, entry in self.event_index.items():
+            if (
+                entry["period"] == period
+                and entry["game_clock_end"] - window <= game_clock <= entry["game_clock_start"] + window
+            ):
+                # The window search is strict, so widen a zero width window by a hair to keep exact matches
+                start, end = self.get_window_range(event_id, game_clock, max(window, 1e-6))
+                if end > start:
+                    tick_ranges.append((event_id, start, end))
+
+        return tick_ranges
+
+    def to_moments_df(self, start, end, event_id):
+        """
+        Convert a tick range into a long moments DataFrame in the ConstantsUtil.HEADERS layout.
+
+        Args:
+            start (int): First tick of the range.
+            end (int): End (exclusive) tick of the range.
+            event_id (str): Event id to label the rows with.
+
+        Returns:
+            pd.DataFrame: One row per entity per tick, with padded slots removed.
+        """
+        positions = np.asarray(self.positions[start:end]).reshape(-1, 3)
+        entities = np.asarray(self.entities[start:end]).reshape(-1, 2)
+        ticks = np.repeat(np.asarray(self.ticks[start:end]), self.NUM_ENTITIES, axis=0)
+
+        moments_df = pd.DataFrame(
+            {
+                "team_id": entities[:, 0],
+                "player_id": entities[:, 1],
+                "x_loc": positions[:, 0],
+                "y_loc": positions[:, 1],
+                "radius": positions[:, 2],
+                "index": ticks[:, 1].astype(np.int64),
+                "game_clock": ticks[:, 2],
+                "shot_clock": ticks[:, 3],
+                "period": ticks[:, 0].astype(np.int64),
+                "event_id": event_id,
+            }
+        )
+
+        return moments_df[moments_df["player_id"] != self.EMPTY_SLOT_ID].reset_index(drop=True)
+
+    def get_event_moments(self, event_id, game_clock=None, window=2.0):
+        """
+        Read the moments of an event, optionally only those within game_clock ± window.
+
+        Args:
+            event_id (str): The event to read.
+            game_clock (float, optional): Center of the window. Defaults to None, reading the whole event.
+            window (float): Half width of the window in seconds. Defaults to 2.0.
+
+        Returns:
+            pd.DataFrame: Moments in the ConstantsUtil.HEADERS layout.
+        """
+        if game_clock is None:
+            start, end = self.get_event_range(event_id)
+        else:
+            start, end = self.get_window_range(event_id, game_clock, window)
+
+        return self.to_moments_df(start, end, event_id)
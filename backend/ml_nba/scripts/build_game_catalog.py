@@ -0,0 +1,14 @@
+from ml_nba.preprocessing.utilities.GameCatalog import GameCatalog
+
+
+def run():
+    # Scan the raw archive and artifact directories, updating the persisted game catalog incrementally
+    catalog = GameCatalog.build(count_raw=True)
+
+    print(f"Cataloged {len(catalog.entries)} games")
+    for game_key in catalog.plan(skip_finished=False):
+        entry = catalog.entries[game_key]
+        print(
+            f"{game_key}: {entry['raw_size'] / 1e6:.1f}MB, {entry['event_count']} events, "
+            f"{entry['tick_count']} ticks, stages: {sorted(entry['stages'])}"
+        )
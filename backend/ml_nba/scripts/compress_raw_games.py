@@ -0,0 +1,8 @@
+from ml_nba.preprocessing.utilities.DataLoader import DataLoader
+
+
+def run():
+    # Compress the raw SportVU archive in place, loaders pick the codec from the file extension
+    compressed = DataLoader.compress_raw_games(extension=".json.xz", remove_original=True)
+
+    print(f"Compressed {len(compressed)} raw games")
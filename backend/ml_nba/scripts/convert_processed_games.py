@@ -0,0 +1,8 @@
+from ml_nba.preprocessing.utilities.DataLoader import DataLoader
+
+
+def run():
+    # One-shot conversion of the legacy processed game CSVs in CLEAN_DATA_PATH into event/moments parquet tables
+    converted = DataLoader.convert_processed_game_csvs()
+
+    print(f"Converted {len(converted)} processed games: {converted}")
@@ -4,31 +4,29 @@ import pandas as pd
 import numpy as np
 from sklearn.cluster import KMeans
 from sklearn.metrics import silhouette_score
-import matplotlib.pyplot as plt
 from ml_nba.models import Game
 from ml_nba.models import Player
 from ml_nba.models import Event
-from ml_nba.models import Moment
 from ml_nba.models import Candidate
-import matplotlib.pyplot as plt
 import math, os
 
 from ml_nba.preprocessing.utilities.DataUtil import DataUtil
+from ml_nba.preprocessing.utilities.DatabaseUtil import DatabaseUtil
 from ml_nba.preprocessing.utilities.FeatureUtil import FeatureUtil
-from ml_nba.preprocessing.utilities.GraphUtil import GraphUtil
+from ml_nba.preprocessing.utilities.HexGrid import HexGrid
+
+# Hexbin grid of the hexmaps, counted without drawing (matplotlib is only needed to plot the cluster scores)
+HEXMAP_GRID = HexGrid(gridsize=50, extent=(0, 94, -50, 0))
 
 def get_hexbins(target_candidate):
-    # Collects moments for single candidate
-    moments = pd.DataFrame(list(Moment.objects.filter(event_id=target_candidate['event_id']).values()))
+    # Collects the moments around the pass for single candidate, the hexbins need no other moment of the event
+    game_clock = DataUtil.convert_timestamp_to_game_clock(target_candidate['game_clock'])
+    trimmed_moments = DatabaseUtil.get_moments_for_event(target_candidate['event_id'], game_clock=game_clock, window=FeatureUtil.FEATURE_WINDOW)
 
     # Collects players for single candidate
     screener = Player.objects.values().get(player_id=target_candidate['player_a_id'])
     cutter = Player.objects.values().get(player_id=target_candidate['player_b_id'])
 
-    # Trim the moments data around the pass
-    game_clock = DataUtil.convert_timestamp_to_game_clock(target_candidate['game_clock'])
-    trimmed_moments = moments[(moments.game_clock > game_clock - 2) & (moments.game_clock < game_clock + 2)]
-
     # If the data occurs past half-court (x > 47), rotate the points about the center of the court so features appear consistent 
     if(trimmed_moments.iloc[math.ceil(len(trimmed_moments)/2)]['x_loc'] > 47.0):
         trimmed_moments = FeatureUtil.rotate_coordinates_around_center_court(trimmed_moments)
@@ -36,7 +34,7 @@ def get_hexbins(target_candidate):
     # Isolate cutter, screener and ball from trimmed_moments
     cutter_df = trimmed_moments[trimmed_moments['player_id'] == cutter['player_id']][['x_loc', 'y_loc']]
     screener_df = trimmed_moments[trimmed_moments['player_id'] == screener['player_id']][['x_loc', 'y_loc']]
-    ball_df = trimmed_moments[trimmed_moments['player_id'].isna()][['x_loc', 'y_loc']]
+    ball_df = trimmed_moments[trimmed_moments['player_id'] == -1][['x_loc', 'y_loc']]
 
     # Offset y_loc data to work with hexbin
     screener_hex_df = screener_df.copy(deep=True)
@@ -45,14 +43,17 @@ def get_hexbins(target_candidate):
     screener_hex_df['y_loc'] = screener_hex_df['y_loc'] - 50.0
     cutter_hex_df['y_loc'] = cutter_hex_df['y_loc'] - 50.0
     ball_hex_df['y_loc'] = ball_hex_df['y_loc'] - 50.0
-    ax = GraphUtil.draw_court()	
-    screener_hexbin = ax.hexbin(x=screener_hex_df['x_loc'], y=screener_hex_df['y_loc'], cmap=plt.cm.Greens, mincnt=1, gridsize=50, extent=(0,94,-50,0))
-    cutter_hexbin = ax.hexbin(x=cutter_hex_df['x_loc'], y=cutter_hex_df['y_loc'], cmap=plt.cm.Blues, mincnt=1, gridsize=50, extent=(0,94,-50,0))
-    ball_hexbin = ax.hexbin(x=ball_hex_df['x_loc'], y=ball_hex_df['y_loc'], cmap=plt.cm.Reds, mincnt=1, gridsize=50, extent=(0,94,-50,0))
 
-    return [*screener_hexbin.get_array(), *cutter_hexbin.get_array(), *ball_hexbin.get_array()]
+    # Count the screener, cutter and ball hexbins in one pass, keeping the occupied cells (as hexbin with mincnt=1)
+    hexbin_counts = HEXMAP_GRID.count_batch(
+        [(hex_df['x_loc'], hex_df['y_loc']) for hex_df in (screener_hex_df, cutter_hex_df, ball_hex_df)]
+    ).astype(float)
+
+    return [count for counts in hexbin_counts for count in counts[counts >= 1].tolist()]
 
 def run():
+    import matplotlib.pyplot as plt
+
     n_clusters = 9
     hex_dir = 'C:\\Users\\Stephanos\\Documents\\Dev\\NBAThesis\\NBA_Thesis\\static\\backend\\hexmaps'
     directory = os.fsencode(hex_dir)
@@ -1,3 +1,259 @@
-from django.test import TestCase	
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+from scipy.stats import linregress
+from ml_nba.preprocessing.utilities.ConstantsUtil import ConstantsUtil
+from ml_nba.preprocessing.utilities.DataLoader import DataLoader
+from ml_nba.preprocessing.utilities.EventsProcessor import EventsProcessor
+from ml_nba.preprocessing.utilities.FeatureUtil import FeatureUtil
 
-# Create your tests here.
\ No newline at end of file
+
+class HexGridTests(SimpleTestCase):
+    def setUp(self):
+        self.grid = FeatureUtil.HEXBIN_GRID
+
+    def get_nearest_cells(self, x, y):
+        # Brute force over every cell center, in the metric of the grid (hexagon index coordinates, y scaled by sqrt(3))
+        dx = (np.asarray(x)[:, np.newaxis] - self.grid.offsets[:, 0]) / self.grid.sx
+        dy = (np.asarray(y)[:, np.newaxis] - self.grid.offsets[:, 1]) / self.grid.sy
+        return np.argmin(dx**2 + 3.0 * dy**2, axis=1)
+
+    def test_out_of_bounds_points_are_dropped_by_default(self):
+        cell_ids = self.grid.get_cell_ids([-3.0, 50.0, 97.0], [-25.0, -53.0, 2.0])
+
+        self.assertTrue((cell_ids == -1).all())
+
+    def test_out_of_bounds_points_snap_to_nearest_cell(self):
+        # An inbounder behind the baseline, players over either sideline and a corner far off the court
+        x = np.array([-3.0, 50.0, 20.0, 97.0, -40.0])
+        y = np.array([-25.0, -53.0, 1.5, 2.0, -90.0])
+
+        cell_ids, labels = self.grid.locate(x, y, snap=True)
+
+        np.testing.assert_array_equal(cell_ids, self.get_nearest_cells(x, y))
+        self.assertNotIn(None, labels)
+
+    def test_snapping_leaves_points_on_the_grid_unchanged(self):
+        rng = np.random.default_rng(0)
+        x = rng.uniform(0, 94, 1000)
+        y = rng.uniform(-50, 0, 1000)
+
+        np.testing.assert_array_equal(self.grid.get_cell_ids(x, y, snap=True), self.grid.get_cell_ids(x, y))
+
+    def test_points_not_finite_are_never_located(self):
+        cell_ids = self.grid.get_cell_ids([np.nan, 10.0], [-10.0, np.inf], snap=True)
+
+        self.assertTrue((cell_ids == -1).all())
+
+
+class FlattenMomentsTests(SimpleTestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def get_reference_moments(self, event_df):
+        # The original per moment loop of get_moments_from_event
+        player_moments = []
+        last_shot_clock = 24
+        game_clock_at_start = DataLoader.convert_timestamp_to_game_clock(event_df['PCTIMESTRING'])
+
+        for moment_index, moment in enumerate(event_df["MOMENTS"]):
+            shot_clock = 0.0 if moment[3] is None else moment[3]
+            if shot_clock <= last_shot_clock or moment[2] >= game_clock_at_start:
+                last_shot_clock = shot_clock
+                for player in moment[5]:
+                    player_moments.append(
+                        player + [moment_index, moment[2], last_shot_clock, event_df["PERIOD"], event_df["EVENT_ID"]]
+                    )
+
+        return pd.DataFrame(player_moments, columns=ConstantsUtil.HEADERS)
+
+    def make_event(self, event_id, num_moments, period=2, pctimestring="5:00"):
+        game_clock_at_start = DataLoader.convert_timestamp_to_game_clock(pctimestring)
+        # Start before PCTIMESTRING so the first moments are always kept, then run down the clock
+        game_clock = game_clock_at_start + 1.0 - 0.04 * np.arange(num_moments)
+        # Shot clocks on a coarse grid so ties and resets (the clock going back up) are frequent
+        shot_clock = np.round(
+            self.rng.choice([24.0, 14.0, 10.0])
+            - 0.2 * np.arange(num_moments)
+            + self.rng.choice([0.0, 0.0, 4.0, 10.0], num_moments),
+            1,
+        )
+
+        moments = []
+        for i in range(num_moments):
+            entities = [[-1, -1, *self.rng.uniform(0, 94, 2).round(3).tolist(), 5.0]] + [
+                [1610612744 + team, 200000 + 10 * team + player, *self.rng.uniform(0, 94, 2).round(3).tolist(), 0.0]
+                for team in range(2)
+                for player in range(int(self.rng.integers(3, 6)))
+            ]
+            shot_clock_value = None if i % 7 == 3 else float(shot_clock[i])
+            moments.append([period, 1451347200000 + i, float(game_clock[i]), shot_clock_value, None, entities])
+
+        return {"MOMENTS": moments, "PCTIMESTRING": pctimestring, "PERIOD": period, "EVENT_ID": event_id}
+
+    def flatten(self, events):
+        return EventsProcessor.flatten_moments(
+            [event["MOMENTS"] for event in events],
+            [DataLoader.convert_timestamp_to_game_clock(event["PCTIMESTRING"]) for event in events],
+            [event["PERIOD"] for event in events],
+            [event["EVENT_ID"] for event in events],
+        )
+
+    def test_event_moments_match_the_reference_loop(self):
+        for event_num, num_moments in enumerate([1, 2, 25, 120, 400]):
+            event = self.make_event(f"0021500001-{event_num}", num_moments)
+            moments_df = EventsProcessor.get_moments_from_event(event)
+
+            pd.testing.assert_frame_equal(moments_df, self.get_reference_moments(event), check_dtype=False)
+
+    def test_moments_without_shot_clock_count_as_zero(self):
+        event = self.make_event("0021500001-1", 3)
+        for moment, game_clock, shot_clock in zip(event["MOMENTS"], [299.9, 299.8, 299.7], [12.0, None, 11.0]):
+            moment[2], moment[3] = game_clock, shot_clock
+
+        moments_df = EventsProcessor.get_moments_from_event(event)
+
+        # The None clock is kept as 0.0, and the shot clock going back up after it drops the last moment
+        self.assertEqual(moments_df.groupby("index")["shot_clock"].first().tolist(), [12.0, 0.0])
+        pd.testing.assert_frame_equal(moments_df, self.get_reference_moments(event), check_dtype=False)
+
+    def test_event_without_moments_is_empty(self):
+        moments_df = EventsProcessor.get_moments_from_event(self.make_event("0021500001-1", 0))
+
+        self.assertTrue(moments_df.empty)
+        self.assertEqual(list(moments_df.columns), ConstantsUtil.HEADERS)
+
+    def test_events_flatten_as_their_concatenation(self):
+        events = [
+            self.make_event(f"0021500001-{event_num}", num_moments, period=1 + event_num % 4)
+            for event_num, num_moments in enumerate([30, 0, 1, 200, 0, 75])
+        ]
+
+        moments_df, row_offsets = self.flatten(events)
+        event_dfs = [EventsProcessor.get_moments_from_event(event) for event in events]
+
+        np.testing.assert_array_equal(row_offsets, np.cumsum([0] + [len(event_df) for event_df in event_dfs]))
+        pd.testing.assert_frame_equal(
+            moments_df.astype({"event_id": object}),
+            pd.concat(event_dfs, ignore_index=True),
+        )
+
+
+class RemoveDuplicateCandidatesTests(SimpleTestCase):
+    def make_candidate(self, event_num, game_clock, shot_clock=14.0, player_a=201939, player_b=203110):
+        event_id = f"0021500001-{event_num}"
+        return {
+            "candidate_id": f"{event_id}-{game_clock}",
+            "event_id": event_id,
+            "period": 2,
+            "game_clock": game_clock,
+            "shot_clock": shot_clock,
+            "player_a": player_a,
+            "player_b": player_b,
+        }
+
+    def test_readings_either_side_of_a_bucket_edge_merge(self):
+        candidates = [self.make_candidate(1, 12.039), self.make_candidate(2, 12.041)]
+        resolution = EventsProcessor.CANDIDATE_CLOCK_RESOLUTION
+        self.assertNotEqual(int(12.039 // resolution), int(12.041 // resolution))
+
+        self.assertEqual(EventsProcessor.remove_duplicate_candidates(candidates), [candidates[1]])
+
+    def test_consecutive_ticks_stay_distinct(self):
+        candidates = [self.make_candidate(1, 12.0), self.make_candidate(1, 12.04), self.make_candidate(1, 12.08)]
+
+        self.assertEqual(EventsProcessor.remove_duplicate_candidates(candidates), candidates)
+
+    def test_duplicates_far_apart_in_the_list_merge(self):
+        first = self.make_candidate(1, 30.0)
+        others = [self.make_candidate(2 + i, 25.0 - i, shot_clock=10.0 - i) for i in range(5)]
+        duplicate = self.make_candidate(8, 30.01)
+
+        self.assertEqual(EventsProcessor.remove_duplicate_candidates([first, *others, duplicate]), [*others, duplicate])
+
+    def test_sources_list_every_contributing_event(self):
+        candidates = [
+            self.make_candidate(3, 40.0),
+            self.make_candidate(4, 40.01),
+            self.make_candidate(4, 20.0, player_b=202326),
+            self.make_candidate(4, 39.995),
+            self.make_candidate(5, 40.0),
+        ]
+
+        final_candidates, sources = EventsProcessor.remove_duplicate_candidates(candidates, return_sources=True)
+
+        self.assertEqual(final_candidates, [candidates[2], candidates[4]])
+        self.assertEqual(
+            sources,
+            {
+                candidates[2]["candidate_id"]: ["0021500001-4"],
+                candidates[4]["candidate_id"]: ["0021500001-3", "0021500001-4", "0021500001-5"],
+            },
+        )
+
+
+class TrajectoryStatsTests(SimpleTestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        # Two windows of the ball (-1) and two players, rows of every window interleaved by tick as in the moments
+        rows = []
+        for window, ticks in ((0, range(0, 20)), (1, range(20, 45))):
+            for tick in ticks:
+                for player_id in (-1, 201939, 203110):
+                    rows.append((window, player_id, 300.0 - 0.04 * tick, *rng.uniform([0, 0], [94, 50])))
+        self.moments_df = pd.DataFrame(rows, columns=["window", "player_id", "game_clock", "x_loc", "y_loc"])
+
+    def get_stats(self, moments_df):
+        return FeatureUtil.get_trajectory_stats(
+            moments_df["player_id"],
+            moments_df["x_loc"],
+            moments_df["y_loc"],
+            moments_df["game_clock"],
+            moments_df["window"],
+        )
+
+    def test_stats_match_the_per_trajectory_helpers(self):
+        trajectory_stats = self.get_stats(self.moments_df)
+
+        self.assertEqual(len(trajectory_stats), 6)
+        for (window, player_id), stats in trajectory_stats.iterrows():
+            window_df = self.moments_df[self.moments_df["window"] == window]
+            trajectory = window_df[window_df["player_id"] == player_id]
+            fit = linregress(trajectory["x_loc"], trajectory["y_loc"])
+
+            self.assertEqual(stats["num_ticks"], len(trajectory))
+            self.assertAlmostEqual(stats["travel_dist"], FeatureUtil.travel_dist(trajectory))
+            self.assertAlmostEqual(stats["avg_speed"], FeatureUtil.average_speed(window_df, player_id))
+            self.assertAlmostEqual(stats["slope"], fit.slope)
+            self.assertAlmostEqual(stats["intercept"], fit.intercept)
+            self.assertAlmostEqual(stats["rvalue"], fit.rvalue)
+
+    def test_rows_outside_every_window_are_left_out(self):
+        moments_df = self.moments_df.copy()
+        moments_df.loc[moments_df.index % 4 == 0, "window"] = -1
+
+        trajectory_stats = self.get_stats(moments_df)
+
+        kept_df = moments_df[moments_df["window"] >= 0]
+        self.assertEqual(trajectory_stats["num_ticks"].sum(), len(kept_df))
+        self.assertAlmostEqual(
+            trajectory_stats.loc[(1, 201939), "travel_dist"],
+            FeatureUtil.travel_dist(kept_df[(kept_df["window"] == 1) & (kept_df["player_id"] == 201939)]),
+        )
+
+    def test_trajectories_with_a_constant_x_are_not_fitted(self):
+        moments_df = self.moments_df.copy()
+        # A player standing on a vertical line for the approach, and the ball seen at a single tick of the execution
+        moments_df.loc[(moments_df["window"] == 0) & (moments_df["player_id"] == 201939), "x_loc"] = 0.1 + 0.2
+        moments_df = moments_df.drop(
+            moments_df.index[(moments_df["window"] == 1) & (moments_df["player_id"] == -1)][1:]
+        )
+
+        trajectory_stats = self.get_stats(moments_df)
+
+        for trajectory in ((0, 201939), (1, -1)):
+            self.assertTrue(trajectory_stats.loc[trajectory, ["slope", "intercept", "rvalue"]].isna().all())
+        self.assertEqual(trajectory_stats.loc[(1, -1), "num_ticks"], 1)
+        self.assertEqual(trajectory_stats.loc[(1, -1), "travel_dist"], 0.0)
+        self.assertTrue(np.isfinite(trajectory_stats.loc[(0, 201939), "travel_dist"]))
+        self.assertTrue(trajectory_stats.drop([(0, 201939), (1, -1)])["slope"].notna().all())
@@ -4,7 +4,7 @@ import matplotlib.pyplot as plt
 from IPython.display import HTML
 from matplotlib import animation
 from matplotlib.patches import Circle
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from ml_nba.preprocessing.utilities.DataLoader import DataLoader
 
 
@@ -27,9 +27,10 @@ class AnimationUtil:
     X_CENTER: float = COURT_DIMS[1] / 2 - DIFF / 1.5 + 4.10
     Y_CENTER: float = COURT_DIMS[3] - DIFF / 1.5 - 0.35
 
-    def __init__(self, game_df: pd.DataFrame):
+    def __init__(self, game_df: pd.DataFrame, game_key: Optional[str] = None):
         plt.ioff()
         self.game_df: pd.DataFrame = game_df
+        self.game_key: Optional[str] = game_key  # When set, event moments are streamed from the raw file instead of game_df
         self.teams_data = DataLoader.get_teams_data(game_df)
         self.team_color_dict = {
             self.teams_data["home_team"]["team_id"]:  self.teams_data["home_team"]["color"],
@@ -40,10 +41,20 @@ class AnimationUtil:
         self.last_animation = {}  # To store the reference to the last animation, outer dict key is interval, inner is event_num
         self.court = plt.imread("/app/static/ml_nba/imgs/fullcourt.png")
 
+    @classmethod
+    def from_game_key(cls, game_key: str) -> "AnimationUtil":
+        """Build an animator that only holds the game header in memory, streaming each requested event from disk."""
+        return cls(DataLoader.load_raw_game_header(game_key), game_key=game_key)
+
     def extract_event_moments(self, event_num: int) -> List[Dict]:
-        """Extract moments for the specified event number from the game DataFrame."""
+        """Extract moments for the specified event number from the game DataFrame (or the streamed raw game)."""
+        events = (
+            DataLoader.iter_raw_game_events(self.game_key)
+            if self.game_key is not None
+            else self.game_df["events"]
+        )
         event = next(
-            (e for e in self.game_df["events"] if e["eventId"] == str(event_num)), None
+            (e for e in events if e["eventId"] == str(event_num)), None
         )
         if event is None:
             raise ValueError(f"Event number {event_num} not found in the dataset.")